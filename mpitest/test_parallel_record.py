@@ -1,13 +1,18 @@
 """ Testing out recorders under MPI."""
 import errno
 import os
+import unittest
 
 from shutil import rmtree
 from tempfile import mkdtemp
 
+import numpy as np
+
+from openmdao.api import Group, IndepVarComp, ExecComp, FullFactorialDriver
 from openmdao.core.problem import Problem
 from openmdao.core.mpi_wrap import MPI
 from openmdao.recorders.dump_recorder import DumpRecorder
+from openmdao.recorders.inmem_recorder import InMemoryRecorder
 from openmdao.test.simple_comps import FanInGrouped
 from openmdao.test.mpi_util import MPITestCase
 from six import iteritems
@@ -95,6 +100,96 @@ class TestDumpRecorder(MPITestCase):
             self.assertEqual(dump[7], '  p2.x2: 1.0\n')
 
 
+class SerialInMemoryRecorder(InMemoryRecorder):
+    """ InMemoryRecorder that only records on rank 0, so the recorded
+    values are gathered from all ranks."""
+
+    def __init__(self):
+        super(SerialInMemoryRecorder, self).__init__()
+        self._parallel = False
+
+
+class TestGatherRecorded(MPITestCase):
+
+    N_PROCS = 2
+
+    def test_gather_vec(self):
+        prob = Problem(impl=impl)
+        prob.root = FanInGrouped()
+
+        # an int is passed by object, so it isn't put in the float buffers
+        prob.root.sub.add('comp4', IndepVarComp('n', 3))
+
+        rec = SerialInMemoryRecorder()
+        rec.options['record_params'] = True
+        rec.options['record_resids'] = True
+        prob.driver.add_recorder(rec)
+
+        prob.setup(check=False)
+        prob.run()
+
+        if not MPI or self.comm.rank == 0:
+            unknowns = rec.iters[0]['unknowns']
+            self.assertEqual(unknowns['comp3.y'], 29.0)
+            self.assertEqual(unknowns['sub.comp4.n'], 3)
+            self.assertIsInstance(unknowns['sub.comp4.n'], int)
+
+        if not MPI:
+            raise unittest.SkipTest("Gatherv is only used under MPI")
+
+        # the Gatherv path gives the same values and types as pickling
+        # all recorded values
+        root = prob.root
+        mgr = prob.driver.recorders
+        for kind, vec, names in (('p', root.params, mgr._vars_to_record['pnames']),
+                                 ('u', root.unknowns, mgr._vars_to_record['unames']),
+                                 ('r', root.resids, mgr._vars_to_record['rnames'])):
+            gathered = mgr._gather_vec(root, vec, kind)
+            pickled = mgr._gather_vars(root, {n: vec[n] for n in names})
+
+            if self.comm.rank == 0:
+                self.assertEqual(sorted(gathered), sorted(pickled))
+                for name in pickled:
+                    self.assertEqual(type(gathered[name]), type(pickled[name]))
+                    np.testing.assert_array_equal(gathered[name], pickled[name])
+
+    def test_gather_cases(self):
+        prob = Problem(impl=impl)
+        root = prob.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=1.0))
+        root.add('const', IndepVarComp('c', val=np.array([2.0, 3.0])))
+        root.add('count', IndepVarComp('n', 3))
+        root.add('mult', ExecComp('y=c*x', c=np.zeros(2), y=np.zeros(2)))
+
+        root.connect('indep_var.x', 'mult.x')
+        root.connect('const.c', 'mult.c')
+
+        num_levels = 8
+        prob.driver = FullFactorialDriver(num_levels=num_levels, num_par_doe=2)
+        prob.driver.add_desvar('indep_var.x', lower=1.0, upper=float(num_levels))
+        prob.driver.add_objective('mult.y')
+
+        rec = SerialInMemoryRecorder()
+        prob.driver.add_recorder(rec)
+
+        prob.setup(check=False)
+        prob.run()
+
+        if not MPI or self.comm.rank == 0:
+            self.assertEqual(len(rec.iters), num_levels)
+
+            xs = []
+            for data in rec.iters:
+                unknowns = data['unknowns']
+                xs.append(unknowns['indep_var.x'])
+                np.testing.assert_array_equal(unknowns['mult.y'],
+                                              unknowns['indep_var.x'] * np.array([2.0, 3.0]))
+                self.assertEqual(unknowns['count.n'], 3)
+                self.assertIsInstance(unknowns['count.n'], int)
+
+            self.assertEqual(sorted(xs), list(np.linspace(1.0, num_levels, num_levels)))
+
+
 if __name__ == '__main__':
     from openmdao.test.mpi_util import mpirun_tests
     mpirun_tests()
@@ -37,11 +37,14 @@ from openmdao.drivers.uniform_driver import UniformDriver
 from openmdao.drivers.fullfactorial_driver import FullFactorialDriver
 from openmdao.drivers.latinhypercube_driver import LatinHypercubeDriver
 from openmdao.drivers.case_driver import CaseDriver
+from openmdao.drivers.adaptive_doe_driver import AdaptiveDOEDriver, \
+    AcquisitionCriterion, MaxMinDistance, MaxKrigingRMSE
 
 #recorders
 from openmdao.recorders.base_recorder import BaseRecorder
 from openmdao.recorders.dump_recorder import DumpRecorder
 from openmdao.recorders.sqlite_recorder import SqliteRecorder
+from openmdao.recorders.columnar_recorder import ColumnarRecorder
 from openmdao.recorders.inmem_recorder import InMemoryRecorder
 from openmdao.recorders.case_reader import CaseReader
 
@@ -61,10 +64,12 @@ except ImportError:
 
 #surrogate models
 from openmdao.surrogate_models.kriging import KrigingSurrogate, FloatKrigingSurrogate
+from openmdao.surrogate_models.local_kriging import LocalKrigingSurrogate
 from openmdao.surrogate_models.multifi_cokriging import MultiFiCoKrigingSurrogate, \
     FloatMultiFiCoKrigingSurrogate
 from openmdao.surrogate_models.nearest_neighbor import NearestNeighbor
 from openmdao.surrogate_models.response_surface import ResponseSurface
+from openmdao.surrogate_models.shared_surrogate import SharedSurrogate
 from openmdao.surrogate_models.surrogate_model import SurrogateModel, \
     MultiFiSurrogateModel
 
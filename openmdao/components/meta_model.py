@@ -16,6 +16,18 @@ class MetaModel(Component):
 
     For a Float variable, the training data is an array of length m.
 
+    Args
+    ----
+    vec_size : int, optional
+        Number of points at which the surrogates are evaluated at once. If
+        greater than 1, each param and output gets a leading axis of this
+        size, while the training data still holds single points, and all
+        points are passed to the surrogates' `predict_batch` and
+        `linearize_batch` in one call. Surrogates must return arrays of
+        predictions in this mode. Note that the Jacobian is still returned
+        as dense arrays, so its size grows with the square of `vec_size`.
+        Defaults to 1.
+
     Options
     -------
     deriv_options['type'] :  str('user')
@@ -49,9 +61,11 @@ class MetaModel(Component):
         Set to True if you want linearize to be called even though you are using FD.
     """
 
-    def __init__(self):
+    def __init__(self, vec_size=1):
         super(MetaModel, self).__init__()
 
+        self.vec_size = vec_size
+
         # This surrogate will be used for all outputs that don't have
         # a specific surrogate assigned to them
         self.default_surrogate = None
@@ -68,9 +82,25 @@ class MetaModel(Component):
         # When set to False (default), the metamodel retrains with the new
         # dataset whenever the training data values are changed. When set to
         # True, the new data is appended to the old data and all of the data
-        # is used to train.
+        # is used to train. Surrogates that support incremental training are
+        # only given the new data, through their update method.
         self.warm_restart = False
 
+        # If set, trained surrogates are saved in this directory and loaded
+        # instead of trained again when a surrogate with the same class and
+        # options is trained on the same data, e.g., in a later run.
+        self.train_cache_dir = None
+
+        # When set to True, outputs whose surrogates have the same class and
+        # options are trained together, as one surrogate with several
+        # outputs, so the parts of the training that only depend on the
+        # inputs are done once. Kriging surrogates trained this way share
+        # their thetas across those outputs.
+        self.shared_training = False
+
+        # list of (surrogate, [(output name, slice of surrogate outputs)])
+        self._surrogate_groups = []
+
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
 
@@ -95,10 +125,13 @@ class MetaModel(Component):
         if training_data is None:
             training_data = []
 
+        if self.vec_size > 1:
+            val = self._vectorize_val(val, kwargs)
+
         super(MetaModel, self).add_param(name, val, **kwargs)
         super(MetaModel, self).add_param('train:'+name, val=training_data, pass_by_obj=True)
 
-        input_size = self._init_params_dict[name]['size']
+        input_size = self._init_params_dict[name]['size'] // self.vec_size
 
         self._surrogate_param_names.append((name, input_size))
         self._input_size += input_size
@@ -123,6 +156,9 @@ class MetaModel(Component):
         if training_data is None:
             training_data = []
 
+        if self.vec_size > 1:
+            val = self._vectorize_val(val, kwargs)
+
         super(MetaModel, self).add_output(name, val, **kwargs)
         super(MetaModel, self).add_param('train:'+name, val=training_data, pass_by_obj=True)
 
@@ -131,6 +167,9 @@ class MetaModel(Component):
         except KeyError: #then its some kind of object, and just assume scalar training data
             output_shape = 1
 
+        if self.vec_size > 1:
+            output_shape = output_shape[1:] or 1
+
         self._surrogate_output_names.append((name, output_shape))
         self._training_output[name] = np.zeros(0)
 
@@ -139,6 +178,14 @@ class MetaModel(Component):
         else:
             self._init_unknowns_dict[name]['default_surrogate'] = True
 
+    def _vectorize_val(self, val, kwargs):
+        """
+        Returns the value of a variable that holds `vec_size` copies of the
+        value of a single point, removing any 'shape' from kwargs.
+        """
+        val = self._get_initial_val(val, kwargs.pop('shape', 1))
+        return np.ones((self.vec_size,) + np.shape(val)) * val
+
     def _setup_variables(self):
         """Returns our params and unknowns dictionaries,
         re-keyed to use absolute variable names.
@@ -155,6 +202,10 @@ class MetaModel(Component):
                     surrogate = deepcopy(self.default_surrogate)
                     self._init_unknowns_dict[name]['surrogate'] = surrogate
 
+        # the surrogates can predict without being trained here if they
+        # were trained before they were added
+        self._surrogate_groups = self._group_surrogates()
+
         # training will occur on first execution after setup
         self.train = True
 
@@ -204,17 +255,112 @@ class MetaModel(Component):
         if self.train:
             self._train()
 
+        if self.vec_size > 1:
+            self._predict_batch(params, unknowns, self.vec_size)
+            return
+
         # Now Predict for current inputs
         inputs = self._params_to_inputs(params)
 
+        for name, pred in iteritems(self._predict_outputs(inputs)):
+            unknowns[name] = pred
+
+    def solve_nonlinear_batch(self, params, unknowns, resids):
+        """Predict outputs for a batch of cases at once, where each value
+        has a leading axis of cases. If the training flag is set, train the
+        metamodel first.
+
+        Args
+        ----
+        params : dict
+            Parameter values of each case.
+
+        unknowns : dict
+            Output values of each case.
+
+        resids : dict
+            Residual values of each case.
+        """
+        if self.train:
+            self._train()
+
+        name = self._surrogate_param_names[0][0]
+        num_cases = np.shape(params[name])[0]
+        self._predict_batch(params, unknowns, num_cases * self.vec_size)
+
+    def _predict_batch(self, params, unknowns, num_points):
+        """
+        Predicts the outputs at `num_points` points at once.
+        """
+        inputs = self._params_to_input_rows(params, num_points)
+
+        for name, pred in iteritems(self._predict_outputs(inputs, batch=True)):
+            unknowns[name] = np.reshape(pred, np.shape(unknowns[name]))
+
+    def _predict_outputs(self, inputs, batch=False):
+        """
+        Returns a dict of the prediction of each output at `inputs`, making
+        one prediction for each group of outputs that share a surrogate.
+        """
         for name, shape in self._surrogate_output_names:
-            surrogate = self._init_unknowns_dict[name].get('surrogate')
-            if surrogate:
-                unknowns[name] = surrogate.predict(inputs)
-            else:
+            if not self._init_unknowns_dict[name].get('surrogate'):
                 raise RuntimeError("Metamodel '%s': No surrogate specified for output '%s'"
                                    % (self.pathname, name))
 
+        preds = {}
+        for surrogate, outputs in self._surrogate_groups:
+            if batch:
+                pred = surrogate.predict_batch(inputs)
+            else:
+                pred = surrogate.predict(inputs)
+
+            if len(outputs) == 1:
+                preds[outputs[0][0]] = pred
+            else:
+                for name, cols in outputs:
+                    if isinstance(pred, tuple):
+                        preds[name] = tuple(np.asarray(p)[..., cols] for p in pred)
+                    else:
+                        preds[name] = np.asarray(pred)[..., cols]
+
+        return preds
+
+    def _linearize_outputs(self, inputs, batch=False):
+        """
+        Returns a dict of the Jacobian of each output at `inputs`, with
+        outputs along the second to last axis.
+        """
+        jacs = {}
+        for surrogate, outputs in self._surrogate_groups:
+            if batch:
+                sjac = surrogate.linearize_batch(inputs)
+            else:
+                sjac = surrogate.linearize(inputs)
+
+            if len(outputs) == 1:
+                jacs[outputs[0][0]] = sjac
+            else:
+                for name, cols in outputs:
+                    jacs[name] = sjac[..., cols, :]
+
+        return jacs
+
+    def _params_to_input_rows(self, params, num_points):
+        """
+        Converts from a dictionary of parameters holding `num_points` points
+        to a 2D ndarray of inputs with one point per row.
+        """
+        inputs = np.zeros((num_points, self._input_size))
+
+        idx = 0
+        for name, sz in self._surrogate_param_names:
+            val = np.asarray(params[name])
+            if np.iscomplexobj(val) and not np.iscomplexobj(inputs):
+                inputs = inputs.astype(complex)
+            inputs[:, idx:idx + sz] = val.reshape((num_points, sz))
+            idx += sz
+        return inputs
+
     def _params_to_inputs(self, params, out=None):
         """
         Converts from a dictionary of parameters to the ndarray input.
@@ -266,13 +412,13 @@ class MetaModel(Component):
             and whose values are ndarrays.
         """
 
+        if self.vec_size > 1:
+            return self._linearize_batch(params)
+
         jac = {}
         inputs = self._params_to_inputs(params)
 
-        for uname, _ in self._surrogate_output_names:
-            surrogate = self._init_unknowns_dict[uname].get('surrogate')
-            sjac = surrogate.linearize(inputs)
-
+        for uname, sjac in iteritems(self._linearize_outputs(inputs)):
             idx = 0
             for pname, sz in self._surrogate_param_names:
                 jac[(uname, pname)] = sjac[:, idx:idx+sz]
@@ -280,6 +426,36 @@ class MetaModel(Component):
 
         return jac
 
+    def _linearize_batch(self, params):
+        """
+        Returns the Jacobian of all `vec_size` points, which is block
+        diagonal since each output point only depends on its own inputs.
+
+        The framework multiplies and assembles component Jacobians as dense
+        arrays, so each (output, param) entry is a full
+        (vec_size*n_out, vec_size*n_in) array that is zero outside of its
+        diagonal blocks. Its memory grows with the square of `vec_size`;
+        e.g., 10000 points of a scalar output and param take 800 MB. Large
+        numbers of points are better split across several MetaModels.
+        """
+        jac = {}
+        num_points = self.vec_size
+        points = np.arange(num_points)
+        inputs = self._params_to_input_rows(params, num_points)
+
+        for uname, sjac in iteritems(self._linearize_outputs(inputs, batch=True)):
+            num_out = sjac.shape[1]
+
+            idx = 0
+            for pname, sz in self._surrogate_param_names:
+                blocks = np.zeros((num_points, num_out, num_points, sz), dtype=sjac.dtype)
+                blocks[points, :, points, :] = sjac[:, :, idx:idx+sz]
+                jac[(uname, pname)] = blocks.reshape((num_points * num_out,
+                                                      num_points * sz))
+                idx += sz
+
+        return jac
+
     def _train(self):
         """
         Train the metamodel, if necessary, using the provided training data.
@@ -334,6 +510,7 @@ class MetaModel(Component):
                         new_input[row_idx, idx:idx+sz] = v.flat
 
         # add training data for each output
+        new_outputs = {}
         for name, shape in self._surrogate_output_names:
             if num_sample > 0:
                 output_size = np.prod(shape)
@@ -360,12 +537,59 @@ class MetaModel(Component):
                             v = np.array(v)
                         new_output[row_idx, :] = v.flat
 
-            surrogate = self._init_unknowns_dict[name].get('surrogate')
-            if surrogate is not None:
-                surrogate.train(self._training_input, self._training_output[name])
+                new_outputs[name] = new_output
+
+        self._surrogate_groups = self._group_surrogates()
+
+        for surrogate, outputs in self._surrogate_groups:
+            names = [name for name, _ in outputs]
+            if len(names) == 1:
+                training_output = self._training_output[names[0]]
+            else:
+                training_output = np.hstack([self._training_output[name] for name in names])
+
+            if self.warm_restart and num_old_pts > 0 and surrogate.trained and \
+               surrogate.supports_update:
+                if num_sample > 0:
+                    surrogate.update(new_input, np.hstack([new_outputs[name]
+                                                           for name in names]))
+            elif self.train_cache_dir is not None:
+                surrogate.train_cached(self._training_input, training_output,
+                                       self.train_cache_dir)
+            else:
+                surrogate.train(self._training_input, training_output)
 
         self.train = False
 
+    def _group_surrogates(self):
+        """
+        Returns a list of (surrogate, outputs) pairs, where outputs lists the
+        name of each output that the surrogate predicts and the slice of the
+        surrogate's outputs that it takes. Each output has its own surrogate
+        unless shared_training is set.
+        """
+        groups = []
+        group_idx = {}
+
+        for name, shape in self._surrogate_output_names:
+            surrogate = self._init_unknowns_dict[name].get('surrogate')
+            if surrogate is None:
+                continue
+
+            size = int(np.prod(shape))
+            if self.shared_training:
+                key = surrogate._options_hash().hexdigest()
+                if key in group_idx:
+                    outputs = groups[group_idx[key]][1]
+                    start = outputs[-1][1].stop
+                    outputs.append((name, slice(start, start + size)))
+                    continue
+                group_idx[key] = len(groups)
+
+            groups.append((surrogate, [(name, slice(0, size))]))
+
+        return groups
+
     def _get_fd_params(self):
         """
         Get the list of parameters that are needed to perform a
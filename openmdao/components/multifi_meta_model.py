@@ -220,3 +220,17 @@ class MultiFiMetaModel(MetaModel):
                                         self._training_output[name])
 
         self.train = False
+
+    def _group_surrogates(self):
+        """
+        Returns a list of (surrogate, outputs) pairs with one pair for each
+        output, since each output's surrogate is trained on its own
+        multi-fidelity data.
+        """
+        groups = []
+        for name, shape in self._surrogate_output_names:
+            surrogate = self._init_unknowns_dict[name].get('surrogate')
+            if surrogate is not None:
+                groups.append((surrogate, [(name, slice(0, int(np.prod(shape))))]))
+
+        return groups
@@ -1,8 +1,11 @@
+import os
 import numpy as np
 import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
 
 from openmdao.api import Group, Problem, MetaModel, IndepVarComp, ResponseSurface, \
-    FloatKrigingSurrogate, KrigingSurrogate
+    FloatKrigingSurrogate, KrigingSurrogate, SharedSurrogate
 from openmdao.test.util import assert_rel_error
 
 from six.moves import cStringIO
@@ -232,6 +235,215 @@ class TestMetaModel(unittest.TestCase):
         assert_rel_error(self, prob['meta.y1'], 2.0, .00001)
         assert_rel_error(self, prob['meta.y2'], 4.0, .00001)
 
+    def test_warm_start_update(self):
+        class CountingSurface(ResponseSurface):
+            def __init__(self):
+                super(CountingSurface, self).__init__()
+                self.num_train = 0
+                self.num_update = 0
+
+            def train(self, x, y):
+                self.num_train += 1
+                super(CountingSurface, self).train(x, y)
+
+            def update(self, x, y):
+                self.num_update += 1
+                super(CountingSurface, self).update(x, y)
+
+        meta = MetaModel()
+        meta.add_param('x1', 0.)
+        meta.add_param('x2', 0.)
+        meta.add_output('y1', 0.)
+        meta.add_output('y2', 0., surrogate=ResponseSurface())
+        meta.default_surrogate = CountingSurface()
+        meta.warm_restart = True
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.setup(check=False)
+
+        prob['meta.train:x1'] = [1.0, 3.0]
+        prob['meta.train:x2'] = [1.0, 4.0]
+        prob['meta.train:y1'] = [3.0, 1.0]
+        prob['meta.train:y2'] = [1.0, 7.0]
+        prob.run()
+
+        for x1, x2 in [(2.0, 3.0), (0.0, 2.0)]:
+            prob['meta.train:x1'] = [x1]
+            prob['meta.train:x2'] = [x2]
+            prob['meta.train:y1'] = [x1 - x2]
+            prob['meta.train:y2'] = [x1 + x2]
+            meta.train = True
+
+            prob['meta.x1'] = x1
+            prob['meta.x2'] = x2
+            prob.run()
+            assert_rel_error(self, prob['meta.y1'], x1 - x2, 1e-8)
+            assert_rel_error(self, prob['meta.y2'], x1 + x2, 1e-8)
+
+        surrogate = prob.root.unknowns.metadata('meta.y1').get('surrogate')
+        self.assertEqual((surrogate.num_train, surrogate.num_update), (1, 2))
+        self.assertEqual(meta._training_input.shape, (4, 2))
+
+    def test_train_cache(self):
+        class CountingKriging(FloatKrigingSurrogate):
+            num_train = 0
+
+            def train(self, x, y):
+                CountingKriging.num_train += 1
+                super(CountingKriging, self).train(x, y)
+
+        cache_dir = mkdtemp()
+        try:
+            results = []
+            for i in range(2):
+                meta = MetaModel()
+                meta.add_param('x', 0., training_data=np.linspace(0, 10, 20))
+                meta.add_output('f', 0., training_data=np.sin(np.linspace(0, 10, 20)))
+                meta.default_surrogate = CountingKriging()
+                meta.train_cache_dir = cache_dir
+
+                prob = Problem(Group())
+                prob.root.add('meta', meta)
+                prob.setup(check=False)
+                prob['meta.x'] = 2.1
+                prob.run()
+                results.append(prob['meta.f'])
+
+            # the second problem loads the surrogate trained by the first
+            self.assertEqual(CountingKriging.num_train, 1)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            assert_rel_error(self, results[1], results[0], 1e-12)
+        finally:
+            rmtree(cache_dir)
+
+    def test_pretrained(self):
+        x_train = np.linspace(0., 1., 5).reshape((-1, 1))
+        surrogate = ResponseSurface()
+        surrogate.train(x_train, 2.*x_train + 1.)
+
+        meta = MetaModel()
+        meta.add_param('x', 0.)
+        meta.add_output('y', 0., surrogate=surrogate)
+
+        prob = Problem(Group())
+        prob.root.add('m', meta)
+        prob.setup(check=False)
+
+        # the surrogate was trained before it was added, so it predicts
+        # without any training data
+        meta.train = False
+        prob.run()
+        assert_rel_error(self, prob['m.y'], 1., 1e-10)
+
+    def test_shared_training(self):
+        class CountingResponseSurface(ResponseSurface):
+            num_train = 0
+
+            def train(self, x, y):
+                CountingResponseSurface.num_train += 1
+                super(CountingResponseSurface, self).train(x, y)
+
+        x_train = np.array([[a, b] for a in np.linspace(0., 1., 4)
+                                   for b in np.linspace(0., 1., 4)])
+
+        results = []
+        for shared in (False, True):
+            CountingResponseSurface.num_train = 0
+
+            meta = MetaModel()
+            meta.add_param('x', np.zeros(2), training_data=list(x_train))
+            meta.add_output('f', 0., training_data=[a*b for a, b in x_train])
+            meta.add_output('g', np.zeros(2),
+                            training_data=[np.array([a**2, a - b]) for a, b in x_train])
+            meta.default_surrogate = CountingResponseSurface()
+            meta.shared_training = shared
+
+            prob = Problem(Group())
+            prob.root.add('meta', meta, promotes=['x'])
+            prob.root.add('p', IndepVarComp('x', np.zeros(2)), promotes=['x'])
+            prob.setup(check=False)
+            prob['x'] = np.array([0.3, 0.6])
+            prob.run()
+
+            J = prob.calc_gradient(['x'], ['meta.f', 'meta.g'], return_format='array')
+            results.append((prob['meta.f'], prob['meta.g'], J))
+
+            self.assertEqual(CountingResponseSurface.num_train, 1 if shared else 2)
+
+        # the response surface of each output column doesn't depend on the others
+        for separate, shared in zip(*results):
+            assert_rel_error(self, shared, separate, 1e-10)
+        assert_rel_error(self, results[1][0], 0.18, 1e-10)
+        assert_rel_error(self, results[1][1], np.array([0.09, -0.3]), 1e-10)
+
+    def test_shared_training_options(self):
+        x_train = np.linspace(0., 1., 8)
+
+        for nugget in (None, 1e-6):
+            # surrogates built alike but with an option set afterwards
+            surrogate = KrigingSurrogate()
+            if nugget is not None:
+                surrogate.nugget = nugget
+
+            meta = MetaModel()
+            meta.add_param('x', 0., training_data=x_train)
+            meta.add_output('f', 0., training_data=np.sin(x_train),
+                            surrogate=KrigingSurrogate())
+            meta.add_output('g', 0., training_data=np.cos(x_train),
+                            surrogate=surrogate)
+            meta.shared_training = True
+
+            prob = Problem(Group())
+            prob.root.add('meta', meta)
+            prob.setup(check=False)
+            prob['meta.x'] = 0.4
+            prob.run()
+
+            groups = meta._surrogate_groups
+            self.assertEqual(len(groups), 1 if nugget is None else 2)
+            if nugget is not None:
+                self.assertEqual(groups[1][0].nugget, nugget)
+            assert_rel_error(self, prob['meta.f'], np.sin(0.4), 1e-3)
+            assert_rel_error(self, prob['meta.g'], np.cos(0.4), 1e-3)
+
+    def test_shared_surrogate(self):
+        class CountingKriging(FloatKrigingSurrogate):
+            num_train = 0
+
+            def train(self, x, y):
+                CountingKriging.num_train += 1
+                super(CountingKriging, self).train(x, y)
+
+        shared = SharedSurrogate(CountingKriging())
+        x_train = np.linspace(0, 10, 20)
+
+        prob = Problem(Group())
+        for i in range(3):
+            meta = MetaModel()
+            meta.add_param('x', 0., training_data=x_train)
+            meta.add_output('f', 0., training_data=np.sin(x_train))
+            meta.add_output('g', 0., training_data=np.cos(x_train))
+            meta.default_surrogate = shared
+            prob.root.add('meta%d' % i, meta)
+
+        prob.setup(check=False)
+
+        # different data for the last one
+        prob['meta2.train:g'] = np.cos(2 * x_train)
+        for i in range(3):
+            prob['meta%d.x' % i] = 2.1
+        prob.run()
+
+        # one training each for sin, cos and cos(2x)
+        self.assertEqual(CountingKriging.num_train, 3)
+
+        for i in range(3):
+            assert_rel_error(self, prob['meta%d.f' % i], np.sin(2.1), 1e-3)
+        assert_rel_error(self, prob['meta0.g'], np.cos(2.1), 1e-3)
+        assert_rel_error(self, prob['meta1.g'], np.cos(2.1), 1e-3)
+        assert_rel_error(self, prob['meta2.g'], np.cos(4.2), 1e-2)
+
     def test_vector_inputs(self):
 
         meta = MetaModel()
@@ -402,5 +614,49 @@ class TestMetaModel(unittest.TestCase):
             abs_error = float(match)
             self.assertTrue(abs_error < 1.e-6)
 
+    def test_vectorized(self):
+        x_train = np.array([[a, b] for a in np.linspace(0., 1., 4)
+                                   for b in np.linspace(0., 1., 4)])
+        f_train = [np.array([a + b**2, a*b]) for a, b in x_train]
+
+        meta = MetaModel(vec_size=5)
+        meta.add_param('x', np.zeros(2), training_data=list(x_train))
+        meta.add_output('f', np.zeros(2), training_data=f_train)
+        meta.default_surrogate = FloatKrigingSurrogate()
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta, promotes=['x'])
+        prob.root.add('p', IndepVarComp('x', np.zeros((5, 2))), promotes=['x'])
+        prob.setup(check=False)
+
+        x = np.random.RandomState(0).uniform(size=(5, 2))
+        prob['x'] = x
+        prob.run()
+
+        self.assertEqual(prob['meta.f'].shape, (5, 2))
+
+        # the same as evaluating each point by itself
+        surrogate = prob.root.unknowns.metadata('meta.f').get('surrogate')
+        for i in range(5):
+            assert_rel_error(self, prob['meta.f'][i], surrogate.predict(x[i]), 1e-10)
+
+        # block diagonal jacobian
+        J = prob.calc_gradient(['x'], ['meta.f'], return_format='array')
+        self.assertEqual(J.shape, (10, 10))
+        for i in range(5):
+            assert_rel_error(self, J[2*i:2*i+2, 2*i:2*i+2],
+                             surrogate.linearize(x[i]), 1e-12)
+        J[np.kron(np.eye(5), np.ones((2, 2))) == 1.] = 0.
+        self.assertEqual(np.count_nonzero(J), 0)
+
+        stream = cStringIO()
+        prob.check_partial_derivatives(out_stream=stream, global_options={'check_type': 'cs'})
+
+        abs_errors = findall('Absolute Error \(.+\) : (.+)', stream.getvalue())
+        self.assertTrue(len(abs_errors) > 0)
+        for match in abs_errors:
+            abs_error = float(match)
+            self.assertTrue(abs_error < 1.e-6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -107,6 +107,10 @@ class MultiFiMetaModelTestCase(unittest.TestCase):
         np.testing.assert_array_equal(surr.ytrain[0], expected_ytrain[0])
         np.testing.assert_array_equal(surr.ytrain[1], expected_ytrain[1])
 
+        prob['mm.x'] = 0.5
+        prob.run()
+        np.testing.assert_array_equal(surr.xpredict, 0.5)
+
     def test_two_dim_bi_fidelity_training(self):
         mm = MultiFiMetaModel(nfi=2)
         mm.add_param('x1', 0.)
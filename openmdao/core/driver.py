@@ -15,6 +15,7 @@ from openmdao.core.mpi_wrap import MPI
 from openmdao.util.options import OptionsDictionary
 from openmdao.recorders.recording_manager import RecordingManager
 from openmdao.util.record_util import create_local_meta, update_local_meta
+from openmdao.util.eval_cache import EvalCache
 from openmdao.core.vec_wrapper import _ByObjWrapper
 
 trace = os.environ.get('OPENMDAO_TRACE')
@@ -47,6 +48,18 @@ class Driver(object):
 
         # This driver's options
         self.options = OptionsDictionary()
+        self.options.add_option('eval_cache_size', 0, lower=0,
+                                desc='Number of design points whose function '
+                                'values are kept, so they are not recomputed if '
+                                'the optimizer requests them again. 0 disables '
+                                'the cache.')
+        self.options.add_option('eval_cache_tol', 0.0, lower=0.0,
+                                desc='Scaled design points that round to the same '
+                                'multiple of this tolerance share a cache entry. '
+                                '0.0 only matches identical points.')
+        self.options.add_option('eval_cache_gradients', True,
+                                desc='Set to False to only cache function values, '
+                                'and not gradients.')
 
         self._desvars = OrderedDict()
         self._objs = OrderedDict()
@@ -62,6 +75,8 @@ class Driver(object):
         self.dv_conversions = {}
         self.fn_conversions = {}
 
+        self._eval_cache = None
+
     def _setup(self):
         """ Updates metadata for params, constraints and objectives, and
         check for errors. Also determines all variables that need to be
@@ -744,6 +759,43 @@ class Driver(object):
 
         return cons
 
+    def _get_inactives(self, cons):
+        """ Returns the entries of the inequality constraints that are
+        farther than their active tolerance from all of their bounds. The
+        gradient calculation can skip these in adjoint mode.
+
+        Args
+        ----
+        cons : dict
+            Key is the constraint name, and value is an ndarray of its scaled
+            values.
+
+        Returns
+        -------
+        dict
+            Key is the constraint name, and value is the list of inactive
+            indices.
+        """
+        inactives = {}
+        for name, val in iteritems(cons):
+            meta = self._cons[name]
+            tol = meta.get('active_tol')
+            if tol is None or meta['equals'] is not None:
+                continue
+
+            val = np.atleast_1d(val)
+            inactive = np.ones(val.shape, dtype=bool)
+            if meta['lower'] is not None:
+                inactive &= val > meta['lower'] + tol
+            if meta['upper'] is not None:
+                inactive &= val < meta['upper'] - tol
+
+            idx = np.nonzero(inactive)[0]
+            if len(idx) > 0:
+                inactives[name] = list(idx)
+
+        return inactives
+
     def get_constraint_metadata(self):
         """ Returns a dict of constraint metadata.
 
@@ -787,6 +839,31 @@ class Driver(object):
 
         self.recorders.record_iteration(system, metadata)
 
+    def _init_eval_cache(self):
+        """ Creates an empty function evaluation cache, if one was requested
+        in the options. Optimizers that support the cache call this at the
+        start of each run.
+        """
+        size = self.options['eval_cache_size']
+        if size > 0:
+            self._eval_cache = EvalCache(size, self.options['eval_cache_tol'])
+        else:
+            self._eval_cache = None
+
+    def get_eval_cache_stats(self):
+        """ Returns the hit and miss counts of the function evaluation cache
+        in the last run.
+
+        Returns
+        -------
+        dict or None
+            Keys are 'hits' and 'misses', and values are dicts of the count
+            for 'funcs' and 'grad'. None if the cache wasn't used.
+        """
+        if self._eval_cache is None:
+            return None
+        return self._eval_cache.stats()
+
     def calc_gradient(self, indep_list, unknown_list, mode='auto',
                       return_format='array', sparsity=None, inactives=None):
         """ Returns the scaled gradient for the system that is contained in
@@ -1571,6 +1571,10 @@ class Problem(object):
         if cn_scale is None:
             cn_scale = {}
 
+        # Sets, since every solve looks up its index
+        if inactives:
+            inactives = dict((name, set(idxs)) for name, idxs in iteritems(inactives))
+
         # Respect choice of mode based on precedence.
         # Call arg > ln_solver option > auto-detect
         mode = self._mode(mode, indep_list, unknown_list)
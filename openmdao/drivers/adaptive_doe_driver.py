@@ -0,0 +1,301 @@
+"""
+OpenMDAO design-of-experiments driver that chooses each new case from the
+results of the cases that have already been run.
+"""
+
+from six import iteritems
+from six.moves import range
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from openmdao.drivers.predeterminedruns_driver import PredeterminedRunsDriver
+from openmdao.surrogate_models.kriging import KrigingSurrogate
+
+
+class AcquisitionCriterion(object):
+    """ Base class for the criteria used by `AdaptiveDOEDriver` to choose
+    the next point to evaluate. All points are normalized to the unit
+    hypercube spanned by the bounds of the design variables.
+    """
+
+    def select(self, x, y, pending, candidates):
+        """
+        Returns the index of the candidate point to evaluate next.
+
+        Args
+        ----
+        x : ndarray
+            Points that have been evaluated, one per row.
+
+        y : ndarray
+            Objective values at the evaluated points, one row per point.
+
+        pending : ndarray
+            Points that are being evaluated, one per row.
+
+        candidates : ndarray
+            Points to choose from, one per row.
+
+        Returns
+        -------
+        int
+            Index of the chosen candidate.
+        """
+        raise NotImplementedError("Class '%s' does not implement 'select'" %
+                                  self.__class__.__name__)
+
+
+class MaxMinDistance(AcquisitionCriterion):
+    """ Chooses the candidate that is farthest from all evaluated and
+    pending points, which fills the design space evenly.
+    """
+
+    def select(self, x, y, pending, candidates):
+        """
+        Returns the index of the candidate point to evaluate next.
+
+        Args
+        ----
+        x : ndarray
+            Points that have been evaluated, one per row.
+
+        y : ndarray
+            Objective values at the evaluated points, one row per point.
+
+        pending : ndarray
+            Points that are being evaluated, one per row.
+
+        candidates : ndarray
+            Points to choose from, one per row.
+
+        Returns
+        -------
+        int
+            Index of the chosen candidate.
+        """
+        points = np.vstack((x, pending))
+        if len(points) == 0:
+            return 0
+        return np.argmax(np.min(cdist(candidates, points), axis=1))
+
+
+class MaxKrigingRMSE(AcquisitionCriterion):
+    """ Chooses the candidate where a Kriging model of the objective is the
+    most uncertain. Pending points are added to the training data at their
+    predicted values, so their neighborhood isn't chosen again before they
+    finish. Falls back to `MaxMinDistance` when there aren't enough
+    evaluated points to train the model.
+
+    Args
+    ----
+    nugget : double, optional
+        Nugget smoothing parameter of the `KrigingSurrogate`.
+    """
+
+    def __init__(self, nugget=None):
+        self.nugget = nugget
+        self._fallback = MaxMinDistance()
+
+    def _train(self, x, y):
+        """ Returns a `KrigingSurrogate` trained on the given points. """
+        if self.nugget is None:
+            surrogate = KrigingSurrogate(eval_rmse=True)
+        else:
+            surrogate = KrigingSurrogate(nugget=self.nugget, eval_rmse=True)
+        surrogate.train(x, y)
+        return surrogate
+
+    def select(self, x, y, pending, candidates):
+        """
+        Returns the index of the candidate point to evaluate next.
+
+        Args
+        ----
+        x : ndarray
+            Points that have been evaluated, one per row.
+
+        y : ndarray
+            Objective values at the evaluated points, one row per point.
+
+        pending : ndarray
+            Points that are being evaluated, one per row.
+
+        candidates : ndarray
+            Points to choose from, one per row.
+
+        Returns
+        -------
+        int
+            Index of the chosen candidate.
+        """
+        if y.shape[1] == 0:
+            raise RuntimeError("MaxKrigingRMSE requires the driver to have "
+                               "an objective.")
+
+        if len(x) < 2:
+            return self._fallback.select(x, y, pending, candidates)
+
+        try:
+            surrogate = self._train(x, y)
+            if len(pending) > 0:
+                y_pending = surrogate.predict(pending)[0]
+                surrogate = self._train(np.vstack((x, pending)),
+                                        np.vstack((y, y_pending)))
+        except ValueError:
+            # hyperparameter optimization failed
+            return self._fallback.select(x, y, pending, candidates)
+
+        rmse = surrogate.predict(candidates)[1]
+        return np.argmax(np.sum(rmse, axis=1))
+
+
+class AdaptiveDOEDriver(PredeterminedRunsDriver):
+    """Design-of-experiments Driver that chooses each new case using an
+    acquisition criterion, based on the results of the cases that have
+    finished and the locations of those still running. The first cases form
+    a Latin hypercube. When running in parallel, a new case is chosen as
+    soon as a worker becomes free, so workers never wait for other cases.
+
+    Args
+    ----
+    num_samples : int, optional
+        The total number of cases to run. Defaults to 1.
+
+    num_initial : int or None, optional
+        The number of cases in the initial Latin hypercube. Defaults to one
+        more than the number of design variable entries.
+
+    acquisition : `AcquisitionCriterion`, optional
+        Criterion used to choose new points. Defaults to `MaxMinDistance`.
+
+    num_candidates : int, optional
+        The number of random points the acquisition criterion chooses
+        from. Defaults to 1000.
+
+    seed : int or None, optional
+        Seed for the random number generator.  Defaults to None.
+
+    num_par_doe : int, optional
+        The number of DOE cases to run concurrently.  Defaults to 1.
+
+    load_balance : bool, Optional
+        If True, use rank 0 as master and load balance cases among all of the
+        other ranks. Must be True when running cases in parallel under MPI.
+        Defaults to False.
+    """
+
+    def __init__(self, num_samples=1, num_initial=None, acquisition=None,
+                 num_candidates=1000, seed=None, num_par_doe=1,
+                 load_balance=False):
+        super(AdaptiveDOEDriver, self).__init__(num_par_doe=num_par_doe,
+                                                load_balance=load_balance)
+        self.num_samples = num_samples
+        self.num_initial = num_initial
+        self.acquisition = MaxMinDistance() if acquisition is None else acquisition
+        self.num_candidates = num_candidates
+        self.seed = seed
+
+    def _setup(self):
+        if self.options['restart']:
+            raise RuntimeError("AdaptiveDOEDriver can't be restarted, since "
+                               "its cases depend on the results of earlier ones.")
+
+        # the results of finished cases are collected as responses
+        for name in list(self._desvars) + list(self._objs):
+            if name not in self._respvars:
+                self.add_response(name)
+
+        super(AdaptiveDOEDriver, self)._setup()
+
+    def _get_bounds(self):
+        """Returns the flattened lower and upper bounds of all design
+        variables.
+        """
+        lower = []
+        upper = []
+        for name, meta in iteritems(self.get_desvar_metadata()):
+            lower.append(np.broadcast_to(meta['lower'], (meta['size'],)))
+            upper.append(np.broadcast_to(meta['upper'], (meta['size'],)))
+        return np.hstack(lower), np.hstack(upper)
+
+    def _collect_results(self, lower, span):
+        """Moves the cases that finished since the last call out of the
+        pending points and, if they succeeded, into the evaluated points.
+        """
+        iters = self._resp_recorder.iters
+        for data in iters[self._num_collected:]:
+            values = []
+            for name, meta in iteritems(self.get_desvar_metadata()):
+                # recorded values are model values, so apply the scaling
+                val = np.ravel(data['unknowns'][name])
+                values.append((val + meta['adder']) * meta['scaler'])
+            u = (np.hstack(values) - lower) / span
+
+            if self._pending:
+                dist = np.sum(np.square(np.array(self._pending) - u), axis=1)
+                del self._pending[np.argmin(dist)]
+
+            if data['success']:
+                self._x.append(u)
+                self._y.append(np.hstack([np.ravel(data['unknowns'][name])
+                                          for name in self._objs]))
+
+        self._num_collected = len(iters)
+
+    def _build_runlist(self):
+        """Yields cases one at a time, choosing each one from the results
+        that are available when it's requested.
+        """
+        rng = np.random.RandomState(self.seed)
+
+        lower, upper = self._get_bounds()
+        width = upper - lower
+        span = width.copy()
+        span[span == 0.] = 1.
+        ndim = len(lower)
+
+        self._x = []
+        self._y = []
+        self._pending = []
+        self._num_collected = len(self._resp_recorder.iters)
+
+        num_initial = self.num_initial
+        if num_initial is None:
+            num_initial = ndim + 1
+        num_initial = min(num_initial, self.num_samples)
+
+        # Latin hypercube with a random point in each cell
+        initial = np.empty((num_initial, ndim))
+        for j in range(ndim):
+            initial[:, j] = rng.permutation(num_initial) + rng.uniform(size=num_initial)
+        initial /= num_initial
+
+        for i in range(self.num_samples):
+            if i < num_initial:
+                u = initial[i]
+            else:
+                self._collect_results(lower, span)
+                candidates = rng.uniform(size=(self.num_candidates, ndim))
+                x = np.array(self._x).reshape(len(self._x), ndim)
+                y = np.array(self._y).reshape(len(self._y), -1)
+                pending = np.array(self._pending).reshape(len(self._pending), ndim)
+                u = candidates[self.acquisition.select(x, y, pending, candidates)]
+
+            self._pending.append(u)
+
+            values = lower + u * width
+            case = []
+            start = 0
+            for name, meta in iteritems(self.get_desvar_metadata()):
+                case.append([name, values[start:start + meta['size']]])
+                start += meta['size']
+
+            yield case
+
+    def _distrib_build_runlist(self):
+        """Cases can't be chosen independently on each rank, so only load
+        balanced parallel runs are supported under MPI.
+        """
+        raise RuntimeError("AdaptiveDOEDriver requires load_balance=True to "
+                           "run cases in parallel under MPI.")
@@ -2,10 +2,8 @@
 OpenMDAO design-of-experiments driver implementing the Full Factorial method.
 """
 
-from collections import OrderedDict
-import itertools
 from six import iteritems
-from six.moves import zip
+from six.moves import range, zip
 
 import numpy as np
 
@@ -35,30 +33,78 @@ class FullFactorialDriver(PredeterminedRunsDriver):
                                                   load_balance=load_balance)
         self.num_levels = num_levels
 
-    def _build_runlist(self):
-        value_arrays = OrderedDict()
+    def _get_levels(self):
+        """Returns the names and sizes of the design variables, along with
+        an array holding the levels of every design variable entry, one row
+        per entry.
+        """
+        names = []
+        sizes = []
+        levels = []
         for name, meta in iteritems(self.get_desvar_metadata()):
-            value_arrays[name] = []
+            names.append(name)
+            sizes.append(meta['size'])
 
             # Support for array desvars
-            val = self.root.unknowns._dat[name].val
-            nval = meta['size']
+            low = np.broadcast_to(meta['lower'], (meta['size'],))
+            high = np.broadcast_to(meta['upper'], (meta['size'],))
+            for k in range(meta['size']):
+                levels.append(np.linspace(low[k], high[k], num=self.num_levels))
+
+        return names, sizes, np.array(levels).reshape(len(levels), self.num_levels)
+
+    def _num_cases(self, levels):
+        """Returns the total number of cases for the given levels."""
+        return self.num_levels ** len(levels)
 
-            for k in range(nval):
+    def _get_case(self, names, sizes, levels, case_idx):
+        """Returns the case at index `case_idx` of the full factorial.
 
-                low = meta['lower']
-                high = meta['upper']
-                if isinstance(low, np.ndarray):
-                    low = low[k]
-                if isinstance(high, np.ndarray):
-                    high = high[k]
+        The index is decoded into a level index for each design variable
+        entry, with the last entry varying fastest, which gives the same
+        ordering as taking the product of all of the levels.
+        """
+        nentries = len(levels)
+        digits = np.zeros(nentries, dtype=int)
 
-                value_arrays[name].append(np.linspace(low, high,
-                                                      num=self.num_levels).tolist())
+        # Python ints, since the number of cases can overflow a C long
+        for i in range(nentries - 1, -1, -1):
+            case_idx, digits[i] = divmod(case_idx, self.num_levels)
 
-        keys = list(value_arrays.keys())
-        for name in keys:
-            value_arrays[name] = [np.array(x) for x in itertools.product(*value_arrays[name])]
+        values = levels[np.arange(nentries), digits]
 
-        for combination in itertools.product(*value_arrays.values()):
-            yield zip(keys, combination)
+        case = []
+        start = 0
+        for name, size in zip(names, sizes):
+            case.append((name, values[start:start + size]))
+            start += size
+
+        return case
+
+    def _build_runlist(self):
+        """Build a runlist that decodes each case from its index, so the
+        whole set of cases is never held in memory.
+        """
+        names, sizes, levels = self._get_levels()
+
+        for i in range(self._num_cases(levels)):
+            yield self._get_case(names, sizes, levels, i)
+
+    def _distrib_build_runlist(self):
+        """
+        Returns an iterator over (index, case) tuples of only those cases
+        meant to execute in the current rank as part of a parallel DOE. Cases
+        are decoded directly from their index, so cases of other ranks are
+        skipped without being generated.
+        """
+        if self.options['restart']:
+            # cases are skipped by going through the whole run list
+            for item in super(FullFactorialDriver, self)._distrib_build_runlist():
+                yield item
+            return
+
+        names, sizes, levels = self._get_levels()
+
+        for i in range(self._par_doe_id, self._num_cases(levels),
+                       self._num_par_doe):
+            yield i, self._get_case(names, sizes, levels, i)
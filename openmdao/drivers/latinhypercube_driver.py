@@ -3,6 +3,8 @@ OpenMDAO design-of-experiments Driver implementing the Latin Hypercube and Optim
 """
 
 from collections import OrderedDict
+from functools import partial
+import multiprocessing
 import os
 from random import shuffle, randint, seed
 
@@ -10,6 +12,7 @@ from six import iteritems, itervalues
 from six.moves import range, zip
 
 import numpy as np
+from scipy.spatial.distance import cdist, pdist
 
 from openmdao.drivers.predeterminedruns_driver import PredeterminedRunsDriver
 from openmdao.util.array_util import evenly_distrib_idxs
@@ -95,10 +98,11 @@ class LatinHypercubeDriver(PredeterminedRunsDriver):
 
     def _distrib_build_runlist(self):
         """
-        Returns an iterator over only those cases meant to execute
-        in the current rank as part of a parallel DOE. A latin hypercube,
-        unlike some other DOE generators, is created in one rank and then
-        the appropriate cases are scattered to the appropriate ranks.
+        Returns an iterator over (index, case) tuples of only those cases
+        meant to execute in the current rank as part of a parallel DOE. A
+        latin hypercube, unlike some other DOE generators, is created in one
+        rank and then the appropriate cases are scattered to the appropriate
+        ranks.
         """
         comm = self._full_comm
 
@@ -110,7 +114,8 @@ class LatinHypercubeDriver(PredeterminedRunsDriver):
         if comm.rank == 0:
             if trace:
                 debug('Parallel DOE using %d procs' % self._num_par_doe)
-            run_list = [list(case) for case in self._build_runlist()] # need to run iterator
+            # need to run iterator
+            run_list = [(index, list(case)) for index, case in self._get_runlist()]
 
             run_sizes, run_offsets = evenly_distrib_idxs(self._num_par_doe,
                                                          len(run_list))
@@ -122,8 +127,8 @@ class LatinHypercubeDriver(PredeterminedRunsDriver):
         run_list = comm.scatter(job_list, root=0)
         if trace: debug('Number of DOE jobs: %s (scatter DONE)' % len(run_list))
 
-        for case in run_list:
-            yield case
+        for index, case in run_list:
+            yield index, case
 
     def _get_lhc(self):
         """Generates a Latin Hypercube based on the number of samples and the
@@ -142,10 +147,38 @@ class LatinHypercubeDriver(PredeterminedRunsDriver):
 class OptimizedLatinHypercubeDriver(LatinHypercubeDriver):
     """Design-of-experiments Driver implementing the Morris-Mitchell method for
     an Optimized Latin Hypercube.
+
+    Args
+    ----
+    num_samples : int, optional
+        The number of samples to run. Defaults to 1.
+
+    seed : int or None, optional
+        Random seed.  Defaults to None.
+
+    population : int, optional
+        Size of the population of the evolutionary search. Defaults to 20.
+
+    generations : int, optional
+        Number of generations of the evolutionary search. Defaults to 2.
+
+    norm_method : int, optional
+        Order of the norm used to compute distances between points. Defaults to 1.
+
+    num_par_doe : int, optional
+        The number of DOE cases to run concurrently.  Defaults to 1.
+
+    load_balance : bool, Optional
+        If True, use rank 0 as master and load balance cases among all of the
+        other ranks. Defaults to False.
+
+    pool_size : int, optional
+        Number of processes used to evaluate the population of the
+        evolutionary search. Defaults to 1, which evaluates it in this process.
     """
 
     def __init__(self, num_samples=1, seed=None, population=20, generations=2,
-                norm_method=1, num_par_doe=1, load_balance=False):
+                norm_method=1, num_par_doe=1, load_balance=False, pool_size=1):
         super(OptimizedLatinHypercubeDriver, self).__init__(num_par_doe=num_par_doe,
                                                             load_balance=load_balance)
         self.qs = [1, 2, 5, 10, 20, 50, 100]  # List of qs to try for Phi_q optimization
@@ -154,6 +187,7 @@ class OptimizedLatinHypercubeDriver(LatinHypercubeDriver):
         self.population = population
         self.generations = generations
         self.norm_method = norm_method
+        self.pool_size = pool_size
 
     def _get_lhc(self):
         """Generate an Optimized Latin Hypercube
@@ -161,13 +195,23 @@ class OptimizedLatinHypercubeDriver(LatinHypercubeDriver):
 
         rand_lhc = _rand_latin_hypercube(self.num_samples, self.num_design_vars)
 
-        # Optimize our LHC before returning it
-        best_lhc = _LHC_Individual(rand_lhc, q=1, p=self.norm_method)
-        for q in self.qs:
-            lhc_start = _LHC_Individual(rand_lhc, q, self.norm_method)
-            lhc_opt = _mmlhs(lhc_start, self.population, self.generations)
-            if lhc_opt.mmphi() < best_lhc.mmphi():
-                best_lhc = lhc_opt
+        pool = None
+        if self.pool_size > 1:
+            pool = multiprocessing.Pool(self.pool_size)
+
+        try:
+            # Optimize our LHC before returning it
+            best_lhc = _LHC_Individual(rand_lhc, q=1, p=self.norm_method)
+            for q in self.qs:
+                lhc_start = _LHC_Individual(rand_lhc, q, self.norm_method)
+                lhc_opt = _mmlhs(lhc_start, self.population, self.generations,
+                                 pool=pool)
+                if lhc_opt.mmphi() < best_lhc.mmphi():
+                    best_lhc = lhc_opt
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         return best_lhc._get_doe().astype(int)
 
@@ -178,6 +222,7 @@ class _LHC_Individual(object):
         self.p = p
         self.doe = doe
         self.phi = None  # Morris-Mitchell sampling criterion
+        self._phi_sum = None  # phi ** q, the sum of d ** -q over all pairs
 
     @property
     def shape(self):
@@ -191,40 +236,48 @@ class _LHC_Individual(object):
         """
 
         if self.phi is None:
-            distdict = {}
-
             # Calculate the norm between each pair of points in the DOE
-            arr = self.doe
-            n, m = arr.shape
-            for i in range(1, n):
-                nrm = np.linalg.norm(arr[i] - arr[:i], ord=self.p, axis=1)
-                for j in range(0, i):
-                    nrmj = nrm[j]
-                    if nrmj in distdict:
-                        distdict[nrmj] += 1
-                    else:
-                        distdict[nrmj] = 1
-
-            size = len(distdict)
-
-            distinct_d = np.fromiter(distdict, dtype=float, count=size)
+            nrm = pdist(self.doe, 'minkowski', p=self.p)
 
             # Mutltiplicity array with a count of how many pairs of points
             # have a given distance
-            J = np.fromiter(itervalues(distdict), dtype=int, count=size)
+            distinct_d, J = np.unique(nrm, return_counts=True)
 
-            self.phi = sum(J * (distinct_d ** (-self.q))) ** (1.0 / self.q)
+            self._phi_sum = np.sum(J * (distinct_d ** (-self.q)))
+            self.phi = self._phi_sum ** (1.0 / self.q)
 
         return self.phi
 
+    def _pair_sum(self, doe, rows):
+        """Returns the sum of d ** -q over all pairs of points in `doe` that
+        include at least one of the given rows.
+        """
+        if len(rows) == 0:
+            return 0.0
+
+        mask = np.ones(doe.shape[0], dtype=bool)
+        mask[rows] = False
+        points = doe[rows]
+
+        total = np.sum(cdist(points, doe[mask], 'minkowski', p=self.p) ** (-self.q))
+        if len(rows) > 1:
+            total += np.sum(pdist(points, 'minkowski', p=self.p) ** (-self.q))
+
+        return total
+
     def perturb(self, mutation_count):
         """ Interchanges pairs of randomly chosen elements within randomly chosen
         columns of a DOE a number of times. The result of this operation will also
         be a Latin hypercube.
         """
 
-        new_doe = self.doe.copy()
+        return self._swap(self._draw_swaps(mutation_count))
+
+    def _draw_swaps(self, mutation_count):
+        """Returns a list of (column, row1, row2) elements to interchange."""
+
         n, k = self.doe.shape
+        swaps = []
         for count in range(mutation_count):
             col = randint(0, k - 1)
 
@@ -234,10 +287,42 @@ class _LHC_Individual(object):
             while el1 == el2:
                 el2 = randint(0, n - 1)
 
+            swaps.append((col, el1, el2))
+
+        return swaps
+
+    def _swap(self, swaps):
+        """Returns a new individual with the given elements interchanged. If
+        the criterion of this individual is known, the criterion of the new
+        one is updated from the distances of the changed rows only.
+        """
+
+        new_doe = self.doe.copy()
+        for col, el1, el2 in swaps:
             new_doe[el1, col] = self.doe[el2, col]
             new_doe[el2, col] = self.doe[el1, col]
 
-        return _LHC_Individual(new_doe, self.q, self.p)
+        new_lhc = _LHC_Individual(new_doe, self.q, self.p)
+
+        if self._phi_sum is not None:
+            rows = np.unique([el for _, el1, el2 in swaps for el in (el1, el2)])
+            if len(rows) > 0:
+                rows = rows[np.any(new_doe[rows] != self.doe[rows], axis=1)]
+
+            phi_sum = self._phi_sum - self._pair_sum(self.doe, rows) + \
+                self._pair_sum(new_doe, rows)
+
+            # For large q, the closest pairs make up nearly all of the sum, so
+            # taking away their terms can cancel most of its digits. The sum
+            # is only updated if little of it was lost, and found from all of
+            # the pairs otherwise.
+            if phi_sum > self._phi_sum / 16.:
+                new_lhc._phi_sum = phi_sum
+                new_lhc.phi = phi_sum ** (1.0 / self.q)
+            else:
+                new_lhc.mmphi()
+
+        return new_lhc
 
     def __iter__(self):
         return self._get_rows()
@@ -284,9 +369,18 @@ def _is_latin_hypercube(lh):
     return True
 
 
-def _mmlhs(x_start, population, generations):
+def _eval_swaps(lhc, swaps):
+    """Returns the criterion of `lhc` after interchanging the given elements.
+    Used to evaluate the population in a process pool.
+    """
+    return lhc._swap(swaps).mmphi()
+
+
+def _mmlhs(x_start, population, generations, pool=None):
     """Evolutionary search for most space filling Latin-Hypercube.
     Returns a new LatinHypercube instance with an optimized set of points.
+    If a multiprocessing `pool` is given, the offspring of each generation
+    are evaluated in it.
     """
 
     x_best = x_start
@@ -303,13 +397,23 @@ def _mmlhs(x_start, population, generations):
         x_improved = x_best
         phi_improved = phi_best
 
-        for offspring in range(population):
-            x_try = x_best.perturb(mutations)
-            phi_try = x_try.mmphi()
+        if pool is None:
+            for offspring in range(population):
+                x_try = x_best.perturb(mutations)
+                phi_try = x_try.mmphi()
 
-            if phi_try < phi_improved:
-                x_improved = x_try
-                phi_improved = phi_try
+                if phi_try < phi_improved:
+                    x_improved = x_try
+                    phi_improved = phi_try
+        else:
+            # draw the mutations here so results don't depend on the pool
+            all_swaps = [x_best._draw_swaps(mutations) for offspring in range(population)]
+            phis = pool.map(partial(_eval_swaps, x_best), all_swaps)
+
+            for swaps, phi_try in zip(all_swaps, phis):
+                if phi_try < phi_improved:
+                    x_improved = x_best._swap(swaps)
+                    phi_improved = phi_try
 
         if phi_improved < phi_best:
             phi_best = phi_improved
@@ -6,23 +6,30 @@ from __future__ import print_function
 
 import sys
 import os
+import pickle
+import random
 import traceback
 import logging
-from itertools import chain
-from six.moves import zip
-from six import next, PY3, iteritems, string_types
+from itertools import chain, islice
+from six.moves import range, zip
+from six import next, PY3, iteritems, itervalues, string_types, \
+                get_unbound_function
 
 import multiprocessing
+from numbers import Number
 
 import numpy
 
 from openmdao.core.problem import _get_root_var
 from openmdao.core.driver import Driver
+from openmdao.core.group import Group
+from openmdao.solvers.run_once import RunOnce
 from openmdao.util.record_util import create_local_meta, update_local_meta
 from openmdao.util.array_util import evenly_distrib_idxs
 from openmdao.core.mpi_wrap import MPI, debug, any_proc_is_true
 from openmdao.core.system import AnalysisError
 from openmdao.recorders.inmem_recorder import InMemoryRecorder
+from openmdao.recorders.case_reader import CaseReader
 
 trace = os.environ.get('OPENMDAO_TRACE')
 
@@ -77,6 +84,56 @@ def worker(problem, response_vars, case_queue, response_queue, worker_id): # pra
         logging.error(traceback.format_exc())
         raise
 
+def shared_mem_worker(problem, response_vars, inputs, outputs, case_queue,
+                      response_queue, worker_id): # pragma: no cover
+    """This is used to run parallel DOEs using multiprocessing with shared
+    memory. It takes a (slot, case id) pair off of the case_queue, reads the
+    design variables of the case from row `slot` of `inputs`, runs the case
+    and writes the responses to row `slot` of `outputs`. Only the slot goes
+    back on the response_queue, unless the case failed.
+    """
+    # set env var so comps/recorders know they're running in a worker proc
+    os.environ['OPENMDAO_WORKER_ID'] = str(worker_id)
+
+    try:
+        if sys.platform == 'win32':
+            problem.setup(check=False)
+
+        driver = problem.driver
+        root = driver.root
+
+        in_layout, out_layout = driver._shm_layouts
+        inbuf = numpy.frombuffer(inputs).reshape(-1, in_layout[-1][2])
+        outbuf = numpy.frombuffer(outputs).reshape(-1, out_layout[-1][2])
+
+        for slot, case_id in iter(case_queue.get, 'STOP'):
+            row = inbuf[slot]
+            case = [(name, row[start:end]) for name, start, end in in_layout]
+
+            metadata = driver._prep_case(case, case_id)
+
+            try:
+                terminate, exc = driver._try_case(root, metadata)
+                if not terminate:
+                    row = outbuf[slot]
+                    for name, start, end in out_layout:
+                        row[start:end] = numpy.ravel(_get_root_var(root, name))
+            except:
+                if metadata.get('msg'):
+                    metadata['msg'] += "\n\n%s" % traceback.format_exc()
+                else:
+                    metadata['msg'] = traceback.format_exc()
+                metadata['success'] = 0
+                metadata['terminate'] = 1
+
+            if metadata['success']:
+                response_queue.put(slot)
+            else:
+                response_queue.put((slot, metadata['terminate'], metadata['msg']))
+    except:
+        logging.error(traceback.format_exc())
+        raise
+
 class PredeterminedRunsDriver(Driver):
     """
     Baseclass for design-of-experiments Drivers that have pre-determined
@@ -92,6 +149,41 @@ class PredeterminedRunsDriver(Driver):
         cases among all of the other ranks. Default is False.  If
         multiprocessing is being used instead of MPI, then cases are always
         load balanced.
+
+    Options
+    -------
+    options['auto_add_response'] :  bool(False)
+        If True, all design vars, objectives and constraints are automatically added as responses.
+    options['batch_size'] :  int(1)
+        Number of cases pushed through the model at once when running in serial.
+        Components that define `solve_nonlinear_batch(params, unknowns, resids)`
+        evaluate all cases of a batch in one call, with every value given as
+        an array whose first axis is the case. Other components are run one
+        case at a time. Batches are only used when every `Group` in the model
+        uses a `RunOnce` solver and no variable is passed by object.
+    options['shared_memory'] :  bool(False)
+        If True, multiprocessing DOEs exchange design variables and responses
+        through shared memory arrays, so only case ids are sent between
+        processes. The worker processes are kept alive across calls to `run`
+        until `cleanup` is called, so they don't see changes made to the model
+        after the first run other than to the design variables. Only used if
+        all of the design variables and responses are numeric.
+    options['checkpoint_file'] :  str('')
+        If set, the state of the random number generators at the start of the
+        run list and the indices of the finished cases are saved to this file
+        every `checkpoint_interval` cases. Finished cases are tracked when
+        running in serial or with multiprocessing, but not under MPI.
+    options['checkpoint_interval'] :  int(100)
+        Number of cases between checkpoints.
+    options['restart'] :  bool(False)
+        If True, resume the run from `checkpoint_file`, if it exists, by
+        restoring the random number generators and skipping the cases that had
+        finished. Cases that were recorded successfully to `restart_file` are
+        skipped as well.
+    options['restart_file'] :  str('')
+        File written by a case recorder in an earlier run. When restarting,
+        cases whose design variable values match those of a successful case in
+        this file are skipped. The design variables must have been recorded.
     """
 
     def __init__(self, num_par_doe=1, load_balance=False):
@@ -102,12 +194,31 @@ class PredeterminedRunsDriver(Driver):
         self.options.add_option('auto_add_response', False,
                        desc="If True, all design vars, objectives and "
                             "constraints are automatically added as responses.")
+        self.options.add_option('batch_size', 1, lower=1,
+                       desc="Number of cases pushed through the model at once "
+                            "when running in serial.")
+        self.options.add_option('shared_memory', False,
+                       desc="If True, multiprocessing DOEs exchange design "
+                            "variables and responses through shared memory.")
+        self.options.add_option('checkpoint_file', '',
+                       desc="File where the state of the run list is saved.")
+        self.options.add_option('checkpoint_interval', 100, lower=1,
+                       desc="Number of cases between checkpoints.")
+        self.options.add_option('restart', False,
+                       desc="If True, resume the run from the checkpoint file "
+                            "and skip the cases recorded in the restart file.")
+        self.options.add_option('restart_file', '',
+                       desc="Recorder file of an earlier run whose cases are "
+                            "skipped when restarting.")
 
         self._num_par_doe = int(num_par_doe)
         self._par_doe_id = 0
         self._load_balance = load_balance
         self._respvars = []
         self._resp_recorder = None
+        self._shm_workers = None
+        self._shm_layouts = None
+        self._checkpoint = None
 
     def _setup_communicators(self, comm, parent_dir):
         """
@@ -420,11 +531,15 @@ class PredeterminedRunsDriver(Driver):
                         self._run_lb(problem.root)
                     else:
                         self._run_par_doe(problem.root)
+                elif self.options['shared_memory']: # use multiprocessing
+                    self._run_lb_shared_mem(problem)
                 else: # use multiprocessing
                     self._run_lb_multiproc(problem)
             else:
                 self._run_serial()
 
+        self._write_checkpoint()
+
     def _save_case(self, case, meta=None):
         if self._num_par_doe > 1:
             if self._load_balance:
@@ -476,35 +591,231 @@ class PredeterminedRunsDriver(Driver):
 
         root = self.root
 
-        for case in self._build_runlist():
-            metadata = self._prep_case(case, self.iter_count)
+        if self.options['batch_size'] > 1:
+            plan = self._get_batch_plan()
+            if plan is not None:
+                self._run_batches(plan)
+                return
+
+        for index, case in self._get_runlist():
+            self._run_serial_case(root, index, case)
+
+    def _run_serial_case(self, root, index, case):
+        """Runs and records a single case in serial."""
+        metadata = self._prep_case(case, index)
+
+        terminate, exc = self._try_case(root, metadata)
 
-            terminate, exc = self._try_case(root, metadata)
+        if exc is not None:
+            if PY3:
+                raise exc[0].with_traceback(exc[1], exc[2])
+            else:
+                # exec needed here since otherwise python3 will
+                # barf with a syntax error  :(
+                exec('raise exc[0], exc[1], exc[2]')
+
+        self._save_case(case, metadata)
+        self.iter_count += 1
+        self._update_checkpoint(index)
 
-            if exc is not None:
-                if PY3:
-                    raise exc[0].with_traceback(exc[1], exc[2])
+    def _get_batch_plan(self):
+        """
+        Returns a list of (component, info) tuples in execution order
+        describing how to run the model on a batch of cases, or None if
+        the model can't be run in batches. For components that support
+        batches, info holds the columns of the flat unknowns vector that each
+        of the component's variables maps to. For the others, it holds the
+        data transfers needed to run the component one case at a time.
+        """
+        root = self.root
+
+        if MPI:
+            return None
+
+        for group in root.subgroups(recurse=True, include_self=True):
+            if type(group.nl_solver) is not RunOnce or \
+               get_unbound_function(type(group).solve_nonlinear) is not \
+               get_unbound_function(Group.solve_nonlinear):
+                return None
+
+        for acc in itervalues(root.unknowns._dat):
+            if acc.slice is None:
+                return None
+
+        to_prom_name = root._sysdata.to_prom_name
+        connections = root.connections
+        plan = []
+
+        for comp in root.components(recurse=True):
+            if not hasattr(comp, 'solve_nonlinear_batch'):
+                plan.append((comp, {'path': self._transfer_path(comp)}))
+                continue
+
+            params = []
+            for name, acc in iteritems(comp.params._dat):
+                meta = acc.meta
+                shape = numpy.shape(meta['val'])
+                src = connections.get(meta['pathname'])
+                if src is None or acc.pbo:
+                    # unconnected, so the value is the same in every case
+                    params.append((name, None, None, shape))
+                    continue
+
+                src_pathname, idxs = src
+                start, end = root.unknowns._dat[to_prom_name[src_pathname]].slice
+                if idxs is None:
+                    cols = slice(start, end)
                 else:
-                    # exec needed here since otherwise python3 will
-                    # barf with a syntax error  :(
-                    exec('raise exc[0], exc[1], exc[2]')
+                    cols = start + numpy.asarray(idxs).ravel()
+                params.append((name, cols, meta.get('unit_conv'), shape))
 
-            self._save_case(case, metadata)
-            self.iter_count += 1
+            unknowns = []
+            for name, acc in iteritems(comp.unknowns._dat):
+                start, end = root.unknowns._dat[to_prom_name[acc.meta['pathname']]].slice
+                unknowns.append((name, slice(start, end), numpy.shape(acc.meta['val'])))
+
+            plan.append((comp, {'params': params, 'unknowns': unknowns}))
+
+        if all('path' in info for comp, info in plan):
+            return None
+
+        return plan
+
+    def _transfer_path(self, comp):
+        """Returns the (group, subsystem name) transfers that bring data
+        from the root down to `comp`.
+        """
+        path = []
+        group = self.root
+        for name in comp.pathname.split('.'):
+            path.append((group, name))
+            group = group._subsystems.get(name)
+        return path
+
+    def _run_batches(self, plan):
+        """Runs the DOE in serial, pushing `batch_size` cases at a time
+        through the model.
+        """
+        root = self.root
+        runiter = self._get_runlist()
+
+        transfers = [(group, sub.name)
+                     for group in root.subgroups(recurse=True, include_self=True)
+                     for sub in itervalues(group._subsystems)]
+
+        while True:
+            cases = [(index, list(case)) for index, case in
+                     islice(runiter, self.options['batch_size'])]
+            if not cases:
+                break
+
+            metas = []
+            U = numpy.empty((len(cases), root.unknowns.vec.size))
+            R = numpy.zeros(U.shape)
+            for i, (index, case) in enumerate(cases):
+                metas.append(self._prep_case(case, index))
+                U[i] = root.unknowns.vec
+
+            try:
+                self._solve_batch(plan, U, R)
+            except AnalysisError:
+                # rerun the cases one at a time so each failure is recorded
+                # with the case that caused it
+                for index, case in cases:
+                    self._run_serial_case(root, index, case)
+                continue
+
+            for i, (index, case) in enumerate(cases):
+                root.unknowns.vec[:] = U[i]
+                root.resids.vec[:] = R[i]
+                for group, name in transfers:
+                    group._transfer_data(name)
+
+                self._record_solvers(root, metas[i])
+                self._save_case(case, metas[i])
+                self.iter_count += 1
+                self._update_checkpoint(index)
+
+    def _record_solvers(self, group, metadata):
+        """Does what the `RunOnce` solvers of `group` and its subgroups do
+        after running their children, so that solver recorders see the
+        same iterations for a case run in a batch as for one run on its own.
+        """
+        solver = group.nl_solver
+        solver.iter_count += 1
+        local_meta = create_local_meta(metadata, group.name)
+        group.ln_solver.local_meta = local_meta
+        update_local_meta(local_meta, (solver.iter_count,))
+
+        for sub in itervalues(group._subsystems):
+            if isinstance(sub, Group):
+                self._record_solvers(sub, local_meta)
+
+        solver.recorders.record_iteration(group, local_meta)
+
+    def _solve_batch(self, plan, U, R):
+        """Runs the model on a batch of cases, where each row of `U` and `R`
+        holds the flat unknowns and resids vectors of one case.
+        """
+        root = self.root
+        nbatch = U.shape[0]
+
+        for comp, info in plan:
+            if 'path' in info:
+                # component doesn't support batches, so run each case
+                for i in range(nbatch):
+                    root.unknowns.vec[:] = U[i]
+                    root.resids.vec[:] = R[i]
+                    for group, name in info['path']:
+                        group._transfer_data(name)
+
+                    with comp._dircontext:
+                        comp._sys_solve_nonlinear(comp.params, comp.unknowns,
+                                                  comp.resids)
+
+                    U[i] = root.unknowns.vec
+                    R[i] = root.resids.vec
+                continue
+
+            params = {}
+            for name, cols, unit_conv, shape in info['params']:
+                if cols is None:
+                    val = numpy.asarray(comp.params[name])
+                    params[name] = numpy.repeat(val[numpy.newaxis], nbatch, axis=0)
+                else:
+                    val = U[:, cols]
+                    if unit_conv is not None:
+                        scale, offset = unit_conv
+                        val = (val + offset) * scale
+                    params[name] = val.reshape((nbatch,) + shape)
+
+            unknowns = {}
+            resids = {}
+            for name, cols, shape in info['unknowns']:
+                unknowns[name] = U[:, cols].reshape((nbatch,) + shape)
+                resids[name] = R[:, cols].reshape((nbatch,) + shape)
+
+            with comp._dircontext:
+                comp.solve_nonlinear_batch(params, unknowns, resids)
+
+            for name, cols, shape in info['unknowns']:
+                U[:, cols] = numpy.reshape(unknowns[name], (nbatch, -1))
+                R[:, cols] = numpy.reshape(resids[name], (nbatch, -1))
 
     def _run_par_doe(self, root):
         """This runs the DOE in parallel where cases are evenly distributed
         among all processes.
         """
 
-        for case in self._get_case_w_nones(self._distrib_build_runlist()):
-            if case is None: # dummy cases have case == None
+        for item in self._get_case_w_nones(self._distrib_build_runlist()):
+            if item is None: # dummy cases have case == None
                 # must take part in collective Allreduce call
                 any_proc_is_true(self._full_comm, False)
-                metadata = None
+                case = metadata = None
 
             else:  # case is not a dummy case
-                metadata = self._prep_case(case, self.iter_count)
+                index, case = item
+                metadata = self._prep_case(case, index)
 
                 terminate, exc = self._try_case(root, metadata)
 
@@ -536,7 +847,8 @@ class PredeterminedRunsDriver(Driver):
                 # we're the master rank and case is a completed case
                 self._save_case(case)
             else:  # we're a worker
-                metadata = self._prep_case(case, self.iter_count)
+                index, case = case
+                metadata = self._prep_case(case, index)
 
                 self._try_case(root, metadata)
 
@@ -575,7 +887,7 @@ class PredeterminedRunsDriver(Driver):
         response_vars = uvars + pvars
         numuvars = len(uvars)
 
-        runiter = self._build_runlist()
+        runiter = self._get_runlist()
 
         # Create queues
         if sys.platform == 'win32':
@@ -598,15 +910,13 @@ class PredeterminedRunsDriver(Driver):
         for proc in procs:
             proc.start()
 
-        iter_count = 0
         num_active = 0
         empty = {}
         try:
             for proc in procs:
                 # case is a generator, so must make a list to send
-                case = list(next(runiter))
-                task_queue.put((iter_count, case))
-                iter_count += 1
+                index, case = next(runiter)
+                task_queue.put((index, list(case)))
                 num_active += 1
         except StopIteration:
             pass
@@ -623,9 +933,9 @@ class PredeterminedRunsDriver(Driver):
                         break
 
                     self.recorders.record_completed_case(root, complete_case)
-                    case = list(next(runiter))
-                    task_queue.put((iter_count, case))
-                    iter_count += 1
+                    self._update_checkpoint(meta['id'])
+                    index, case = next(runiter)
+                    task_queue.put((index, list(case)))
                     num_active += 1
             except StopIteration:
                 pass
@@ -644,10 +954,327 @@ class PredeterminedRunsDriver(Driver):
                 continue
 
             self.recorders.record_completed_case(root, complete_case)
+            self._update_checkpoint(meta['id'])
+
+        for proc in procs:
+            proc.join()
+
+    def _get_shm_layouts(self, root, response_vars):
+        """
+        Returns the layouts of the rows of the shared input and output
+        arrays, as lists of (name, start, end) tuples, along with the function
+        that converts each response back to its type. Returns None if any
+        design variable or response isn't numeric.
+        """
+        in_layout = []
+        start = 0
+        for name, meta in iteritems(self.get_desvar_metadata()):
+            in_layout.append((name, start, start + meta['size']))
+            start += meta['size']
+
+        out_layout = []
+        converters = []
+        start = 0
+        for name in response_vars:
+            val = _get_root_var(root, name)
+            if isinstance(val, numpy.ndarray):
+                if val.dtype.kind not in 'biuf':
+                    return None
+                shape, dtype = val.shape, val.dtype
+                converters.append(lambda v, shape=shape, dtype=dtype:
+                                  v.reshape(shape).astype(dtype))
+            elif isinstance(val, Number) and not isinstance(val, complex):
+                converters.append(lambda v, typ=type(val): typ(v[0]))
+            else:
+                return None
+            out_layout.append((name, start, start + numpy.size(val)))
+            start += numpy.size(val)
+
+        # rows can't be empty
+        if not in_layout or not out_layout:
+            return None
+
+        return in_layout, out_layout, converters
+
+    def _start_shm_workers(self, problem, response_vars):
+        """
+        Returns the persistent worker processes for a shared memory
+        multiprocessing DOE, starting them if they aren't running. Returns
+        None if the DOE can't use shared memory.
+        """
+        workers = self._shm_workers
+        if workers is not None and workers['response_vars'] == response_vars:
+            return workers
+
+        self._stop_shm_workers()
+
+        layouts = self._get_shm_layouts(problem.root, response_vars)
+        if layouts is None:
+            return None
+
+        in_layout, out_layout, converters = layouts
+        self._shm_layouts = (in_layout, out_layout)
+
+        # one row for each case that can be in progress
+        nslots = self._num_par_doe
+        inputs = multiprocessing.RawArray('d', nslots * in_layout[-1][2])
+        outputs = multiprocessing.RawArray('d', nslots * out_layout[-1][2])
+
+        # Create queues
+        if sys.platform == 'win32':
+            manager = multiprocessing.Manager()
+            task_queue = manager.Queue()
+            done_queue = manager.Queue()
+        else:
+            task_queue = multiprocessing.Queue()
+            done_queue = multiprocessing.Queue()
+
+        procs = []
+        for i in range(self._num_par_doe):
+            proc = multiprocessing.Process(target=shared_mem_worker,
+                                           args=(problem, response_vars,
+                                                 inputs, outputs, task_queue,
+                                                 done_queue, i))
+            # don't hang on exit if cleanup is never called
+            proc.daemon = True
+            procs.append(proc)
 
         for proc in procs:
+            proc.start()
+
+        self._shm_workers = workers = {
+            'response_vars': response_vars,
+            'procs': procs,
+            'task_queue': task_queue,
+            'done_queue': done_queue,
+            'inbuf': numpy.frombuffer(inputs).reshape(nslots, in_layout[-1][2]),
+            'outbuf': numpy.frombuffer(outputs).reshape(nslots, out_layout[-1][2]),
+            'converters': converters,
+        }
+
+        return workers
+
+    def _stop_shm_workers(self):
+        """Stops any persistent shared memory worker processes."""
+        workers = self._shm_workers
+        if workers is None:
+            return
+
+        for proc in workers['procs']:
+            workers['task_queue'].put('STOP')
+        for proc in workers['procs']:
             proc.join()
 
+        self._shm_workers = None
+        self._shm_layouts = None
+
+    def _run_lb_shared_mem(self, problem):
+        """This runs the DOE in parallel with load balancing via
+        multiprocessing, passing the design variables and responses of each
+        case through shared memory. A new case is distributed to a worker
+        process as soon as it finishes its previous case.
+        """
+        root = problem.root
+
+        uvars = list(self.recorders._vars_to_record['unames'])
+        pvars = list(self.recorders._vars_to_record['pnames'])
+        response_vars = uvars + pvars
+        numuvars = len(uvars)
+
+        workers = self._start_shm_workers(problem, response_vars)
+        if workers is None:
+            self._run_lb_multiproc(problem)
+            return
+
+        in_layout, out_layout = self._shm_layouts
+        in_slices = dict((name, slice(start, end)) for name, start, end in in_layout)
+        task_queue = workers['task_queue']
+        done_queue = workers['done_queue']
+        inbuf = workers['inbuf']
+        outbuf = workers['outbuf']
+        converters = workers['converters']
+
+        runiter = self._get_runlist()
+        free_slots = list(range(inbuf.shape[0]))
+        active = {}  # slot -> case index
+        terminating = False
+
+        while True:
+            while free_slots and not terminating:
+                try:
+                    index, case = next(runiter)
+                except StopIteration:
+                    break
+
+                slot = free_slots.pop()
+                row = inbuf[slot]
+                for name, val in case:
+                    row[in_slices[name]] = numpy.ravel(val)
+
+                task_queue.put((slot, index))
+                active[slot] = index
+
+            if not active:
+                break
+
+            response = done_queue.get()
+            if isinstance(response, tuple):
+                slot, terminate, msg = response
+            else:
+                slot, terminate, msg = response, 0, None
+
+            index = active.pop(slot)
+            metadata = create_local_meta(None, 'Driver')
+            update_local_meta(metadata, (index,))
+            metadata['terminate'] = terminate
+            if msg is not None:
+                metadata['success'] = 0
+                metadata['msg'] = msg
+
+            row = outbuf[slot]
+            values = [conv(row[start:end]) for conv, (name, start, end)
+                      in zip(converters, out_layout)]
+            free_slots.append(slot)
+
+            complete_case = self._build_case(metadata, uvars, pvars,
+                                             numuvars, values)
+            if complete_case is None:
+                # there was a fatal error, don't run more cases
+                terminating = True
+                continue
+
+            self.recorders.record_completed_case(root, complete_case)
+            self._update_checkpoint(index)
+
+    def cleanup(self):
+        """ Clean up resources prior to exit. """
+        self._stop_shm_workers()
+        super(PredeterminedRunsDriver, self).cleanup()
+
+    def _get_runlist(self):
+        """
+        Returns an iterator over (index, case) tuples of the run list, where
+        index is the position of the case in the full run list, which is used
+        as its iteration coordinate. When restarting, the random number
+        generators are restored from the checkpoint file and the cases that
+        finished in an earlier run are skipped, so the cases that are run
+        keep the coordinates they had in the earlier run.
+        """
+        num_finished = 0
+        finished = set()
+        ckfile = self.options['checkpoint_file']
+        if self.options['restart'] and ckfile and os.path.isfile(ckfile):
+            with open(ckfile, 'rb') as f:
+                checkpoint = pickle.load(f)
+            numpy.random.set_state(checkpoint['numpy_rng'])
+            random.setstate(checkpoint['python_rng'])
+            num_finished = checkpoint['num_finished']
+            finished = set(checkpoint.get('finished', ()))
+
+        # all cases before num_finished have finished, along with those
+        # in finished
+        self._checkpoint = {
+            'numpy_rng': numpy.random.get_state(),
+            'python_rng': random.getstate(),
+            'num_finished': num_finished,
+            'finished': finished,
+        }
+        self._num_checkpointed = 0
+        self._write_checkpoint()
+
+        recorded = None
+        if self.options['restart'] and self.options['restart_file']:
+            recorded = self._get_recorded_cases(self.options['restart_file'])
+
+        for i, case in enumerate(self._build_runlist()):
+            if i < num_finished or i in finished:
+                continue
+            if recorded and self._get_case_key(case) in recorded:
+                self._mark_finished(i)
+                continue
+            yield i, case
+
+    def _get_case_key(self, case):
+        """Returns the model values of the design variables of a case as
+        bytes, so they can be compared with recorded values.
+        """
+        values = []
+        for name, value in case:
+            meta = self._desvars[name]
+            value = numpy.asarray(value, dtype=float).ravel() / meta['scaler']
+            values.append(value - meta['adder'])
+        return numpy.concatenate(values).tobytes()
+
+    def _get_recorded_cases(self, filename):
+        """Returns the keys of the successful cases recorded in the given
+        file.
+        """
+        reader = CaseReader(filename)
+
+        recorded = set()
+        for case_id in reader.list_cases():
+            case = reader.get_case(case_id)
+            if not case.success:
+                continue
+
+            values = []
+            for name, meta in iteritems(self._desvars):
+                try:
+                    value = case.unknowns[name]
+                except KeyError:
+                    raise RuntimeError("Design variable '%s' was not recorded "
+                                       "in restart file '%s'." % (name, filename))
+                value = numpy.asarray(value, dtype=float).ravel()
+                if meta.get('indices') is not None:
+                    value = value[meta['indices']]
+                values.append(value)
+            recorded.add(numpy.concatenate(values).tobytes())
+
+        return recorded
+
+    def _mark_finished(self, index):
+        """Adds the case at `index` of the run list to the finished cases."""
+        checkpoint = self._checkpoint
+        if checkpoint is None:
+            return
+
+        finished = checkpoint['finished']
+        finished.add(index)
+
+        num_finished = checkpoint['num_finished']
+        while num_finished in finished:
+            finished.remove(num_finished)
+            num_finished += 1
+        checkpoint['num_finished'] = num_finished
+
+    def _update_checkpoint(self, index):
+        """Marks the case at `index` of the run list as finished, writing a
+        checkpoint every `checkpoint_interval` cases.
+        """
+        if self._checkpoint is None:
+            return
+
+        self._mark_finished(index)
+        self._num_checkpointed += 1
+        if self._num_checkpointed % self.options['checkpoint_interval'] == 0:
+            self._write_checkpoint()
+
+    def _write_checkpoint(self):
+        """Saves the current checkpoint to `checkpoint_file`, if set."""
+        ckfile = self.options['checkpoint_file']
+        if not ckfile or self._checkpoint is None:
+            return
+        if MPI and self._full_comm.rank != 0:
+            return
+
+        # write to a temporary file first so a crash can't corrupt it
+        tmpfile = ckfile + '.tmp'
+        with open(tmpfile, 'wb') as f:
+            pickle.dump(self._checkpoint, f, pickle.HIGHEST_PROTOCOL)
+        if sys.platform == 'win32' and os.path.exists(ckfile):
+            os.remove(ckfile)
+        os.rename(tmpfile, ckfile)
+
     def _get_case_w_nones(self, it):
         """A wrapper around a case generator that returns None cases if
         any of the other members of the MPI comm have any cases left to run,
@@ -679,16 +1306,16 @@ class PredeterminedRunsDriver(Driver):
 
     def _distrib_build_runlist(self):
         """
-        Returns an iterator over only those cases meant to execute
-        in the current rank as part of a parallel DOE. _build_runlist
-        will be called on all ranks, but only those cases targeted to
+        Returns an iterator over (index, case) tuples of only those cases
+        meant to execute in the current rank as part of a parallel DOE.
+        _build_runlist will be called on all ranks, but only those cases targeted to
         this rank will run. Override this method
         (see LatinHypercubeDriver) if your DOE generator needs to
         create all cases on one rank and scatter them to other ranks.
         """
-        for i, case in enumerate(self._build_runlist()):
+        for i, (index, case) in enumerate(self._get_runlist()):
             if (i % self._num_par_doe) == self._par_doe_id:
-                yield case
+                yield index, case
 
     def _distrib_lb_build_runlist(self):
         """
@@ -699,7 +1326,7 @@ class PredeterminedRunsDriver(Driver):
         comm = self._full_comm
 
         if self._full_comm.rank == 0:  # master rank
-            runiter = self._build_runlist()
+            runiter = self._get_runlist()
             received = 0
             sent = 0
 
@@ -721,7 +1348,8 @@ class PredeterminedRunsDriver(Driver):
             for i in range(1, self._num_par_doe):
                 try:
                     # case is a generator, so must make a list to send
-                    case = list(next(runiter))
+                    index, case = next(runiter)
+                    case = (index, list(case))
                 except StopIteration:
                     break
                 size, offset = self._id_map[i]
@@ -784,7 +1412,8 @@ class PredeterminedRunsDriver(Driver):
 
                             if more_cases:
                                 try:
-                                    case = list(next(runiter))
+                                    index, case = next(runiter)
+                                    case = (index, list(case))
                                 except StopIteration:
                                     more_cases = False
                                 else:
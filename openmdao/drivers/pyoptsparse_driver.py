@@ -7,6 +7,8 @@ additional MPI capability.
 
 from __future__ import print_function
 
+import os
+import shutil
 import traceback
 from six import iteritems
 from six.moves import range
@@ -64,6 +66,12 @@ class pyOptSparseDriver(Driver):
 
     Options
     -------
+    options['eval_cache_gradients'] :  bool(True)
+        Set to False to only cache function values, and not gradients.
+    options['eval_cache_size'] :  int(0)
+        Number of design points whose function values are kept for reuse. 0 disables the cache.
+    options['eval_cache_tol'] :  float(0.0)
+        Scaled design points that round to the same multiple of this tolerance share a cache entry.
     options['exit_flag'] :  int(0)
         0 for fail, 1 for ok
     options['optimizer'] :  str('SLSQP')
@@ -110,7 +118,8 @@ class pyOptSparseDriver(Driver):
         self.hist_file = None
 
         # The user can set a file here to hot start the optimization
-        # with a history file
+        # with a history file. It can be the same file as hist_file, which
+        # checkpoints every iteration and resumes from the last run.
         self.hotstart_file = None
 
         self.pyopt_solution = None
@@ -122,6 +131,7 @@ class pyOptSparseDriver(Driver):
         self._problem = None
         self.sparsity = OrderedDict()
         self.sub_sparsity = OrderedDict()
+        self._sub_coo = {}
         self.active_tols = {}
 
     def _setup(self):
@@ -157,6 +167,8 @@ class pyOptSparseDriver(Driver):
         with problem.root._dircontext:
             problem.root.solve_nonlinear(metadata=self.metadata)
 
+        self._init_eval_cache()
+
         opt_prob = Optimization(self.options['title'], self._objfunc)
 
         # Add all parameters
@@ -205,6 +217,7 @@ class pyOptSparseDriver(Driver):
         self.quantities = list(objs)
         self.sparsity = OrderedDict()
         self.sub_sparsity = OrderedDict()
+        self._sub_coo = {}
         for name in objs:
             opt_prob.addObj(name)
             self.sparsity[name] = self.indep_list
@@ -297,13 +310,23 @@ class pyOptSparseDriver(Driver):
 
         self.opt_prob = opt_prob
 
+        # Read the history from a copy when it's also being written
+        hotstart_file = self.hotstart_file
+        if hotstart_file is not None and self.hist_file is not None and \
+           os.path.abspath(hotstart_file) == os.path.abspath(self.hist_file):
+            if os.path.isfile(hotstart_file):
+                hotstart_file = self.hist_file + '.restart'
+                shutil.copyfile(self.hist_file, hotstart_file)
+            else:
+                hotstart_file = None
+
         # Execute the optimization problem
         if self.options['gradient method'] == 'pyopt_fd':
 
             # Use pyOpt's internal finite difference
             fd_step = problem.root.deriv_options['step_size']
             sol = opt(opt_prob, sens='FD', sensStep=fd_step, storeHistory=self.hist_file,
-                      hotStart=self.hotstart_file)
+                      hotStart=hotstart_file)
 
         elif self.options['gradient method'] == 'snopt_fd':
             if self.options['optimizer']=='SNOPT':
@@ -311,7 +334,7 @@ class pyOptSparseDriver(Driver):
                 # Use SNOPT's internal finite difference
                 fd_step = problem.root.deriv_options['step_size']
                 sol = opt(opt_prob, sens=None, sensStep=fd_step, storeHistory=self.hist_file,
-                          hotStart=self.hotstart_file)
+                          hotStart=hotstart_file)
 
             else:
                 msg = "SNOPT's internal finite difference can only be used with SNOPT"
@@ -320,7 +343,7 @@ class pyOptSparseDriver(Driver):
 
             # Use OpenMDAO's differentiator for the gradient
             sol = opt(opt_prob, sens=self._gradfunc, storeHistory=self.hist_file,
-                      hotStart=self.hotstart_file)
+                      hotStart=hotstart_file)
 
         self._problem = None
 
@@ -412,18 +435,21 @@ class pyOptSparseDriver(Driver):
                     coo['shape'] = [consize, len(param_vals[param])]
                     jac[param] = coo
 
-                row = []
-                col = []
-                for i in range(consize):
-                    row.extend([i]*nrel)
-                    col.extend(rel_idx)
+                # Every row has the same relevant columns. The row and
+                # column arrays are kept so that _gradfunc only has to fill
+                # in the data.
+                rel_idx = np.array(sorted(rel_idx), dtype=int)
+                row = np.repeat(np.arange(consize), nrel)
+                col = np.tile(rel_idx, consize)
                 data = np.ones((len(row), ))
 
-                jac[param]['coo'] = [np.array(row), np.array(col), data]
+                jac[param]['coo'] = [row, col, data]
 
                 if name not in self.sub_sparsity:
                     self.sub_sparsity[name] = {}
-                self.sub_sparsity[name][param] = np.array(list(rel_idx))
+                    self._sub_coo[name] = {}
+                self.sub_sparsity[name][param] = rel_idx
+                self._sub_coo[name][param] = (row, col)
 
         return jac
 
@@ -447,6 +473,39 @@ class pyOptSparseDriver(Driver):
             1 for unsuccessful function evaluation
         """
 
+        cache = self._eval_cache
+        if cache is not None:
+            funcs = cache.get(self._get_dv_array(dv_dict), 'funcs')
+            if funcs is not None:
+                return funcs
+
+        return self._run_model(dv_dict)
+
+    def _get_dv_array(self, dv_dict):
+        """ Returns the design variable values in `dv_dict` as one flat
+        array, which is used as the evaluation cache key.
+        """
+        return np.hstack([np.ravel(dv_dict[name]) for name in self.indep_list])
+
+    def _run_model(self, dv_dict):
+        """ Runs the model at a new design point, and caches the objective
+        and constraints.
+
+        Args
+        ----
+        dv_dict : dict
+            Dictionary of design variable values.
+
+        Returns
+        -------
+        func_dict : dict
+            Dictionary of all functional variables evaluated at design point.
+
+        fail : int
+            0 for successful function evaluation
+            1 for unsuccessful function evaluation
+        """
+
         fail = 0
         metadata = self.metadata
         system = self.root
@@ -477,6 +536,12 @@ class pyOptSparseDriver(Driver):
             # been gathered in MPI.
             self.recorders.record_iteration(system, metadata)
 
+            cache = self._eval_cache
+            if cache is not None:
+                x = self._get_dv_array(dv_dict)
+                cache.store(x, 'funcs', (func_dict, fail))
+                cache.set_current(x)
+
             # Get the double-sided constraint evaluations
             #for key, con in iteritems(self.get_2sided_constraints()):
             #    func_dict[name] = np.array(con.evaluate(self.parent))
@@ -522,26 +587,26 @@ class pyOptSparseDriver(Driver):
 
         try:
 
+            cache = self._eval_cache
+            use_cache = cache is not None and self.options['eval_cache_gradients']
+            if cache is not None:
+                x = self._get_dv_array(dv_dict)
+                if use_cache:
+                    sens_dict = cache.get(x, 'grad')
+                    if sens_dict is not None:
+                        return sens_dict, fail
+
+                # The model may have been run at other points since this one
+                # was evaluated, if its values came from the cache.
+                if not cache.is_current(x):
+                    self._run_model(dv_dict)
+
             # Assemble inactive constraints
             inactives = {}
             if len(self.active_tols) > 0:
-                for name, tols in iteritems(self.active_tols):
-                    con = self.opt_prob.constraints[name]
-                    inactive_idx = []
-                    val = con.value
-                    for j in range(len(val)):
-                        if isinstance(tols, float):
-                            tol = tols
-                        else:
-                            tol = tols[j]
-                        lower, upper = con.lower[j], con.upper[j]
-                        if lower is not None and val[j] > lower + tol:
-                            inactive_idx.append(j)
-                        if upper is not None and val[j] < upper - tol:
-                            inactive_idx.append(j)
-
-                    if inactive_idx:
-                        inactives[name] = inactive_idx
+                cons = OrderedDict((name, self.opt_prob.constraints[name].value)
+                                   for name in self.active_tols)
+                inactives = self._get_inactives(cons)
 
             try:
                 sens_dict = self.calc_gradient(dv_dict, self.quantities,
@@ -570,21 +635,16 @@ class pyOptSparseDriver(Driver):
                 for desvar, rel_idx in iteritems(val1):
                     coo = {}
                     jac = sens_dict[con][desvar]
-                    nrow, ncol = jac.shape
-                    coo['shape'] = [nrow, ncol]
-
-                    row = []
-                    col = []
-                    data = []
-                    ncol = len(rel_idx)
-                    for i in range(nrow):
-                        row.extend([i]*ncol)
-                        col.extend(rel_idx)
-                        data.extend(jac[i][rel_idx])
-
-                    coo['coo'] = [np.array(row), np.array(col), np.array(data)]
+                    coo['shape'] = list(jac.shape)
+
+                    # Row-major order matches the cached row and col arrays
+                    row, col = self._sub_coo[con][desvar]
+                    coo['coo'] = [row, col, jac[:, rel_idx].ravel()]
                     sens_dict[con][desvar] = coo
 
+            if use_cache and not fail:
+                cache.store(x, 'grad', sens_dict)
+
         except Exception as msg:
             tb = traceback.format_exc()
 
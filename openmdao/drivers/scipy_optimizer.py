@@ -38,16 +38,26 @@ class ScipyOptimizer(Driver):
 
         inequality_constraints
 
+        active_set (SLSQP only)
+
     Options
     -------
     options['disp'] :  bool(True)
         Set to False to prevent printing of Scipy convergence messages
+    options['eval_cache_gradients'] :  bool(True)
+        Set to False to only cache function values, and not gradients.
+    options['eval_cache_size'] :  int(0)
+        Number of design points whose function values are kept for reuse. 0 disables the cache.
+    options['eval_cache_tol'] :  float(0.0)
+        Scaled design points that round to the same multiple of this tolerance share a cache entry.
     options['maxiter'] : int(200)
         Maximum number of iterations.
     options['optimizer'] : str('SLSQP')
         Name of optimizer to use
     options['tol'] :  float(1e-06)
         Tolerance for termination. For detailed control, use solver-specific options.
+    options['vector_constraints'] :  bool(False)
+        Set to True to pass each constraint to Scipy as one vector-valued function, instead of one function per entry.
 
     """
 
@@ -60,7 +70,7 @@ class ScipyOptimizer(Driver):
         self.supports['inequality_constraints'] = True
         self.supports['equality_constraints'] = True
         self.supports['multiple_objectives'] = False
-        self.supports['active_set'] = False
+        self.supports['active_set'] = True
 
         # User Options
         self.options.add_option('optimizer', 'SLSQP', values=_optimizers,
@@ -73,6 +83,10 @@ class ScipyOptimizer(Driver):
         self.options.add_option('disp', True,
                                 desc='Set to False to prevent printing of Scipy '
                                 'convergence messages')
+        self.options.add_option('vector_constraints', False,
+                                desc='Set to True to pass each constraint to '
+                                'Scipy as one vector-valued function, instead '
+                                'of one function per entry.')
 
         # The user places optimizer-specific settings in here.
         self.opt_settings = OrderedDict()
@@ -85,10 +99,13 @@ class ScipyOptimizer(Driver):
         self.con_cache = None
         self.con_idx = OrderedDict()
         self.cons = None
+        self.lin_cons = None
+        self.lin_jacs = None
         self.objs = None
 
     def _setup(self):
         self.supports['gradients'] = self.options['optimizer'] in _gradient_optimizers
+        self.supports['active_set'] = self.options['optimizer'] in _constraint_grad_optimizers
         super(ScipyOptimizer, self)._setup()
 
     def run(self, problem):
@@ -110,13 +127,25 @@ class ScipyOptimizer(Driver):
         with problem.root._dircontext:
             problem.root.solve_nonlinear(metadata=self.metadata)
 
+        self._init_eval_cache()
+
         pmeta = self.get_desvar_metadata()
         self.params = list(pmeta)
         self.objs = list(self.get_objectives())
         con_meta = self.get_constraint_metadata()
-        self.cons = list(con_meta)
+        self.cons = list(self.get_constraints(lintype='nonlinear'))
+        self.lin_cons = list(self.get_constraints(lintype='linear'))
         self.con_cache = self.get_constraints()
 
+        # The gradient of the linear constraints is constant, so it is only
+        # calculated once.
+        self._problem = problem
+        if opt in _constraint_grad_optimizers and len(self.lin_cons) > 0:
+            self.lin_jacs = self.calc_gradient(self.params, self.lin_cons,
+                                               return_format='array')
+        else:
+            self.lin_jacs = None
+
         self.opt_settings['maxiter'] = self.options['maxiter']
         self.opt_settings['disp'] = self.options['disp']
 
@@ -160,11 +189,21 @@ class ScipyOptimizer(Driver):
         # Constraints
         constraints = []
         i = 0
+        lin_i = 0
         if opt in _constraint_optimizers:
+            vector = self.options['vector_constraints']
             for name, meta in con_meta.items():
                 size = meta['size']
                 dblcon = meta['upper'] is not None and meta['lower'] is not None
-                for j in range(0, size):
+
+                # Each entry is a separate scalar constraint, unless they are
+                # passed together as one vector-valued constraint.
+                if vector:
+                    indices = [np.arange(size)]
+                else:
+                    indices = range(0, size)
+
+                for j in indices:
                     con_dict = OrderedDict()
                     if meta['equals'] is not None:
                         con_dict['type'] = 'eq'
@@ -175,13 +214,18 @@ class ScipyOptimizer(Driver):
                         con_dict['jac'] = self._congradfunc
                     con_dict['args'] = [name, j]
                     constraints.append(con_dict)
-                self.con_idx[name] = i
-                i += size
+                # Rows of the constraint in the nonlinear or linear gradient
+                if meta['linear']:
+                    self.con_idx[name] = lin_i
+                    lin_i += size
+                else:
+                    self.con_idx[name] = i
+                    i += size
 
                 # Add extra constraint if double-sided
                 if dblcon:
                     name = '2bl-' + name
-                    for j in range(0, size):
+                    for j in indices:
                         con_dict = OrderedDict()
                         con_dict['type'] = 'ineq'
                         con_dict['fun'] = self._confunc
@@ -197,7 +241,6 @@ class ScipyOptimizer(Driver):
             jac = None
 
         # optimize
-        self._problem = problem
         result = minimize(self._objfunc, x_init,
                           #args=(),
                           method=opt,
@@ -210,6 +253,9 @@ class ScipyOptimizer(Driver):
                           #callback=None,
                           options=self.opt_settings)
 
+        # Leave the model at the optimum, which may have come from the cache
+        self._load_point(result.x)
+
         self._problem = None
         self.result = result
         self.exit_flag = 1 if self.result.success else 0
@@ -220,7 +266,31 @@ class ScipyOptimizer(Driver):
 
     def _objfunc(self, x_new):
         """ Function that evaluates and returns the objective function. Model
-        is executed here.
+        is executed here, unless the point is in the evaluation cache.
+
+        Args
+        ----
+        x_new : ndarray
+            Array containing parameter values at new design point.
+
+        Returns
+        -------
+        float
+            Value of the objective function evaluated at the new design point.
+        """
+
+        cache = self._eval_cache
+        if cache is not None:
+            funcs = cache.get(x_new, 'funcs')
+            if funcs is not None:
+                f_new, self.con_cache = funcs
+                return f_new
+
+        return self._run_model(x_new)
+
+    def _run_model(self, x_new):
+        """ Runs the model at a new design point, and caches the objective
+        and constraints.
 
         Args
         ----
@@ -236,12 +306,7 @@ class ScipyOptimizer(Driver):
         system = self.root
         metadata = self.metadata
 
-        # Pass in new parameters
-        i = 0
-        for name, meta in self.get_desvar_metadata().items():
-            size = meta['size']
-            self.set_desvar(name, x_new[i:i+size])
-            i += size
+        self._set_desvars(x_new)
 
         self.iter_count += 1
         update_local_meta(metadata, (self.iter_count,))
@@ -260,12 +325,56 @@ class ScipyOptimizer(Driver):
         # gathered in MPI.
         self.recorders.record_iteration(system, metadata)
 
+        cache = self._eval_cache
+        if cache is not None:
+            cache.store(x_new, 'funcs', (f_new, self.con_cache))
+            cache.set_current(x_new)
+
         #print("Functions calculated")
         #print(x_new)
         #print(f_new)
 
         return f_new
 
+    def _set_desvars(self, x_new):
+        """ Passes the values of a design point to the model.
+
+        Args
+        ----
+        x_new : ndarray
+            Array containing parameter values at new design point.
+        """
+        i = 0
+        for name, meta in self.get_desvar_metadata().items():
+            size = meta['size']
+            self.set_desvar(name, x_new[i:i+size])
+            i += size
+
+    def _load_point(self, x_new):
+        """ Makes sure the model holds the values at a design point when the
+        evaluation cache is in use. A point that has already been evaluated
+        is run again, but isn't counted or recorded as a new iteration.
+
+        Args
+        ----
+        x_new : ndarray
+            Array containing parameter values at the design point.
+        """
+        cache = self._eval_cache
+        if cache is None or cache.is_current(x_new):
+            return
+
+        if not cache.has(x_new, 'funcs'):
+            self._run_model(x_new)
+            return
+
+        self._set_desvars(x_new)
+        with self.root._dircontext:
+            self.root.solve_nonlinear(metadata=self.metadata)
+
+        self.con_cache = self.get_constraints()
+        cache.set_current(x_new)
+
     def _confunc(self, x_new, name, idx):
         """ Function that returns the value of the constraint function
         requested in args. Note that this function is called for each
@@ -277,12 +386,12 @@ class ScipyOptimizer(Driver):
             Array containing parameter values at new design point.
         name : string
             Name of the constraint to be evaluated.
-        idx : float
+        idx : int or ndarray
             Contains index into the constraint array.
 
         Returns
         -------
-        float
+        float or ndarray
             Value of the constraint function.
         """
 
@@ -330,10 +439,29 @@ class ScipyOptimizer(Driver):
             Gradient of objective with respect to parameter array.
         """
 
+        cache = self._eval_cache
+        use_cache = cache is not None and self.options['eval_cache_gradients']
+        if use_cache:
+            grad = cache.get(x_new, 'grad')
+            if grad is not None:
+                self.grad_cache = grad
+                return grad[0, :]
+
+        # The model may have been run at other points since this one was
+        # evaluated, if its values came from the cache.
+        self._load_point(x_new)
+
+        # Skip the adjoint solves of constraints that aren't near a bound
+        inactives = self._get_inactives(OrderedDict((name, self.con_cache[name])
+                                                    for name in self.cons))
+
         grad = self.calc_gradient(self.params, self.objs+self.cons,
-                                  return_format='array')
+                                  return_format='array', inactives=inactives)
         self.grad_cache = grad
 
+        if use_cache:
+            cache.store(x_new, 'grad', grad)
+
         #print("Gradients calculated")
         #print(x_new)
         #print(grad[0, :])
@@ -351,13 +479,14 @@ class ScipyOptimizer(Driver):
             Array containing parameter values at new design point.
         name : string
             Name of the constraint to be evaluated.
-        idx : float
+        idx : int or ndarray
             Contains index into the constraint array.
 
         Returns
         -------
-        float
-            Gradient of the constraint function wrt all params.
+        ndarray
+            Gradient of the constraint function wrt all params, with one row
+            per index when `idx` is an array.
         """
 
         if name.startswith('2bl-'):
@@ -366,9 +495,13 @@ class ScipyOptimizer(Driver):
         else:
             dbl_side = False
 
-        grad = self.grad_cache
         meta = self._cons[name]
-        grad_idx = self.con_idx[name] + idx + 1
+        if meta['linear']:
+            grad = self.lin_jacs
+            grad_idx = self.con_idx[name] + idx
+        else:
+            grad = self.grad_cache
+            grad_idx = self.con_idx[name] + idx + 1
 
         #print("Constraint Gradient returned")
         #print(x_new)
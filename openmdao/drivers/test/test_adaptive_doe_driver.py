@@ -0,0 +1,132 @@
+""" Testing AdaptiveDOEDriver."""
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import IndepVarComp, Group, Problem, \
+    AdaptiveDOEDriver, AcquisitionCriterion, MaxMinDistance, MaxKrigingRMSE
+from openmdao.test.paraboloid import Paraboloid
+
+
+class RecordingCriterion(MaxMinDistance):
+    """ Keeps the number of evaluated and pending points at each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def select(self, x, y, pending, candidates):
+        self.calls.append((x.shape, y.shape, pending.shape, candidates.shape))
+        return super(RecordingCriterion, self).select(x, y, pending, candidates)
+
+
+class TestAdaptiveDOEDriver(unittest.TestCase):
+
+    def _setup_problem(self, driver):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', 0.0), promotes=['*'])
+        root.add('p2', IndepVarComp('y', 0.0), promotes=['*'])
+        root.add('comp', Paraboloid(), promotes=['*'])
+
+        prob.driver = driver
+        driver.add_desvar('x', lower=-10.0, upper=10.0)
+        driver.add_desvar('y', lower=0.0, upper=2.0, scaler=10.0)
+        driver.add_objective('f_xy')
+
+        prob.setup(check=False)
+        return prob
+
+    def _get_points(self, driver):
+        points = []
+        for responses, success, msg in driver.get_responses():
+            responses = dict(responses)
+            self.assertTrue(success)
+            x, y = responses['x'], responses['y']
+            self.assertAlmostEqual(responses['f_xy'],
+                                   (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0)
+            points.append((x, y))
+        return np.array(points)
+
+    def test_serial(self):
+        criterion = RecordingCriterion()
+        driver = AdaptiveDOEDriver(num_samples=10, num_initial=4,
+                                   acquisition=criterion, num_candidates=50,
+                                   seed=1)
+        prob = self._setup_problem(driver)
+        prob.run()
+
+        points = self._get_points(driver)
+        self.assertEqual(points.shape, (10, 2))
+
+        self.assertTrue(np.all(points[:, 0] >= -10.0) and np.all(points[:, 0] <= 10.0))
+        self.assertTrue(np.all(points[:, 1] >= 0.0) and np.all(points[:, 1] <= 2.0))
+
+        # in serial, every earlier case has finished when a new one is chosen
+        self.assertEqual(criterion.calls,
+                         [((i, 2), (i, 1), (0, 2), (50, 2)) for i in range(4, 10)])
+
+        # the same seed gives the same cases
+        driver = AdaptiveDOEDriver(num_samples=10, num_initial=4,
+                                   num_candidates=50, seed=1)
+        prob = self._setup_problem(driver)
+        prob.run()
+        np.testing.assert_array_equal(self._get_points(driver), points)
+
+    def test_max_min_distance(self):
+        x = np.array([[0.0, 0.0], [1.0, 1.0]])
+        pending = np.array([[0.0, 1.0]])
+        candidates = np.array([[0.1, 0.9], [0.5, 0.5], [0.9, 0.1]])
+
+        criterion = MaxMinDistance()
+        self.assertEqual(criterion.select(x, np.zeros((2, 1)), pending,
+                                          candidates), 2)
+
+    def test_kriging_rmse(self):
+        criterion = MaxKrigingRMSE()
+
+        x = np.array([[0.0], [0.1], [0.2], [1.0]])
+        y = np.sin(3.0 * x)
+        candidates = np.array([[0.05], [0.6], [0.95]])
+
+        # the largest gap between evaluated points
+        self.assertEqual(criterion.select(x, y, np.zeros((0, 1)), candidates), 1)
+
+        # unless a point there is being evaluated
+        candidates = np.array([[0.05], [0.58], [0.95], [0.4]])
+        self.assertEqual(criterion.select(x, y, np.array([[0.6]]), candidates), 3)
+
+        with self.assertRaises(NotImplementedError):
+            AcquisitionCriterion().select(x, y, np.zeros((0, 1)), candidates)
+
+    def test_kriging_driver(self):
+        driver = AdaptiveDOEDriver(num_samples=8, acquisition=MaxKrigingRMSE(),
+                                   num_candidates=100, seed=0)
+        prob = self._setup_problem(driver)
+        prob.run()
+
+        points = self._get_points(driver)
+        self.assertEqual(len(points), 8)
+        self.assertEqual(len(set(map(tuple, points))), 8)
+
+    def test_multiproc(self):
+        criterion = RecordingCriterion()
+        driver = AdaptiveDOEDriver(num_samples=12, num_initial=3,
+                                   acquisition=criterion, num_candidates=50,
+                                   seed=1, num_par_doe=3)
+        prob = self._setup_problem(driver)
+        prob.run()
+
+        points = self._get_points(driver)
+        self.assertEqual(len(points), 12)
+
+        # cases keep running while new ones are chosen
+        self.assertEqual(len(criterion.calls), 9)
+        for i, (xshape, yshape, pshape, cshape) in enumerate(criterion.calls):
+            self.assertEqual(xshape[0] + pshape[0], 3 + i)
+            self.assertEqual(pshape[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
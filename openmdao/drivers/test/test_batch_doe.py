@@ -0,0 +1,215 @@
+""" Testing batched case evaluation in PredeterminedRunsDriver."""
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import IndepVarComp, Group, Problem, Component, ExecComp, \
+    InMemoryRecorder, AnalysisError, NLGaussSeidel, MetaModel, FloatKrigingSurrogate
+from openmdao.drivers.fullfactorial_driver import FullFactorialDriver
+
+
+class BatchParaboloid(Component):
+    """ Paraboloid with an array input that also evaluates batches of cases."""
+
+    def __init__(self, fail_above=None):
+        super(BatchParaboloid, self).__init__()
+        self.add_param('xy', val=np.zeros(2))
+        self.add_param('scale', val=1.0, units='cm')
+        self.add_output('f_xy', val=0.0)
+        self.add_output('grad', val=np.zeros(2))
+
+        self.fail_above = fail_above
+        self.num_calls = 0
+        self.num_batch_calls = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.num_calls += 1
+        x, y = params['xy']
+        if self.fail_above is not None and x > self.fail_above:
+            raise AnalysisError('x too large')
+        unknowns['f_xy'] = params['scale'] * ((x-3.0)**2 + x*y + (y+4.0)**2 - 3.0)
+        unknowns['grad'] = np.array([2.0*(x-3.0) + y, x + 2.0*(y+4.0)])
+
+    def solve_nonlinear_batch(self, params, unknowns, resids):
+        self.num_batch_calls += 1
+        x = params['xy'][:, 0]
+        y = params['xy'][:, 1]
+        if self.fail_above is not None and np.any(x > self.fail_above):
+            raise AnalysisError('x too large')
+        unknowns['f_xy'] = params['scale'] * ((x-3.0)**2 + x*y + (y+4.0)**2 - 3.0)
+        unknowns['grad'][:, 0] = 2.0*(x-3.0) + y
+        unknowns['grad'][:, 1] = x + 2.0*(y+4.0)
+
+
+class CountingMetaModel(MetaModel):
+    """ MetaModel that counts its batch evaluations."""
+
+    def __init__(self):
+        super(CountingMetaModel, self).__init__()
+        self.num_batch_calls = 0
+
+    def solve_nonlinear_batch(self, params, unknowns, resids):
+        self.num_batch_calls += 1
+        super(CountingMetaModel, self).solve_nonlinear_batch(params, unknowns, resids)
+
+
+class TestBatchDOE(unittest.TestCase):
+
+    def _run(self, batch_size, fail_above=None, solver=None):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('xy', np.zeros(2)))
+        root.add('p2', IndepVarComp('scale', 0.02, units='m'))
+        sub = root.add('sub', Group())
+        sub.add('comp', BatchParaboloid(fail_above))
+        sub.add('post', ExecComp('g = 2.0*f + sum(d)', d=np.zeros(2)))
+        if solver is not None:
+            sub.nl_solver = solver
+
+        root.connect('p1.xy', 'sub.comp.xy')
+        root.connect('p2.scale', 'sub.comp.scale')
+        sub.connect('comp.f_xy', 'post.f')
+        sub.connect('comp.grad', 'post.d')
+
+        prob.driver = FullFactorialDriver(num_levels=3)
+        prob.driver.options['batch_size'] = batch_size
+        prob.driver.add_desvar('p1.xy', lower=-5.0, upper=5.0)
+        prob.driver.add_objective('sub.post.g')
+
+        recorder = InMemoryRecorder()
+        recorder.options['record_params'] = True
+        prob.driver.add_recorder(recorder)
+
+        prob.setup(check=False)
+        prob.run()
+
+        return prob, recorder.iters
+
+    def _check_iters(self, iters, expected):
+        self.assertEqual(len(iters), len(expected))
+        for actual, exp in zip(iters, expected):
+            self.assertEqual(actual['iter'], exp['iter'])
+            self.assertEqual(actual['success'], exp['success'])
+            for vec in ('params', 'unknowns'):
+                self.assertEqual(set(actual[vec]), set(exp[vec]))
+                for name in exp[vec]:
+                    np.testing.assert_allclose(actual[vec][name], exp[vec][name])
+
+    def test_batches_match_serial(self):
+        prob, expected = self._run(1)
+        self.assertEqual(prob.root.sub.comp.num_batch_calls, 0)
+
+        # 9 cases, so the last batch is only partly full
+        prob, iters = self._run(4)
+        self.assertEqual(prob.root.sub.comp.num_batch_calls, 3)
+        self.assertEqual(prob.root.sub.comp.num_calls, 0)
+
+        self._check_iters(iters, expected)
+
+        # the model holds the values of the last case
+        x, y = prob['p1.xy']
+        self.assertEqual((x, y), (5.0, 5.0))
+        self.assertAlmostEqual(prob['sub.comp.f_xy'],
+                               2.0*((x-3.0)**2 + x*y + (y+4.0)**2 - 3.0))
+
+    def test_solver_recorders(self):
+        def run(batch_size):
+            prob = Problem()
+            root = prob.root = Group()
+
+            root.add('p1', IndepVarComp('xy', np.zeros(2)))
+            sub = root.add('sub', Group())
+            sub.add('comp', BatchParaboloid())
+            root.connect('p1.xy', 'sub.comp.xy')
+
+            prob.driver = FullFactorialDriver(num_levels=2)
+            prob.driver.options['batch_size'] = batch_size
+            prob.driver.add_desvar('p1.xy', lower=-5.0, upper=5.0)
+            prob.driver.add_objective('sub.comp.f_xy')
+
+            recorders = []
+            for solver in (root.nl_solver, sub.nl_solver):
+                recorder = InMemoryRecorder()
+                recorder.options['record_params'] = True
+                solver.add_recorder(recorder)
+                recorders.append(recorder)
+
+            prob.setup(check=False)
+            prob.run()
+            return prob, [recorder.iters for recorder in recorders]
+
+        prob, expected = run(1)
+        prob, iters = run(4)
+        self.assertEqual(prob.root.sub.comp.num_batch_calls, 1)
+
+        # the solvers record each case of the batch as if it had been run
+        # on its own
+        for solver_iters, exp in zip(iters, expected):
+            self.assertEqual(len(solver_iters), 4)
+            self._check_iters(solver_iters, exp)
+
+    def test_batch_failure(self):
+        prob, expected = self._run(1, fail_above=1.0)
+        self.assertEqual([it['success'] for it in expected], [1]*6 + [0]*3)
+
+        prob, iters = self._run(4, fail_above=1.0)
+        self.assertEqual(prob.root.sub.comp.num_batch_calls, 3)
+
+        # only the batches with a failed case were rerun one case at a time
+        self.assertEqual(prob.root.sub.comp.num_calls, 5)
+        self._check_iters([it for it in iters if it['success']],
+                          [it for it in expected if it['success']])
+        self.assertEqual([it['success'] for it in iters], [1]*6 + [0]*3)
+
+    def test_unsupported_solver(self):
+        prob, iters = self._run(4, solver=NLGaussSeidel())
+
+        self.assertEqual(prob.root.sub.comp.num_batch_calls, 0)
+        self.assertEqual(prob.root.sub.comp.num_calls, 9)
+        self.assertEqual(len(iters), 9)
+
+    def test_metamodel(self):
+        def run(batch_size):
+            prob = Problem()
+            root = prob.root = Group()
+
+            root.add('p1', IndepVarComp('x', np.zeros(2)))
+            meta = root.add('meta', CountingMetaModel())
+            meta.add_param('x', np.zeros(2),
+                           training_data=[np.array([a, b]) for a in range(3)
+                                          for b in range(3)])
+            meta.add_output('f', 0.0,
+                            training_data=[float(a*a - b) for a in range(3)
+                                           for b in range(3)])
+            meta.default_surrogate = FloatKrigingSurrogate()
+            root.connect('p1.x', 'meta.x')
+
+            prob.driver = FullFactorialDriver(num_levels=4)
+            prob.driver.options['batch_size'] = batch_size
+            prob.driver.add_desvar('p1.x', lower=0.0, upper=2.0)
+            prob.driver.add_objective('meta.f')
+
+            recorder = InMemoryRecorder()
+            recorder.options['record_params'] = True
+            prob.driver.add_recorder(recorder)
+
+            prob.setup(check=False)
+            prob.run()
+            self.assertEqual(meta.num_batch_calls, 4 if batch_size > 1 else 0)
+            return recorder.iters
+
+        # the interpolation weights are large, so summing them in another
+        # order changes the results slightly
+        iters = run(5)
+        expected = run(1)
+        self.assertEqual(len(iters), 16)
+        for actual, exp in zip(iters, expected):
+            np.testing.assert_allclose(actual['params']['meta.x'], exp['params']['meta.x'])
+            np.testing.assert_allclose(actual['unknowns']['meta.f'], exp['unknowns']['meta.f'],
+                                       atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+""" Testing checkpoint and restart of DOE drivers."""
+
+import errno
+import os
+import pickle
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+
+from openmdao.api import IndepVarComp, Group, Problem, Component, \
+    SqliteRecorder, CaseReader, LatinHypercubeDriver, FullFactorialDriver, \
+    AnalysisError
+
+
+class CrashingParaboloid(Component):
+    """ Paraboloid that dies with a critical error on a given call."""
+
+    def __init__(self, crash_on=None):
+        super(CrashingParaboloid, self).__init__()
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=np.zeros(2))
+        self.add_output('f_xy', val=0.0)
+
+        self.crash_on = crash_on
+        self.num_calls = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.num_calls += 1
+        if self.num_calls == self.crash_on:
+            raise RuntimeError('crashed')
+        x = params['x']
+        y = params['y']
+        unknowns['f_xy'] = (x-3.0)**2 + x*y[0] + (y[1]+4.0)**2 - 3.0
+
+
+class BatchDoubler(Component):
+    """ Doubles x, failing at the values in fail_at and dying with a critical
+    error at the values in crash_at. A batch containing any of those values
+    fails, so its cases are run one at a time."""
+
+    def __init__(self, fail_at=(), crash_at=()):
+        super(BatchDoubler, self).__init__()
+        self.add_param('x', val=0.0)
+        self.add_output('y', val=0.0)
+
+        self.fail_at = fail_at
+        self.crash_at = crash_at
+        self.num_calls = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.num_calls += 1
+        x = params['x']
+        if x in self.fail_at:
+            raise AnalysisError('failed')
+        if x in self.crash_at:
+            raise RuntimeError('crashed')
+        unknowns['y'] = 2.0*x
+
+    def solve_nonlinear_batch(self, params, unknowns, resids):
+        x = params['x']
+        if any(v in self.fail_at or v in self.crash_at for v in x):
+            raise AnalysisError('failed')
+        self.num_calls += len(x)
+        unknowns['y'][:] = 2.0*x
+
+
+class TestDOERestart(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.original_path = os.getcwd()
+        os.chdir(self.dir)
+
+    def tearDown(self):
+        os.chdir(self.original_path)
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def _setup_problem(self, driver, filename, crash_on=None):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', 0.0), promotes=['*'])
+        root.add('p2', IndepVarComp('y', np.zeros(2)), promotes=['*'])
+        root.add('comp', CrashingParaboloid(crash_on), promotes=['*'])
+
+        prob.driver = driver
+        driver.add_desvar('x', lower=-10.0, upper=10.0, adder=1.0, scaler=2.0)
+        driver.add_desvar('y', lower=-5.0, upper=5.0)
+        driver.add_objective('f_xy')
+        driver.add_recorder(SqliteRecorder(filename))
+
+        prob.setup(check=False)
+        return prob
+
+    def _get_cases(self, filename):
+        cr = CaseReader(filename)
+        cases = []
+        for case_id in cr.list_cases():
+            case = cr.get_case(case_id)
+            cases.append((case_id, case['x'], tuple(case['y'])))
+        return cases
+
+    def test_lhc_restart(self):
+        num_samples = 10
+
+        # a run without a seed that dies on the 6th case
+        driver = LatinHypercubeDriver(num_samples=num_samples)
+        driver.options['checkpoint_file'] = 'doe.ckpt'
+        driver.options['checkpoint_interval'] = 2
+        prob = self._setup_problem(driver, 'run1.db', crash_on=6)
+
+        with self.assertRaises(RuntimeError):
+            prob.run()
+        prob.cleanup()
+
+        with open('doe.ckpt', 'rb') as f:
+            self.assertEqual(pickle.load(f)['num_finished'], 4)
+
+        first = self._get_cases('run1.db')
+        self.assertEqual(len(first), 5)
+
+        # the restart skips the 4 checkpointed cases and the 5th, which is
+        # only in the recorder file
+        driver = LatinHypercubeDriver(num_samples=num_samples)
+        driver.options['checkpoint_file'] = 'doe.ckpt'
+        driver.options['restart'] = True
+        driver.options['restart_file'] = 'run1.db'
+        prob = self._setup_problem(driver, 'run2.db')
+        prob.run()
+        prob.cleanup()
+
+        self.assertEqual(prob.root.comp.num_calls, num_samples - 5)
+        second = self._get_cases('run2.db')
+
+        # same run list, with iteration coordinates continuing where the
+        # first run stopped
+        cases = first + second
+        self.assertEqual(len(set(case[0] for case in cases)), num_samples)
+        self.assertEqual(first[-1][0], 'rank0:Driver|4')
+        self.assertEqual(second[0][0], 'rank0:Driver|5')
+
+        with open('doe.ckpt', 'rb') as f:
+            self.assertEqual(pickle.load(f)['num_finished'], num_samples)
+
+        # the cases form a latin hypercube
+        xs = sorted(case[1] for case in cases)
+        for i, x in enumerate(xs):
+            self.assertTrue(-10.0 + 2.0*i <= x <= -10.0 + 2.0*(i+1))
+
+    def test_restart_file_only(self):
+        driver = FullFactorialDriver(num_levels=2)
+        prob = self._setup_problem(driver, 'run1.db', crash_on=4)
+
+        with self.assertRaises(RuntimeError):
+            prob.run()
+        prob.cleanup()
+
+        driver = FullFactorialDriver(num_levels=2)
+        driver.options['restart'] = True
+        driver.options['restart_file'] = 'run1.db'
+        prob = self._setup_problem(driver, 'run2.db')
+        prob.run()
+        prob.cleanup()
+
+        self.assertEqual(prob.root.comp.num_calls, 8 - 3)
+
+        expected = FullFactorialDriver(num_levels=2)
+        prob = self._setup_problem(expected, 'all.db')
+        prob.run()
+        prob.cleanup()
+
+        self.assertEqual(self._get_cases('run1.db') + self._get_cases('run2.db'),
+                         self._get_cases('all.db'))
+
+    def _setup_batch_problem(self, filename, fail_at=(), crash_at=()):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p', IndepVarComp('x', 0.0), promotes=['*'])
+        root.add('comp', BatchDoubler(fail_at, crash_at), promotes=['*'])
+
+        prob.driver = driver = FullFactorialDriver(num_levels=6)
+        driver.options['batch_size'] = 3
+        driver.add_desvar('x', lower=0.0, upper=5.0)
+        driver.add_objective('y')
+        driver.add_recorder(SqliteRecorder(filename))
+
+        prob.setup(check=False)
+        return prob
+
+    def test_batch_restart(self):
+        # cases x=1 and x=3 fail
+        prob = self._setup_batch_problem('run1.db', fail_at=(1.0, 3.0))
+        prob.run()
+        prob.cleanup()
+
+        cr = CaseReader('run1.db')
+        failed = [case_id for case_id in cr.list_cases()
+                  if not cr.get_case(case_id).success]
+        self.assertEqual(failed, ['rank0:Driver|1', 'rank0:Driver|3'])
+
+        # only the failed cases are run again, with their original
+        # coordinates, and x=3 dies
+        prob = self._setup_batch_problem('run2.db', crash_at=(3.0,))
+        driver = prob.driver
+        driver.options['restart'] = True
+        driver.options['restart_file'] = 'run1.db'
+        driver.options['checkpoint_file'] = 'doe.ckpt'
+        driver.options['checkpoint_interval'] = 1
+
+        with self.assertRaises(RuntimeError):
+            prob.run()
+        prob.cleanup()
+
+        cr = CaseReader('run2.db')
+        self.assertEqual([(case_id, cr.get_case(case_id)['x'])
+                          for case_id in cr.list_cases()],
+                         [('rank0:Driver|1', 1.0)])
+
+        # the case that died isn't counted as finished
+        with open('doe.ckpt', 'rb') as f:
+            checkpoint = pickle.load(f)
+        self.assertEqual(checkpoint['num_finished'], 3)
+        self.assertEqual(checkpoint['finished'], set([4, 5]))
+
+        # the checkpoint alone is enough to run the last case
+        prob = self._setup_batch_problem('run3.db')
+        driver = prob.driver
+        driver.options['restart'] = True
+        driver.options['checkpoint_file'] = 'doe.ckpt'
+        prob.run()
+        prob.cleanup()
+
+        self.assertEqual(prob.root.comp.num_calls, 1)
+        cr = CaseReader('run3.db')
+        self.assertEqual([(case_id, cr.get_case(case_id)['x'])
+                          for case_id in cr.list_cases()],
+                         [('rank0:Driver|3', 3.0)])
+
+        with open('doe.ckpt', 'rb') as f:
+            checkpoint = pickle.load(f)
+        self.assertEqual(checkpoint['num_finished'], 6)
+        self.assertEqual(checkpoint['finished'], set())
+
+
+if __name__ == "__main__":
+    unittest.main()
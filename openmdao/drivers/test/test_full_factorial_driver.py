@@ -1,5 +1,6 @@
 """Testing FullFactorialDriver"""
 
+import itertools
 import unittest
 from pprint import pformat
 from types import GeneratorType
@@ -53,6 +54,71 @@ class TestFullFactorial(unittest.TestCase):
         self.assertTrue((np.array([0.0]), np.array([1.0])) in inputs,
                         "Incorrect inputs generated.")
 
+    def _setup_array_problem(self, num_levels, size=3):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', np.zeros(size)), promotes=['*'])
+        root.add('p2', IndepVarComp('y', 50.0), promotes=['*'])
+
+        prob.driver = FullFactorialDriver(num_levels)
+        prob.driver.add_desvar('x', lower=np.arange(size), upper=np.arange(size) + 1.0)
+        prob.driver.add_desvar('y', lower=-1, upper=1)
+
+        prob.setup(check=False)
+        return prob
+
+    def test_array_desvar_order(self):
+        prob = self._setup_array_problem(3)
+
+        # cases in the order of the product of all levels
+        x_levels = [np.linspace(k, k + 1.0, 3) for k in range(3)]
+        y_levels = [np.linspace(-1, 1, 3)]
+        expected = list(itertools.product(itertools.product(*x_levels),
+                                          itertools.product(*y_levels)))
+
+        cases = [dict(case) for case in prob.driver._build_runlist()]
+
+        self.assertEqual(len(cases), len(expected))
+        for case, (x, y) in zip(cases, expected):
+            np.testing.assert_array_equal(case['x'], x)
+            np.testing.assert_array_equal(case['y'], y)
+
+    def test_distrib_runlist(self):
+        prob = self._setup_array_problem(2)
+        driver = prob.driver
+
+        cases = [dict(case) for case in driver._build_runlist()]
+
+        driver._num_par_doe = 3
+        for doe_id in range(3):
+            driver._par_doe_id = doe_id
+            indices, distrib = zip(*[(index, dict(case)) for index, case
+                                     in driver._distrib_build_runlist()])
+
+            self.assertEqual(list(indices), list(range(len(cases)))[doe_id::3])
+            self.assertEqual(len(distrib), len(cases[doe_id::3]))
+            for case, expected in zip(distrib, cases[doe_id::3]):
+                np.testing.assert_array_equal(case['x'], expected['x'])
+                np.testing.assert_array_equal(case['y'], expected['y'])
+
+    def test_random_access(self):
+        # 10**7 cases, none of which are generated up front
+        prob = self._setup_array_problem(10, size=6)
+        driver = prob.driver
+
+        names, sizes, levels = driver._get_levels()
+        self.assertEqual(driver._num_cases(levels), 10**7)
+
+        last = dict(driver._get_case(names, sizes, levels, 10**7 - 1))
+        np.testing.assert_array_equal(last['x'], np.arange(6) + 1.0)
+        np.testing.assert_array_equal(last['y'], [1.0])
+
+        runlist = driver._build_runlist()
+        first = dict(next(runlist))
+        np.testing.assert_array_equal(first['x'], np.arange(6))
+        np.testing.assert_array_equal(first['y'], [-1.0])
+
 if __name__ == "__main__":
     unittest.main()
 
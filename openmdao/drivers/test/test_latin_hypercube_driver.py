@@ -14,6 +14,15 @@ from openmdao.drivers.latinhypercube_driver import LatinHypercubeDriver, Optimiz
 from openmdao.drivers.latinhypercube_driver import _is_latin_hypercube, _rand_latin_hypercube, _mmlhs, _LHC_Individual
 
 
+def _brute_force_mmphi(doe, q, p):
+    """ Morris-Mitchell criterion summed over every pair of points. """
+    total = 0.0
+    for i in range(doe.shape[0]):
+        for j in range(i + 1, doe.shape[0]):
+            total += np.sum(np.abs(doe[i] - doe[j]) ** p) ** (-q / float(p))
+    return total ** (1.0 / q)
+
+
 class TestLatinHypercubeDriver(unittest.TestCase):
 
     def setUp(self):
@@ -54,6 +63,58 @@ class TestLatinHypercubeDriver(unittest.TestCase):
         for n, k in self.hypercube_sizes:
             self._test_mmlhs_latin(n, k)
 
+    def test_mmphi(self):
+        for n, k in self.hypercube_sizes[1:]:
+            doe = _rand_latin_hypercube(n, k)
+            for q, p in ((1, 1), (2, 2), (10, 1)):
+                assert_rel_error(self, _LHC_Individual(doe, q, p).mmphi(),
+                                 _brute_force_mmphi(doe, q, p), 1e-10)
+
+    def test_perturb_mmphi(self):
+        doe = _rand_latin_hypercube(20, 8)
+        lhc = _LHC_Individual(doe, 5, 1)
+        lhc.mmphi()
+
+        for mutations in (1, 2, 4):
+            lhc_new = lhc.perturb(mutations)
+            self.assertTrue(_is_latin_hypercube(lhc_new._get_doe()))
+
+            # the criterion was updated from the changed rows only
+            self.assertTrue(lhc_new.phi is not None)
+            expected = _LHC_Individual(lhc_new._get_doe(), 5, 1).mmphi()
+            assert_rel_error(self, lhc_new.mmphi(), expected, 1e-10)
+
+    def test_perturb_mmphi_large_q(self):
+        # with large q, the pairs at the smallest distance make up nearly all
+        # of the criterion, so the update must not subtract their terms away
+        for q in (50, 100):
+            lhc = _LHC_Individual(_rand_latin_hypercube(20, 4), q, 1)
+            lhc.mmphi()
+
+            for i in range(1000):
+                lhc = lhc.perturb(1)
+                expected = _LHC_Individual(lhc._get_doe(), q, 1).mmphi()
+                assert_rel_error(self, lhc.mmphi(), expected, 1e-10)
+
+    def test_mmlhs_pool(self):
+        from multiprocessing import Pool
+
+        doe = _rand_latin_hypercube(10, 4)
+
+        seed(self.seedval)
+        serial = _mmlhs(_LHC_Individual(doe, 2, 1), 6, 4)
+
+        pool = Pool(2)
+        try:
+            seed(self.seedval)
+            pooled = _mmlhs(_LHC_Individual(doe, 2, 1), 6, 4, pool=pool)
+        finally:
+            pool.close()
+            pool.join()
+
+        np.testing.assert_array_equal(pooled._get_doe(), serial._get_doe())
+        assert_rel_error(self, pooled.mmphi(), serial.mmphi(), 1e-10)
+
     def test_algorithm_coverage_lhc(self):
 
         prob = Problem()
@@ -142,5 +142,85 @@ class LBParallelDOETestCase6(unittest.TestCase):
         else:
             self.assertEqual(nfails[fail_rank], 0)
 
+
+class SharedMemDOETestCase(unittest.TestCase):
+
+    def _setup_problem(self, num_levels, num_par_doe, **kwargs):
+        problem = Problem()
+        root = problem.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=1.0))
+        root.add('const', IndepVarComp('c', val=2.0))
+        root.add('mult', ExecComp4Test("y=c*x", **kwargs))
+
+        root.connect('indep_var.x', 'mult.x')
+        root.connect('const.c', 'mult.c')
+
+        problem.driver = FullFactorialDriver(num_levels=num_levels,
+                                             num_par_doe=num_par_doe,
+                                             load_balance=True)
+        problem.driver.options['shared_memory'] = True
+        problem.driver.options['auto_add_response'] = True
+        problem.driver.add_desvar('indep_var.x',
+                                  lower=1.0, upper=float(num_levels))
+        problem.driver.add_objective('mult.y')
+        problem.driver.add_response('mult.case_rank')
+
+        problem.setup(check=False)
+        return problem
+
+    def test_shared_mem_doe(self):
+        num_levels = 25
+        problem = self._setup_problem(num_levels, 4)
+
+        try:
+            problem.run()
+            procs = list(problem.driver._shm_workers['procs'])
+
+            # workers are reused by later runs
+            problem.run()
+            self.assertEqual(problem.driver._shm_workers['procs'], procs)
+
+            xs = []
+            for responses, success, msg in problem.driver.get_responses():
+                responses = dict(responses)
+                self.assertTrue(success)
+                self.assertEqual(responses['indep_var.x']*2.0,
+                                 responses['mult.y'])
+                self.assertTrue(isinstance(responses['mult.case_rank'], int))
+                xs.append(responses['indep_var.x'])
+
+            self.assertEqual(sorted(xs), [float(x) for x in range(1, num_levels+1)])
+        finally:
+            problem.cleanup()
+
+        self.assertTrue(problem.driver._shm_workers is None)
+        for proc in procs:
+            self.assertFalse(proc.is_alive())
+
+    def test_shared_mem_doe_soft_fail(self):
+        num_levels = 25
+        problem = self._setup_problem(num_levels, 5, fail_rank=1, fails=[3, 4, 5])
+
+        try:
+            problem.run()
+        finally:
+            problem.cleanup()
+
+        num_cases = 0
+        nfails = 0
+        for responses, success, msg in problem.driver.get_responses():
+            responses = dict(responses)
+            num_cases += 1
+            if success:
+                self.assertEqual(responses['indep_var.x']*2.0,
+                                 responses['mult.y'])
+            else:
+                nfails += 1
+                self.assertEqual(responses['mult.case_rank'], 1)
+                self.assertTrue('AnalysisError' in msg)
+
+        self.assertEqual(num_cases, num_levels)
+        self.assertTrue(nfails <= 3)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1269,6 +1269,51 @@ class TestPyoptSparse(unittest.TestCase, ConcurrentTestCaseMixin):
         sub_sparsity = prob.driver.sub_sparsity
         self.assertEquals(len(sub_sparsity['seg0.r_i']['y_i']), 9)
 
+    def test_sub_sparsity_jacobian(self):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p', IndepVarComp('y', np.arange(7.0)), promotes=['y'])
+        root.add('a', ExecComp('r = 2.0*y**2', y=np.zeros(3), r=np.zeros(3)))
+        root.add('b', ExecComp('r = 3.0*y', y=np.zeros(3), r=np.zeros(3)))
+        root.add('obj', ExecComp('f = sum(a) + sum(b)', a=np.zeros(3), b=np.zeros(3)))
+        root.connect('y', 'a.y', src_indices=[0, 1, 2])
+        root.connect('y', 'b.y', src_indices=[4, 5, 6])
+        root.connect('a.r', 'obj.a')
+        root.connect('b.r', 'obj.b')
+
+        prob.driver = pyOptSparseDriver()
+        prob.driver.options['optimizer'] = OPTIMIZER
+        prob.driver.options['print_results'] = False
+        prob.driver.add_desvar('y', lower=-10.0, upper=10.0, indices=[1, 2, 3, 4, 5])
+        prob.driver.add_objective('obj.f')
+        prob.driver.add_constraint('a.r', upper=10.0)
+        prob.driver.add_constraint('b.r', lower=-10.0, indices=[0, 2])
+
+        prob.setup(check=False)
+        prob.run()
+
+        driver = prob.driver
+        self.assertEqual(list(driver.sub_sparsity['a.r']['y']), [0, 1])
+        self.assertEqual(list(driver.sub_sparsity['b.r']['y']), [3, 4])
+
+        # the sparse Jacobian holds the same values as the dense one
+        driver._problem = prob
+        dv_dict = driver.get_desvars()
+        func_dict = driver.get_objectives()
+        func_dict.update(driver.get_constraints())
+        sens_dict, fail = driver._gradfunc(dv_dict, func_dict)
+        dense = driver.calc_gradient(list(dv_dict), driver.quantities,
+                                     return_format='dict')
+        self.assertEqual(fail, 0)
+
+        for con in ('a.r', 'b.r'):
+            coo = sens_dict[con]['y']
+            row, col, data = coo['coo']
+            jac = np.zeros(coo['shape'])
+            jac[row, col] = data
+            assert_rel_error(self, jac, dense[con]['y'], 1e-12)
+
     def test_analysis_error_objfunc(self):
 
         # Component raises an analysis error during some runs, and pyopt
@@ -5,7 +5,13 @@ import unittest
 
 import numpy as np
 
-from openmdao.api import IndepVarComp, Group, Problem, ScipyOptimizer, ExecComp
+from six.moves import cStringIO
+
+from scipy.optimize import OptimizeResult
+
+from openmdao.api import IndepVarComp, Group, Problem, ScipyOptimizer, ExecComp, \
+    Component, InMemoryRecorder
+from openmdao.drivers import scipy_optimizer
 from openmdao.test.paraboloid import Paraboloid
 from openmdao.test.sellar import SellarDerivatives, SellarStateConnection
 from openmdao.test.simple_comps import SimpleArrayComp, ArrayComp2D
@@ -162,6 +168,110 @@ class TestScipyOptimize(unittest.TestCase):
         assert_rel_error(self, prob['x'], 7.16667, 1e-6)
         assert_rel_error(self, prob['y'], -7.833334, 1e-6)
 
+    def test_simple_paraboloid_linear_constraint_SLSQP(self):
+
+        class CountingOptimizer(ScipyOptimizer):
+
+            def __init__(self):
+                super(CountingOptimizer, self).__init__()
+                self.grad_calls = []
+
+            def calc_gradient(self, indep_list, unknown_list, **kwargs):
+                self.grad_calls.append(list(unknown_list))
+                return super(CountingOptimizer, self).calc_gradient(indep_list,
+                                                                    unknown_list,
+                                                                    **kwargs)
+
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', 50.0), promotes=['*'])
+        root.add('p2', IndepVarComp('y', 50.0), promotes=['*'])
+        root.add('comp', Paraboloid(), promotes=['*'])
+        root.add('con', ExecComp('c = 15.0 - x + y'), promotes=['*'])
+        root.add('con2', ExecComp('c2 = x*y'), promotes=['*'])
+
+        prob.driver = CountingOptimizer()
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['tol'] = 1.0e-8
+        prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+        prob.driver.add_desvar('y', lower=-50.0, upper=50.0)
+
+        prob.driver.add_objective('f_xy')
+        prob.driver.add_constraint('c', upper=0.0, linear=True)
+        prob.driver.add_constraint('c2', upper=0.0)
+        prob.driver.options['disp'] = False
+
+        prob.setup(check=False)
+        prob.run()
+
+        # Minimum should be at (7.166667, -7.833334)
+        assert_rel_error(self, prob['x'], 7.16667, 1e-6)
+        assert_rel_error(self, prob['y'], -7.833334, 1e-6)
+
+        # the linear constraint's gradient was only calculated once
+        calls = prob.driver.grad_calls
+        self.assertEqual(calls[0], ['c'])
+        self.assertGreater(len(calls), 2)
+        for call in calls[1:]:
+            self.assertEqual(call, ['f_xy', 'c2'])
+
+    def test_active_tol_SLSQP(self):
+
+        class InactiveCon(Component):
+            """ Errors if its derivatives are used."""
+
+            def __init__(self):
+                super(InactiveCon, self).__init__()
+
+                self.add_param('x', val=0.0)
+                self.add_param('y', val=0.0)
+
+                self.add_output('ci', val=0.0)
+
+            def solve_nonlinear(self, params, unknowns, resids):
+                unknowns['ci'] = -params['x'] + params['y']
+
+            def linearize(self, params, unknowns, resids):
+                pass
+
+            def apply_linear(self, params, unknowns, resids, dparams,
+                             dunknowns, dresids, mode):
+                raise RuntimeError("active_tol should have prevented this "
+                                   "from being called.")
+
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', 50.0), promotes=['*'])
+        root.add('p2', IndepVarComp('y', 50.0), promotes=['*'])
+        root.add('comp', Paraboloid(), promotes=['*'])
+        root.add('con1', ExecComp('c = - x + y'), promotes=['*'])
+        root.add('con2', InactiveCon(), promotes=['*'])
+
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['tol'] = 1.0e-8
+        prob.driver.options['disp'] = False
+        prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+        prob.driver.add_desvar('y', lower=-50.0, upper=50.0)
+
+        prob.driver.add_objective('f_xy')
+        prob.driver.add_constraint('c', upper=-15.0)
+        prob.driver.add_constraint('ci', upper=150.0, active_tol=50.0)
+
+        root.ln_solver.options['mode'] = 'rev'
+        root.ln_solver.options['single_voi_relevance_reduction'] = True
+
+        stream = cStringIO()
+        checks = prob.setup(out_stream=stream)
+        self.assertNotIn('active_tol', checks['driver_issues'])
+        prob.run()
+
+        # Minimum should be at (7.166667, -7.833334)
+        assert_rel_error(self, prob['x'], 7.16667, 1e-6)
+        assert_rel_error(self, prob['y'], -7.833334, 1e-6)
+
     def test_simple_paraboloid_constrained_COBYLA_upper(self):
 
         prob = Problem()
@@ -341,6 +451,67 @@ class TestScipyOptimize(unittest.TestCase):
         obj = prob['o']
         assert_rel_error(self, obj, 20.0, 1e-6)
 
+    def test_vector_constraints(self):
+
+        class CountingOptimizer(ScipyOptimizer):
+
+            def __init__(self):
+                super(CountingOptimizer, self).__init__()
+                self.num_con_calls = 0
+
+            def _confunc(self, x_new, name, idx):
+                self.num_con_calls += 1
+                return super(CountingOptimizer, self)._confunc(x_new, name, idx)
+
+        def run(optimizer, vector):
+            prob = Problem()
+            root = prob.root = Group()
+
+            root.add('p1', IndepVarComp('x', np.zeros(4)), promotes=['*'])
+            root.add('obj', ExecComp('o = sum((x - t)**2)', x=np.zeros(4),
+                                     t=np.array([1.0, 2.0, 3.0, 4.0])),
+                     promotes=['*'])
+            root.add('con', ExecComp('c = x[:3]', c=np.zeros(3), x=np.zeros(4)),
+                     promotes=['*'])
+            root.add('eq', ExecComp(['d[0] = x[2] + x[3]', 'd[1] = x[3] - x[2]'],
+                                    d=np.zeros(2), x=np.zeros(4)),
+                     promotes=['*'])
+
+            prob.driver = CountingOptimizer()
+            prob.driver.options['optimizer'] = optimizer
+            prob.driver.options['vector_constraints'] = vector
+            prob.driver.options['tol'] = 1.0e-9
+            prob.driver.options['disp'] = False
+            prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+
+            prob.driver.add_objective('o')
+            prob.driver.add_constraint('c', lower=np.array([-1.0, 2.5, -1.0]),
+                                       upper=np.array([0.5, 5.0, 5.0]))
+
+            # COBYLA in Scipy doesn't support equality constraints
+            if optimizer == 'SLSQP':
+                prob.driver.add_constraint('d', equals=np.array([8.0, 1.0]))
+
+            prob.setup(check=False)
+            prob.run()
+            return prob
+
+        # the double-sided constraint is 6 scalar constraints but only 2
+        # vector constraints, and the equality constraint is 2 scalar or 1
+        # vector constraint.
+        cases = [('SLSQP', [0.5, 2.5, 3.5, 4.5], 8, 3),
+                 ('COBYLA', [0.5, 2.5, 3.0, 4.0], 6, 2)]
+
+        for optimizer, x, num_scalar, num_vector in cases:
+            expected = run(optimizer, False)
+            prob = run(optimizer, True)
+
+            assert_rel_error(self, prob['x'], expected['x'], 1e-6)
+            assert_rel_error(self, prob['x'], np.array(x), 1e-4)
+
+            self.assertEqual(num_scalar * prob.driver.num_con_calls,
+                             num_vector * expected.driver.num_con_calls)
+
     def test_fan_out(self):
 
         prob = Problem()
@@ -379,6 +550,68 @@ class TestScipyOptimize(unittest.TestCase):
         obj = prob['obj.o']
         assert_rel_error(self, obj, 30.0, 1e-6)
 
+    def test_eval_cache(self):
+        p1 = np.array([1.0, 2.0])
+        p2 = np.array([3.0, 4.0])
+
+        def fake_minimize(fun, x0, jac=None, **kwargs):
+            # a stand-in for scipy that asks for the same points more than
+            # once, and returns one that the model isn't currently at
+            for x in (x0, p1, p2, p1, p2):
+                fun(x)
+            jac(p1)
+            jac(p1)
+            return OptimizeResult(x=p2, success=True)
+
+        def run(size):
+            prob = Problem()
+            root = prob.root = Group()
+
+            root.add('p1', IndepVarComp('x', 50.0), promotes=['*'])
+            root.add('p2', IndepVarComp('y', 50.0), promotes=['*'])
+            root.add('comp', Paraboloid(), promotes=['*'])
+
+            prob.driver = ScipyOptimizer()
+            prob.driver.options['optimizer'] = 'TNC'
+            prob.driver.options['eval_cache_size'] = size
+            prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+            prob.driver.add_desvar('y', lower=-50.0, upper=50.0)
+            prob.driver.options['disp'] = False
+
+            prob.driver.add_objective('f_xy')
+
+            recorder = InMemoryRecorder()
+            prob.driver.add_recorder(recorder)
+
+            prob.setup(check=False)
+
+            minimize = scipy_optimizer.minimize
+            scipy_optimizer.minimize = fake_minimize
+            try:
+                prob.run()
+            finally:
+                scipy_optimizer.minimize = minimize
+
+            return prob, recorder.iters
+
+        prob, iters = run(0)
+        self.assertIsNone(prob.driver.get_eval_cache_stats())
+        self.assertEqual(prob.driver.iter_count, 5)
+        self.assertEqual(len(iters), 5)
+
+        prob, iters = run(100)
+        self.assertEqual(prob.driver.get_eval_cache_stats(),
+                         {'hits': {'funcs': 2, 'grad': 1},
+                          'misses': {'funcs': 3, 'grad': 1}})
+
+        # the model is run again to take the gradient at p1 and to leave it
+        # at p2, but those points aren't recorded twice
+        self.assertEqual(prob.driver.iter_count, 3)
+        self.assertEqual(len(iters), 3)
+        self.assertEqual(prob['x'], 3.0)
+        self.assertEqual(prob['y'], 4.0)
+        assert_rel_error(self, prob['f_xy'], iters[2]['unknowns']['f_xy'], 1e-15)
+
     def test_Sellar_SLSQP(self):
 
         prob = Problem()
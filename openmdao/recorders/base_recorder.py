@@ -1,12 +1,128 @@
 """ Class definition for BaseRecorder, the base class for all recorders."""
 
-from fnmatch import fnmatchcase
+from copy import deepcopy
+from fnmatch import translate
+from numbers import Number
+import re
 import sys
 
-from six import StringIO
+from collections import OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
+import numpy as np
+from six import StringIO, iteritems
+
+from openmdao.core.vec_wrapper import VecWrapper
 from openmdao.util.options import OptionsDictionary
 
+def _value_changed(old, new):
+    """ Returns True if `new` differs from the previously recorded `old`. """
+    if isinstance(new, (np.ndarray, Number)):
+        return not np.array_equal(old, new)
+    try:
+        return bool(old != new)
+    except Exception:
+        # can't compare, so assume it changed
+        return True
+
+
+def _copy_value(val):
+    """ Returns a copy of `val` that is unaffected by later updates. """
+    if isinstance(val, np.ndarray):
+        return val.copy()
+    if isinstance(val, Number):
+        return val
+    return deepcopy(val)
+
+
+def _compile_patterns(patterns):
+    """ Returns a single compiled regex matching any of the given glob
+    patterns, or None if there are no patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join('(?:%s)' % translate(p) for p in patterns))
+
+
+def _get_filter_layout(vecwrapper, names):
+    """ Computes the indices into the flat vector of `vecwrapper` for the
+    given variables, along with each variable's location in the array
+    taken with those indices.
+
+    Variables that aren't stored unmodified in the flat vector (pass by
+    object, remote, unit converted or complex) are returned separately so
+    their values can be retrieved through the vecwrapper.
+    """
+    idxs = []
+    layout = OrderedDict()
+    slow = []
+    start = 0
+
+    for name in names:
+        acc = vecwrapper._dat[name]
+        if acc.slice is None or acc.flat != acc._get_arr:
+            layout[name] = None
+            slow.append(name)
+        else:
+            vstart, vend = acc.slice
+            end = start + vend - vstart
+            layout[name] = (start, end, acc.meta['shape'])
+            idxs.append(np.arange(vstart, vend))
+            start = end
+
+    if idxs:
+        idxs = np.concatenate(idxs)
+    else:
+        idxs = np.zeros(0, dtype=int)
+
+    return idxs, layout, slow
+
+
+class _FilteredVector(Mapping):
+    """ A read-only mapping of the recorded variables of a vector.
+
+    The values of all variables that live in the flat vector are taken
+    from it in a single indexing operation, and each value is a view into
+    that copy.
+
+    Args
+    ----
+    buf : ndarray
+        Values of the recorded variables taken from the flat vector.
+
+    layout : OrderedDict
+        Maps each variable name to its (start, end, shape) in `buf`, or
+        to None if the variable is not in the flat vector.
+
+    extra : dict
+        Values of the variables that are not in the flat vector.
+    """
+
+    def __init__(self, buf, layout, extra):
+        self._buf = buf
+        self._layout = layout
+        self._extra = extra
+
+    def __getitem__(self, name):
+        loc = self._layout[name]
+        if loc is None:
+            return self._extra[name]
+
+        start, end, shape = loc
+        if shape == 1:
+            return self._buf[start]
+        return self._buf[start:end].reshape(shape)
+
+    def __iter__(self):
+        return iter(self._layout)
+
+    def __len__(self):
+        return len(self._layout)
+
+
 class BaseRecorder(object):
     """ This is a base class for all case recorders and is not a functioning
     case recorder on its own.
@@ -27,6 +143,12 @@ class BaseRecorder(object):
         Patterns for variables to include in recording.
     options['excludes'] :  list of strings
         Patterns for variables to exclude in recording (processed after includes).
+    options['record_changes_only'] :  bool(False)
+        Tells recorder to only record variables whose values changed since the
+        last recorded iteration of the same system.
+    options['keyframe_interval'] :  int(10)
+        When recording changes only, record all variables every this many
+        iterations of the same system.
     """
 
     def __init__(self):
@@ -42,6 +164,13 @@ class BaseRecorder(object):
         self.options.add_option('excludes', [],
                                 desc='Patterns for variables to exclude from recording '
                                 '(processed after includes)')
+        self.options.add_option('record_changes_only', False,
+                                desc='Set to True to record only variables whose '
+                                'values changed since the last recorded iteration '
+                                'of the same system')
+        self.options.add_option('keyframe_interval', 10, lower=1,
+                                desc='Number of iterations of the same system between '
+                                'full recordings when recording changes only')
         self.out = None
 
         # This is for drivers to determine if a recorder supports
@@ -57,6 +186,17 @@ class BaseRecorder(object):
         self._filtered = {}
         # TODO: System specific includes/excludes
 
+        # compiled include/exclude patterns, keyed on the pattern lists
+        self._patterns = {}
+
+        # layouts of the filtered vectors, keyed on vector type and the
+        # names in the iteration coordinate
+        self._filter_cache = {}
+
+        # state of the change-only recording, keyed on the iteration
+        # coordinate with the iteration numbers removed
+        self._deltas = {}
+
     def startup(self, group):
         """ Prepare for a new run.
 
@@ -66,6 +206,9 @@ class BaseRecorder(object):
             Group that owns this recorder.
         """
 
+        self._deltas = {}
+        self._filter_cache = {}
+
         myparams = myunknowns = myresids = set()
 
         check = self._check_path
@@ -91,17 +234,19 @@ class BaseRecorder(object):
     def _check_path(self, path, includes, excludes):
         """ Return True if `path` should be recorded. """
 
-        # First see if it's included
-        for pattern in includes:
-            if fnmatchcase(path, pattern):
-                # We found a match. Check to see if it is excluded.
-                for ex_pattern in excludes:
-                    if fnmatchcase(path, ex_pattern):
-                        return False
-                return True
+        key = (tuple(includes), tuple(excludes))
+        try:
+            incl, excl = self._patterns[key]
+        except KeyError:
+            incl, excl = self._patterns[key] = (_compile_patterns(includes),
+                                                _compile_patterns(excludes))
 
         # Did not match anything in includes.
-        return False
+        if incl is None or incl.match(path) is None:
+            return False
+
+        # We found a match. Check to see if it is excluded.
+        return excl is None or excl.match(path) is None
 
     def _get_pathname(self, iteration_coordinate):
         '''
@@ -112,14 +257,96 @@ class BaseRecorder(object):
 
     def _filter_vector(self, vecwrapper, key, iteration_coordinate):
         '''
-        Returns a dict that is a subset of the given vecwrapper
+        Returns a mapping that is a subset of the given vecwrapper
         to be recorded.
         '''
         if not vecwrapper:
             return vecwrapper
 
-        pathname = self._get_pathname(iteration_coordinate)
-        return {n:vecwrapper[n] for n in self._filtered[pathname][key]}
+        if isinstance(vecwrapper, VecWrapper):
+            filtered = self._take_filtered(vecwrapper, key, iteration_coordinate)
+        else:
+            pathname = self._get_pathname(iteration_coordinate)
+            filtered = {n:vecwrapper[n] for n in self._filtered[pathname][key]}
+
+        if self.options['record_changes_only']:
+            return self._filter_changes(filtered, key, iteration_coordinate)
+
+        return filtered
+
+    def _take_filtered(self, vecwrapper, key, iteration_coordinate):
+        '''
+        Returns a `_FilteredVector` holding the recorded variables of
+        `vecwrapper`. The indices of the recorded variables in the flat
+        vector are computed on the first call for each system and cached.
+        '''
+        cache_key = (key, tuple(iteration_coordinate[5::2]))
+        try:
+            vec, idxs, layout, slow = self._filter_cache[cache_key]
+        except KeyError:
+            vec = None
+
+        if vec is not vecwrapper:
+            names = self._filtered['.'.join(cache_key[1])][key]
+            idxs, layout, slow = _get_filter_layout(vecwrapper, names)
+            self._filter_cache[cache_key] = (vecwrapper, idxs, layout, slow)
+
+        extra = {n:vecwrapper[n] for n in slow}
+
+        return _FilteredVector(vecwrapper.vec[idxs], layout, extra)
+
+    def _get_delta_key(self, iteration_coordinate):
+        '''
+        Returns the iteration coordinate without its iteration numbers, which
+        identifies the sequence of iterations that deltas are computed over.
+        '''
+        return (iteration_coordinate[0],) + tuple(iteration_coordinate[1::2])
+
+    def _start_delta(self, iteration_coordinate, case_name):
+        '''
+        Called by recorders at the start of each recorded iteration when
+        recording changes only. Returns the name of the previously recorded
+        case that this case is a delta of, or None if this case is a
+        keyframe that contains all recorded variables.
+        '''
+        delta_key = self._get_delta_key(iteration_coordinate)
+        state = self._deltas.get(delta_key)
+
+        if state is None:
+            state = self._deltas[delta_key] = {
+                'count': 0,
+                'last_case': None,
+                'values': {'p': {}, 'u': {}, 'r': {}},
+            }
+
+        if state['count'] % self.options['keyframe_interval'] == 0:
+            previous = None
+        else:
+            previous = state['last_case']
+
+        state['keyframe'] = previous is None
+        state['count'] += 1
+        state['last_case'] = case_name
+
+        return previous
+
+    def _filter_changes(self, filtered, key, iteration_coordinate):
+        '''
+        Reduces `filtered` to the variables whose values changed since the
+        last recorded iteration of the same iteration coordinate prefix.
+        On keyframes all of the variables are returned.
+        '''
+        state = self._deltas[self._get_delta_key(iteration_coordinate)]
+        last = state['values'][key]
+        keyframe = state['keyframe']
+
+        changed = {}
+        for name, val in iteritems(filtered):
+            if keyframe or name not in last or _value_changed(last[name], val):
+                changed[name] = val
+                last[name] = _copy_value(val)
+
+        return changed
 
     def record_metadata(self, group):
         """Writes the metadata of the given group
@@ -1,4 +1,5 @@
 from openmdao.recorders.sqlite_reader import SqliteCaseReader
+from openmdao.recorders.columnar_reader import ColumnarCaseReader
 from openmdao.recorders.hdf5_reader import HDF5CaseReader
 
 
@@ -9,12 +10,12 @@ def CaseReader(filename):
     ----------
     filename : str
         A path to the recorded file.  The file should have been recorded using
-        either the SqliteRecorder or the HDF5Recorder.
+        the SqliteRecorder, the ColumnarRecorder or the HDF5Recorder.
 
     Returns
     -------
-    An instance of SqliteCaseReader or HDF5CaseReader, depending on the
-    contents of the given file.
+    An instance of SqliteCaseReader, ColumnarCaseReader or HDF5CaseReader,
+    depending on the contents of the given file.
     """
 
     try:
@@ -24,6 +25,13 @@ def CaseReader(filename):
         # filename not a valid Sqlite database file
         pass
 
+    try:
+        reader = ColumnarCaseReader(filename)
+        return reader
+    except IOError:
+        # filename not a columnar file
+        pass
+
     try:
         reader = HDF5CaseReader(filename)
         return reader
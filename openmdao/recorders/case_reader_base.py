@@ -51,6 +51,41 @@ class CaseReaderBase(object):
         """
         pass
 
+    def _reconstruct_case_dict(self, case_dict, get_case_dict):
+        """ Rebuild the full case data from a case recorded with the
+        `record_changes_only` option by applying the changes recorded since
+        the last keyframe.
+
+        Parameters
+        ----------
+        case_dict : dict
+            The data recorded for the case.
+        get_case_dict : callable
+            Returns the recorded data for a given case identifier.
+
+        Returns
+        -------
+        dict
+            The case data containing all of the recorded variables.
+        """
+        chain = [case_dict]
+        while chain[-1].get('previous_case'):
+            chain.append(get_case_dict(chain[-1]['previous_case']))
+
+        if len(chain) == 1:
+            return case_dict
+
+        full = dict(case_dict)
+        for vec in ('Parameters', 'Unknowns', 'Residuals'):
+            if case_dict.get(vec) is None:
+                continue
+            merged = {}
+            for data in reversed(chain):
+                merged.update(data.get(vec) or {})
+            full[vec] = merged
+
+        return full
+
     def list_cases(self):
         """ Return a tuple of the case string identifiers available in this
         instance of the CaseReader.
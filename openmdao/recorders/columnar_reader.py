@@ -0,0 +1,241 @@
+from __future__ import print_function, absolute_import
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+from openmdao.recorders.case_reader_base import CaseReaderBase
+from openmdao.recorders.case import Case
+from openmdao.recorders.columnar_recorder import MAGIC, CHUNK_HEADER, NROWS
+
+
+class ColumnarCaseReader(CaseReaderBase):
+    """ A CaseReader specific to files created with ColumnarRecorder.
+
+    The whole file is memory mapped, so reading a column of all cases or a
+    single case only touches the parts of the file that hold it. Cases are
+    listed in the order they were recorded, and a column only has values
+    for the cases of the systems that recorded the variable.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the filename containing the recorded data.
+    """
+    def __init__(self, filename):
+        super(ColumnarCaseReader, self).__init__(filename)
+
+        if not os.path.isfile(filename):
+            raise IOError('File does not contain valid '
+                          'columnar data ({0})'.format(filename))
+
+        with open(filename, 'rb') as f:
+            header = f.read(len(MAGIC) + NROWS.size)
+
+        if not header.startswith(MAGIC) or len(header) < len(MAGIC) + NROWS.size:
+            raise IOError('File does not contain valid '
+                          'columnar data ({0})'.format(filename))
+
+        self.format_version = NROWS.unpack(header[len(MAGIC):])[0]
+
+        self._load()
+
+        self.num_cases = len(self._case_keys)
+
+    def _load(self):
+        """ Scan the chunks of the file, loading the metadata, the column
+        schema, the locations of the row groups and any derivatives.
+        """
+        if self.format_version != 1:
+            raise ValueError('ColumnarCaseReader encountered an unhandled '
+                             'format version: {0}'.format(self.format_version))
+
+        self._schemas = []
+        self._row_groups = []
+        self._derivs = {}
+
+        metadata = {}
+        self._data = data = np.memmap(self.filename, dtype=np.uint8, mode='r')
+
+        pos = len(MAGIC) + NROWS.size
+        while pos + CHUNK_HEADER.size <= len(data):
+            tag, length = CHUNK_HEADER.unpack(data[pos:pos+CHUNK_HEADER.size].tobytes())
+            pos += CHUNK_HEADER.size
+            payload = data[pos:pos+length]
+            pos += length
+
+            if tag == b'META':
+                metadata = pickle.loads(payload.tobytes())
+            elif tag == b'SCHM':
+                self._schemas.append(json.loads(payload.tobytes().decode('utf-8')))
+            elif tag == b'DERV':
+                case_id, derivs = pickle.loads(payload.tobytes())
+                self._derivs[case_id] = derivs
+            elif tag == b'ROWS':
+                self._row_groups.append(self._map_row_group(payload))
+
+        self._parameters = metadata.get('Parameters', None)
+        self._unknowns = metadata.get('Unknowns', None)
+
+        # (row group, row) of each case, in the order they were recorded
+        locations = [(num, (g, row)) for g, rg in enumerate(self._row_groups)
+                     for row, num in enumerate(rg['case_num'])]
+        locations.sort()
+        self._case_locations = [loc for _, loc in locations]
+
+        self._case_keys = tuple(self._row_groups[g]['case_id'][row].decode('utf-8')
+                                for g, row in self._case_locations)
+        self._case_index = dict((key, i) for i, key in enumerate(self._case_keys))
+
+        self._vectors = set(col['vector'] for schema in self._schemas
+                            for col in schema['columns'])
+
+    def _map_row_group(self, payload):
+        """ Returns views of each column of a row group. """
+        index, nrows, id_width, msg_width = \
+            [NROWS.unpack(payload[i:i+NROWS.size].tobytes())[0]
+             for i in range(0, 4*NROWS.size, NROWS.size)]
+        pos = 4*NROWS.size
+        schema = self._schemas[index]['columns']
+
+        columns = [('case_id', 'S%d' % id_width, 1), ('timestamp', np.float64, 1),
+                   ('success', np.int8, 1), ('msg', 'S%d' % msg_width, 1),
+                   ('case_num', np.uint64, 1)]
+        columns.extend(((col['vector'], col['name']), np.float64, col['width'])
+                       for col in schema)
+
+        row_group = {'nrows': nrows, 'schema': schema}
+        for key, dtype, width in columns:
+            nbytes = nrows * width * np.dtype(dtype).itemsize
+            block = payload[pos:pos+nbytes].view(dtype)
+            if width > 1:
+                block = block.reshape((nrows, width))
+            row_group[key] = block
+            pos += nbytes
+
+        return row_group
+
+    def get_column(self, name, vector='Unknowns'):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the recorded variable.
+        vector : str, optional
+            One of 'Parameters', 'Unknowns' or 'Residuals'.
+
+        Returns
+        -------
+        ndarray
+            The values of the variable in all cases that recorded it, with
+            the case as the first axis.
+        """
+        return self._get_column(name, vector)[1]
+
+    def _get_column(self, name, vector):
+        """ Returns the ids of the cases that recorded a variable and its
+        values in those cases, in the order the cases were recorded.
+        """
+        key = (vector, name)
+        for schema in self._schemas:
+            cols = [col for col in schema['columns']
+                    if col['vector'] == vector and col['name'] == name]
+            if cols:
+                shape = tuple(cols[0]['shape'])
+                break
+        else:
+            raise KeyError("Variable '{0}' was not recorded in "
+                           "{1}".format(name, vector))
+
+        groups = [rg for rg in self._row_groups if key in rg]
+        if not groups:
+            return [], np.zeros((0,) + shape)
+
+        nums = np.concatenate([rg['case_num'] for rg in groups])
+        order = np.argsort(nums, kind='mergesort')
+
+        values = np.concatenate([rg[key] for rg in groups])[order]
+        case_ids = np.concatenate([rg['case_id'] for rg in groups])[order]
+
+        return ([case_id.decode('utf-8') for case_id in case_ids],
+                values.reshape((len(values),) + shape))
+
+    def to_dataframe(self, vector='Unknowns'):
+        """ Return the recorded values of one vector as a pandas DataFrame
+        indexed by case identifier. Array variables become columns holding
+        an array in every row. Cases of systems that didn't record a
+        variable have NaN in its column.
+
+        Parameters
+        ----------
+        vector : str, optional
+            One of 'Parameters', 'Unknowns' or 'Residuals'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The recorded values, one row per case.
+        """
+        import pandas
+
+        columns = {}
+        names = []
+        for schema in self._schemas:
+            for col in schema['columns']:
+                if col['vector'] != vector or col['name'] in columns:
+                    continue
+                case_ids, values = self._get_column(col['name'], vector)
+                if col['shape']:
+                    values = list(values)
+                columns[col['name']] = pandas.Series(values, index=case_ids)
+                names.append(col['name'])
+
+        return pandas.DataFrame(columns, index=list(self._case_keys),
+                                columns=names)
+
+    def get_case(self, case_id):
+        """
+        Parameters
+        ----------
+        case_id : int or str
+            The integer index or string-identifier of the case to be retrieved.
+
+        Returns
+        -------
+            An instance of Case populated with data from the
+            specified case/iteration.
+        """
+        if isinstance(case_id, int):
+            # If case_id is an integer, assume the user
+            # wants a case as an index
+            _case_id = self._case_keys[case_id]
+        else:
+            # Otherwise assume we were given the case string identifier
+            _case_id = case_id
+
+        group, row = self._case_locations[self._case_index[_case_id]]
+        rg = self._row_groups[group]
+
+        case_dict = {
+            'timestamp': float(rg['timestamp'][row]),
+            'success': int(rg['success'][row]),
+            'msg': rg['msg'][row].decode('utf-8'),
+        }
+
+        for vector in self._vectors:
+            case_dict[vector] = {}
+
+        for col in rg['schema']:
+            val = np.array(rg[(col['vector'], col['name'])][row])
+            if col['shape']:
+                val = val.reshape(col['shape'])
+            else:
+                val = float(val)
+            case_dict[col['vector']][col['name']] = val
+
+        if _case_id in self._derivs:
+            case_dict['Derivatives'] = self._derivs[_case_id]
+
+        return Case(self.filename, _case_id, case_dict)
@@ -0,0 +1,272 @@
+"""Class definition for ColumnarRecorder, a recorder that streams cases in
+row groups to a binary columnar file."""
+
+import json
+import pickle
+import struct
+from numbers import Number
+
+import numpy as np
+from six import iteritems
+
+from openmdao.core.mpi_wrap import MPI
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import format_iteration_coordinate
+
+format_version = 1
+
+# Every columnar file starts with this, followed by the format version.
+MAGIC = b'OPENMDAO_COLUMNAR'
+
+# The rest of the file is a sequence of chunks, each starting with a tag
+# and the length of its payload:
+#   META  pickled dict of the variable and system metadata
+#   SCHM  JSON dict of the pathname of a recording system and the list of
+#         its variable columns. Schemas are numbered in the order they are
+#         written.
+#   ROWS  a row group of one system, which is the number of its schema and
+#         the number of rows, followed by the data of each column, one
+#         column after the other
+#   DERV  pickled (case_id, derivs) tuple
+CHUNK_HEADER = struct.Struct('<4sQ')
+NROWS = struct.Struct('<Q')
+
+# Vectors of variables in the order they are stored, as the key used in
+# `_filtered`, the name used in the recording options and the label.
+VECTORS = (('p', 'params', 'Parameters'),
+           ('u', 'unknowns', 'Unknowns'),
+           ('r', 'resids', 'Residuals'))
+
+
+def _encode_strings(strings):
+    """ Returns the given strings as a fixed width bytes array. """
+    encoded = [s.encode('utf-8') for s in strings]
+    width = max(1, max(len(s) for s in encoded))
+    return np.array(encoded, dtype='S%d' % width)
+
+
+class ColumnarRecorder(BaseRecorder):
+    """ Recorder that streams cases into a binary columnar file, buffering
+    `row_group_size` cases in memory and writing each variable of those
+    cases as one contiguous column. Array variables are stored as fixed
+    width columns of their flattened values, so a whole column can be
+    loaded with a single read. Only numeric variables can be recorded.
+
+    Each system that records to the file, such as a driver and a solver,
+    gets its own columns, and its cases are buffered and written in
+    separate row groups. The cases are numbered in the order they were
+    recorded, so the reader can list them in that order.
+
+    Args
+    ----
+    out : str
+        String containing the filename for the columnar file.
+
+    Options
+    -------
+    options['record_metadata'] :  bool(True)
+        Tells recorder whether to record variable attribute metadata.
+    options['record_unknowns'] :  bool(True)
+        Tells recorder whether to record the unknowns vector.
+    options['record_params'] :  bool(False)
+        Tells recorder whether to record the params vector.
+    options['record_resids'] :  bool(False)
+        Tells recorder whether to record the ressiduals vector.
+    options['record_derivs'] :  bool(True)
+        Tells recorder whether to record derivatives that are requested by a `Driver`.
+    options['includes'] :  list of strings
+        Patterns for variables to include in recording.
+    options['excludes'] :  list of strings
+        Patterns for variables to exclude in recording (processed after includes).
+    options['row_group_size'] :  int(1000)
+        Number of cases buffered in memory before they are written to the file.
+    """
+
+    def __init__(self, out):
+        super(ColumnarRecorder, self).__init__()
+
+        self.options.add_option('row_group_size', 1000, lower=1,
+                                desc='Number of cases buffered in memory before '
+                                'they are written to the file')
+
+        # columns and buffered cases of each recording system, keyed on its
+        # pathname, as in `_filtered`
+        self._schemas = {}
+        self._rows = {}
+        self._num_cases = 0
+
+        if MPI and MPI.COMM_WORLD.rank > 0:
+            self.out = None
+        else:
+            self.out = open(out, 'wb')
+            self.out.write(MAGIC)
+            self.out.write(NROWS.pack(format_version))
+
+    def startup(self, group):
+        """ Prepare for a new run.
+
+        Args
+        ----
+        group : `Group`
+            Group that owns this recorder.
+        """
+        if self.options['record_changes_only']:
+            raise RuntimeError("Recording of changes only is not supported by "
+                               "ColumnarRecorder.")
+
+        super(ColumnarRecorder, self).startup(group)
+
+    def _write_chunk(self, tag, payload):
+        """ Writes a tagged chunk to the file. """
+        self.out.write(CHUNK_HEADER.pack(tag, len(payload)))
+        self.out.write(payload)
+
+    def record_metadata(self, group):
+        """Stores the metadata of the given group in the columnar file.
+
+        Args
+        ----
+        group : `System`
+            `System` containing vectors
+        """
+        if self.out is None:
+            return
+
+        metadata = {
+            'Parameters': dict(group.params.iteritems()),
+            'Unknowns': dict(group.unknowns.iteritems()),
+            'system_metadata': group.metadata,
+        }
+        self._write_chunk(b'META', pickle.dumps(metadata, pickle.HIGHEST_PROTOCOL))
+
+    def _build_schema(self, pathname, vectors):
+        """ Determines the columns of a system from the first case that it
+        records, and returns the number of its schema and the columns.
+        """
+        schema = []
+        for label, data in vectors:
+            for name, val in sorted(iteritems(data)):
+                if not isinstance(val, (np.ndarray, Number)):
+                    msg = "ColumnarRecorder does not support data of type '{0}'"
+                    raise NotImplementedError(msg.format(type(val)))
+
+                shape = np.shape(val)
+                schema.append({
+                    'vector': label,
+                    'name': name,
+                    'shape': list(shape),
+                    'width': int(np.prod(shape)),
+                })
+
+        self._write_chunk(b'SCHM', json.dumps({'system': pathname,
+                                               'columns': schema}).encode('utf-8'))
+        return len(self._schemas), schema
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        """
+        Buffers the provided data and writes a row group to the file once
+        `row_group_size` cases have been buffered.
+
+        Args
+        ----
+        params : dict
+            Dictionary containing parameters. (p)
+
+        unknowns : dict
+            Dictionary containing outputs and states. (u)
+
+        resids : dict
+            Dictionary containing residuals. (r)
+
+        metadata : dict, optional
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        if self.out is None:
+            return
+
+        iteration_coordinate = metadata['coord']
+        vecs = {'p': params, 'u': unknowns, 'r': resids}
+
+        vectors = []
+        for key, vecname, label in VECTORS:
+            if self.options['record_' + vecname]:
+                vectors.append((label, self._filter_vector(vecs[key], key,
+                                                           iteration_coordinate)))
+
+        pathname = self._get_pathname(iteration_coordinate)
+        if pathname not in self._schemas:
+            self._schemas[pathname] = self._build_schema(pathname, vectors)
+            self._rows[pathname] = []
+        schema = self._schemas[pathname][1]
+
+        data = dict(vectors)
+        row = [format_iteration_coordinate(iteration_coordinate),
+               metadata['timestamp'], metadata['success'], metadata['msg'],
+               self._num_cases]
+        # copy the values, since they may be views into the model's vectors
+        row.extend(np.array(data[col['vector']][col['name']], dtype=np.float64).ravel()
+                   for col in schema)
+        self._num_cases += 1
+
+        rows = self._rows[pathname]
+        rows.append(row)
+        if len(rows) >= self.options['row_group_size']:
+            self._write_row_group(pathname)
+
+    def _write_row_group(self, pathname):
+        """ Writes all of the buffered cases of a system as one row group. """
+        rows = self._rows[pathname]
+        if not rows:
+            return
+
+        index, schema = self._schemas[pathname]
+        nrows = len(rows)
+        columns = list(zip(*rows))
+        self._rows[pathname] = []
+
+        blocks = [
+            _encode_strings(columns[0]),
+            np.array(columns[1], dtype=np.float64),
+            np.array(columns[2], dtype=np.int8),
+            _encode_strings(columns[3]),
+            np.array(columns[4], dtype=np.uint64),
+        ]
+
+        for col, values in zip(schema, columns[5:]):
+            blocks.append(np.array(values, dtype=np.float64).reshape(nrows,
+                                                                     col['width']))
+
+        # string columns have a different width in each row group
+        header = NROWS.pack(index) + NROWS.pack(nrows) + \
+            NROWS.pack(blocks[0].itemsize) + NROWS.pack(blocks[3].itemsize)
+
+        self.out.write(CHUNK_HEADER.pack(b'ROWS', len(header) +
+                                         sum(b.nbytes for b in blocks)))
+        self.out.write(header)
+        for block in blocks:
+            self.out.write(block.tobytes())
+
+    def record_derivatives(self, derivs, metadata):
+        """Writes the derivatives that were calculated for the driver.
+
+        Args
+        ----
+        derivs : dict or ndarray depending on the optimizer
+            Dictionary containing derivatives
+
+        metadata : dict, optional
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        if self.out is None:
+            return
+
+        case_id = format_iteration_coordinate(metadata['coord'])
+        self._write_chunk(b'DERV', pickle.dumps((case_id, derivs),
+                                                pickle.HIGHEST_PROTOCOL))
+
+    def close(self):
+        """Writes any buffered cases and closes `out`."""
+        if self.out is not None:
+            for pathname in sorted(self._rows, key=lambda p: self._schemas[p][0]):
+                self._write_row_group(pathname)
+        super(ColumnarRecorder, self).close()
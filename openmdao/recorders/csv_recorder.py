@@ -5,7 +5,7 @@ import numpy
 import sys
 import warnings
 
-from six import string_types, itervalues
+from six import string_types, iteritems
 
 from openmdao.recorders.base_recorder import BaseRecorder
 
@@ -27,9 +27,35 @@ def serialize(val):
     return str(val)
 
 
+def _quote(field):
+    """ Quotes `field` the way `csv.writer` does if it contains a
+    delimiter, quote or line break.
+    """
+    if any(c in field for c in ',"\r\n'):
+        return '"%s"' % field.replace('"', '""')
+    return field
+
+
+# column format of each numeric dtype kind
+_COLUMN_FMTS = {
+    'b': '%s',
+    'i': '%d',
+    'u': '%d',
+    'f': '%r',
+}
+
+
+class _LineBuffer(list):
+    """ List of lines that a `csv.writer` can write to. """
+
+    def write(self, line):
+        self.append(line)
+
+
 class CsvRecorder(BaseRecorder):
     """ Recorder that saves cases into a CSV file. This recorder does not
-    record metadata.
+    record metadata. Numeric array variables are expanded into one column
+    per entry, named `name[i]` for the i-th entry of the flattened array.
 
     Args
     ----
@@ -50,6 +76,10 @@ class CsvRecorder(BaseRecorder):
         Patterns for variables to include in recording.
     options['excludes'] :  list of strings
         Patterns for variables to exclude in recording (processed after includes).
+    options['buffer_rows'] :  int(1)
+        Number of rows buffered in memory before they are written to `out`.
+        All rows go through the same buffer, so they are written in the
+        order they were recorded.
     """
 
     def __init__(self, out=sys.stdout):
@@ -60,18 +90,86 @@ class CsvRecorder(BaseRecorder):
                       DeprecationWarning, stacklevel=2)
         warnings.simplefilter('ignore', DeprecationWarning)
 
+        self.options.add_option('buffer_rows', 1, lower=1,
+                                desc='Number of rows buffered in memory before '
+                                'they are written to the output')
+
         self.options['record_metadata'] = False
         self._wrote_header = False
         self._parallel = False
         self.ncol = 0
 
+        # column layout of the recorded variables, keyed on system pathname
+        self._layouts = {}
+        self._lines = _LineBuffer()
+
         if out != sys.stdout:
             # filename or file descriptor
             if isinstance(out, string_types):
                 # filename was given
                 out = open(out, 'w')
             self.out = out
-        self.writer = csv.writer(out)
+        self._stream = out
+        self.writer = csv.writer(self._lines)
+
+    def startup(self, group):
+        """ Prepare for a new run.
+
+        Args
+        ----
+        group : `Group`
+            Group that owns this recorder.
+        """
+        if self.options['record_changes_only']:
+            raise RuntimeError("Recording of changes only is not supported by CsvRecorder.")
+
+        super(CsvRecorder, self).startup(group)
+
+        self._layouts[group.pathname] = self._get_layout(group)
+
+    def _get_layout(self, group):
+        """ Computes the columns of every recorded variable of `group`. A
+        numeric variable has a column for each entry of its flattened value,
+        formatted for the dtype of its metadata value. Any other variable is
+        serialized into a single column.
+        """
+        filtered = self._filtered[group.pathname]
+        header = ['success'] # add column for success flag
+        fmts = ['%d']
+        cols = []
+
+        for key, vec in (('p', group.params), ('u', group.unknowns),
+                         ('r', group.resids)):
+            for name in filtered[key]:
+                val = numpy.asarray(vec.metadata(name)['val'])
+                start = len(header)
+
+                if val.dtype.kind not in _COLUMN_FMTS:
+                    header.append(name)
+                    fmts.append('%s')
+                    cols.append((key, name, start, None))
+                    continue
+
+                if val.ndim == 0:
+                    header.append(name)
+                else:
+                    header.extend('%s[%d]' % (name, i) for i in range(val.size))
+                fmts.extend([_COLUMN_FMTS[val.dtype.kind]] * val.size)
+                cols.append((key, name, start, start + val.size))
+
+        fmt = ','.join(fmts)
+
+        # the derivatives column is always empty in iteration rows
+        if self.options['record_derivs']:
+            header.append('Derivatives')
+            fmt += ','
+
+        return {
+            'header': header,
+            'cols': cols,
+            'fmt': fmt + '\r\n',
+            'row': [None] * len(fmts),
+        }
 
     def record_metadata(self, group):
         """Currently not supported for csv files. Do nothing.
@@ -105,50 +203,57 @@ class CsvRecorder(BaseRecorder):
         """
 
         iteration_coordinate = metadata['coord']
+        layout = self._layouts[self._get_pathname(iteration_coordinate)]
+
+        if self._wrote_header is False:
+            self.ncol = len(layout['header'])
+            self._write_header(layout['header'])
 
+        vecs = {}
         if self.options['record_params']:
-            params = self._filter_vector(params, 'p', iteration_coordinate)
-        else:
-            params = None
+            vecs['p'] = self._filter_vector(params, 'p', iteration_coordinate)
         if self.options['record_unknowns']:
-            unknowns = self._filter_vector(unknowns, 'u', iteration_coordinate)
-        else:
-            unknowns = None
+            vecs['u'] = self._filter_vector(unknowns, 'u', iteration_coordinate)
         if self.options['record_resids']:
-            resids = self._filter_vector(resids, 'r', iteration_coordinate)
-        else:
-            resids = None
-
-        if self._wrote_header is False:
-            header = ['success'] # add column for success flag
-            if params is not None:
-                header.extend(params)
-            if unknowns is not None:
-                header.extend(unknowns)
-            if resids is not None:
-                header.extend(resids)
-            if self.options['record_derivs']:
-                header.append('Derivatives')
-
-            self.ncol = len(header)
-            self.writer.writerow(header)
-            self._wrote_header = True
-
-        row = [metadata['success']] # add column for success flag
-
-        if params is not None:
-            row.extend(serialize(value) for value in itervalues(params))
-        if unknowns is not None:
-            row.extend(serialize(value) for value in itervalues(unknowns))
-        if resids is not None:
-            row.extend(serialize(value) for value in itervalues(resids))
-        if self.options['record_derivs']:
-            row.append(None)
+            vecs['r'] = self._filter_vector(resids, 'r', iteration_coordinate)
 
-        self.writer.writerow(row)
-
-        if self.out:
-            self.out.flush()
+        # all of the recorded values are formatted with one call
+        row = layout['row']
+        row[0] = metadata['success']
+        for key, name, start, end in layout['cols']:
+            val = vecs[key][name]
+            if end is None:
+                row[start] = _quote(serialize(val))
+                continue
+
+            val = numpy.ravel(val).tolist()
+            if len(val) != end - start:
+                raise ValueError("Variable '%s' has %d entries, but CsvRecorder "
+                                 "recorded %d at startup." % (name, len(val), end - start))
+            row[start:end] = val
+
+        self._lines.write(layout['fmt'] % tuple(row))
+        self._check_buffer()
+
+    def _write_header(self, header):
+        """ Writes the header row, which always comes before any buffered rows. """
+        self.writer.writerow(header)
+        self._wrote_header = True
+        self._flush_lines()
+
+    def _check_buffer(self):
+        """ Writes the buffered rows to the output once there are enough. """
+        if len(self._lines) >= self.options['buffer_rows']:
+            self._flush_lines()
+
+    def _flush_lines(self):
+        """ Writes any buffered rows to the output. """
+        if self._lines:
+            self._stream.write(''.join(self._lines))
+            del self._lines[:]
+
+            if self.out:
+                self.out.flush()
 
     def record_derivatives(self, derivs, metadata):
         """Writes the derivatives that were calculated for the driver.
@@ -169,6 +274,9 @@ class CsvRecorder(BaseRecorder):
 
         row.append(str([derivs]))
         self.writer.writerow(row)
+        self._check_buffer()
 
-        if self.out:
-            self.out.flush()
+    def close(self):
+        """Writes any buffered rows and closes `out`."""
+        self._flush_lines()
+        super(CsvRecorder, self).close()
@@ -132,6 +132,12 @@ class DumpRecorder(BaseRecorder):
 
         self._write_success_info(metadata)
 
+        if self.options['record_changes_only']:
+            previous = self._start_delta(iteration_coordinate,
+                                         format_iteration_coordinate(iteration_coordinate))
+            if previous is not None:
+                write("Changes since: {0:s}\n".format(previous))
+
         if self.options['record_params']:
             write("Params:\n")
             for param, val in sorted(iteritems(self._filter_vector(params,
@@ -104,5 +104,13 @@ class HDF5CaseReader(CaseReaderBase):
             _case_id = case_id
 
         with h5py.File(self.filename, 'r') as f:
-            case_dict = _group_to_dict(f[_case_id])
+
+            def get_case_dict(name):
+                grp = f[name]
+                case_dict = _group_to_dict(grp)
+                case_dict['previous_case'] = grp.attrs.get('previous_case', None)
+                return case_dict
+
+            case_dict = self._reconstruct_case_dict(get_case_dict(_case_id),
+                                                    get_case_dict)
             return Case(self.filename, _case_id, case_dict)
@@ -44,6 +44,12 @@ class HDF5Recorder(BaseRecorder):
         Patterns for variables to include in recording.
     options['excludes'] :  list of strings
         Patterns for variables to exclude in recording (processed after includes).
+    options['record_changes_only'] :  bool(False)
+        Tells recorder to only record variables whose values changed since the
+        last recorded iteration of the same system.
+    options['keyframe_interval'] :  int(10)
+        When recording changes only, record all variables every this many
+        iterations of the same system.
     """
 
     def __init__(self, out, **driver_kwargs):
@@ -129,6 +135,11 @@ class HDF5Recorder(BaseRecorder):
         group.attrs['success'] = metadata['success']
         group.attrs['msg'] = metadata['msg']
 
+        if self.options['record_changes_only']:
+            previous = self._start_delta(iteration_coordinate, group_name)
+            # attributes can't be None, so keyframes get an empty string
+            group.attrs['previous_case'] = previous or ''
+
         pairings = []
 
         if self.options['record_params']:
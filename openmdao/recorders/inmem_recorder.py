@@ -77,6 +77,10 @@ class InMemoryRecorder(BaseRecorder):
         data['success'] = metadata['success']
         data['msg'] = metadata['msg']
 
+        if self.options['record_changes_only']:
+            data['previous_case'] = self._start_delta(iteration_coordinate,
+                                                      data['iter'])
+
         if self.options['record_params']:
             data['params'] = {p:v for p,v in
                                  iteritems(self._filter_vector(params,'p',
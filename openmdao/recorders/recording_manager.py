@@ -5,10 +5,13 @@ import os
 import itertools
 import time
 import traceback
+from collections import OrderedDict
 
+import numpy as np
 from six import iteritems
 
 from openmdao.core.mpi_wrap import MPI, debug
+from openmdao.recorders.base_recorder import _FilteredVector
 
 trace = os.environ.get('OPENMDAO_TRACE')
 
@@ -26,6 +29,11 @@ class RecordingManager(object):
         self._has_serial_recorders = False
         self._casecomm = None  # comm used to gather parallel DOE cases
 
+        # layouts used to gather the recorded values under MPI as contiguous
+        # float arrays, keyed on 'p', 'u' and 'r'
+        self._gather_info = {}
+        self._case_size = 0
+
         if MPI:
             self.rank = MPI.COMM_WORLD.rank
         else:
@@ -64,6 +72,88 @@ class RecordingManager(object):
                 dct.update(d)
             return dct
 
+    def _gather_vec(self, root, vec, kind):
+        """Gathers the values of the recorded variables in `vec` from all
+        ranks of the `root` System. Returns a mapping of variable names to
+        values on rank 0 and None on all other ranks.
+        """
+        info = self._gather_info[kind]
+
+        sendbuf = info['sendbuf']
+        for name, start, end in info['local']:
+            sendbuf[start:end] = np.ravel(vec[name])
+
+        if trace:
+            debug("gathering flat vars for recording in %s" % root.pathname)
+        if root.comm.rank == 0:
+            recvbuf = np.empty(info['size'])
+            root.comm.Gatherv(sendbuf, [recvbuf, (info['counts'], info['displs']),
+                                        MPI.DOUBLE], root=0)
+        else:
+            recvbuf = None
+            root.comm.Gatherv(sendbuf, None, root=0)
+        if trace:
+            debug("DONE gathering flat vars for %s" % root.pathname)
+
+        objs = {}
+        if info['has_objs']:
+            objs = self._gather_vars(root, {n: vec[n] for n in info['objs']})
+
+        if recvbuf is not None:
+            return _FilteredVector(recvbuf, info['layout'], objs)
+
+    def _gather_cases(self, params, unknowns, resids, metadata):
+        """Gathers the cases run by each parallel DOE to rank 0 of
+        `_casecomm`. The values of all variables in a case are sent as one
+        contiguous float array and only the metadata and any pass by object
+        variables are pickled. Dummy cases have a metadata of None.
+        """
+        comm = self._casecomm
+        vecs = (('p', params, self._record_p),
+                ('u', unknowns, self._record_u),
+                ('r', resids, self._record_r))
+
+        sendbuf = np.zeros(self._case_size)
+        objs = []
+        if metadata is not None:
+            for kind, vec, record in vecs:
+                case_objs = {}
+                if record:
+                    for name, loc in iteritems(self._gather_info[kind]['case_layout']):
+                        if loc is None:
+                            case_objs[name] = vec[name]
+                        else:
+                            sendbuf[loc[0]:loc[1]] = np.ravel(vec[name])
+                objs.append(case_objs)
+
+        if trace: debug("gathering cases")
+        if comm.rank == 0:
+            recvbuf = np.empty(comm.size * self._case_size)
+            comm.Gather(sendbuf, recvbuf, root=0)
+        else:
+            comm.Gather(sendbuf, None, root=0)
+        all_meta = comm.gather((objs, metadata), root=0)
+        if trace: debug("done gathering cases")
+
+        cases = []
+        if comm.rank == 0:
+            for i, (case_objs, meta) in enumerate(all_meta):
+                if meta is None:  # dummy case
+                    continue
+                buf = recvbuf[i*self._case_size:(i+1)*self._case_size]
+                case = []
+                for (kind, _, record), vobjs in zip(vecs, case_objs):
+                    if record:
+                        case.append(_FilteredVector(buf,
+                                        self._gather_info[kind]['case_layout'],
+                                        vobjs))
+                    else:
+                        case.append({})
+                case.append(meta)
+                cases.append(tuple(case))
+
+        return cases
+
     def startup(self, root):
         """ Initialization during setup.
 
@@ -117,6 +207,78 @@ class RecordingManager(object):
             self._vars_to_record['unames'].update(unames)
             self._vars_to_record['rnames'].update(rnames)
 
+        if MPI and self._has_serial_recorders and root.is_active():
+            self._setup_gather(root)
+
+    def _setup_gather(self, root):
+        """Precomputes the offsets of each rank's recorded variables so that
+        their values can be gathered to rank 0 with a single `Gatherv` of a
+        contiguous float array. Only variables that are passed by object
+        still need to be pickled in order to be gathered.
+        """
+        self._gather_info = {}
+        self._case_size = 0
+
+        vecs = (('p', root.params, self._vars_to_record['pnames']),
+                ('u', root.unknowns, self._vars_to_record['unames']),
+                ('r', root.resids, self._vars_to_record['rnames']))
+
+        for kind, vec, names in vecs:
+            flat = []
+            objs = []
+            for name in sorted(names):
+                # the float buffers would change the type of anything else,
+                # so it's pickled along with the pass by object variables
+                acc = vec._dat[name]
+                if acc.pbo or np.asarray(acc.val).dtype != np.float64:
+                    objs.append(name)
+                else:
+                    meta = vec.metadata(name)
+                    flat.append((name, meta['size'], meta['shape']))
+
+            # only the variable names and sizes are exchanged here, once.
+            all_vars = root.comm.allgather((flat, objs))
+
+            layout = OrderedDict()
+            counts = []
+            start = 0
+            for rank_flat, rank_objs in all_vars:
+                count = 0
+                for name, size, shape in rank_flat:
+                    layout[name] = (start, start + size, shape)
+                    count += size
+                for name in rank_objs:
+                    layout[name] = None
+                counts.append(count)
+                start += count
+
+            local = [(name, layout[name][0] - sum(counts[:root.comm.rank]),
+                      layout[name][1] - sum(counts[:root.comm.rank]))
+                     for name, _, _ in flat]
+
+            # parallel DOE cases are gathered with the variables in name
+            # order, which is the same for every case.
+            case_layout = OrderedDict()
+            for name in sorted(n for n, loc in iteritems(layout) if loc is not None):
+                vstart, vend, shape = layout[name]
+                case_layout[name] = (self._case_size,
+                                     self._case_size + vend - vstart, shape)
+                self._case_size += vend - vstart
+            for name in sorted(n for n, loc in iteritems(layout) if loc is None):
+                case_layout[name] = None
+
+            self._gather_info[kind] = {
+                'local': local,
+                'objs': objs,
+                'has_objs': any(rank_objs for _, rank_objs in all_vars),
+                'sendbuf': np.zeros(sum(size for _, size, _ in flat)),
+                'counts': np.array(counts, dtype=int),
+                'displs': np.cumsum([0] + counts[:-1]).astype(int),
+                'size': start,
+                'layout': layout,
+                'case_layout': case_layout,
+            }
+
     def close(self):
         """ Close all recorders. """
         for recorder in self._recorders:
@@ -189,35 +351,29 @@ class RecordingManager(object):
 
         if MPI:
             if dummy and self._casecomm is not None:
-                case = (None, None, None, None)
                 if trace: debug("DUMMY gathering cases")
-                cases = self._casecomm.gather(case, root=0)
+                self._gather_cases({}, {}, {}, None)
                 if trace: debug("DUMMY done gathering cases:")
                 return
 
-            pnames = self._vars_to_record['pnames']
-            unames = self._vars_to_record['unames']
-            rnames = self._vars_to_record['rnames']
-
-            # get names and values of all locally owned variables
-            params = {p: params[p] for p in pnames}
-            unknowns = {u: unknowns[u] for u in unames}
-            resids = {r: resids[r] for r in rnames}
-
             if self._has_serial_recorders:
-                params = self._gather_vars(root, params) if self._record_p else {}
-                unknowns = self._gather_vars(root, unknowns) if self._record_u else {}
-                resids = self._gather_vars(root, resids) if self._record_r else {}
+                params = self._gather_vec(root, params, 'p') if self._record_p else {}
+                unknowns = self._gather_vec(root, unknowns, 'u') if self._record_u else {}
+                resids = self._gather_vec(root, resids, 'r') if self._record_r else {}
 
                 if self._casecomm is not None:
                     # our parent driver is running a parallel DOE, so we need to
                     # gather all of the cases to this rank and loop over them
-                    case = (params, unknowns, resids, metadata)
-                    if trace: debug("gathering cases")
-                    cases = self._casecomm.gather(case, root=0)
-                    if trace: debug("done gathering cases")
-                    if cases is None:
-                        cases = []
+                    cases = self._gather_cases(params, unknowns, resids, metadata)
+            else:
+                pnames = self._vars_to_record['pnames']
+                unames = self._vars_to_record['unames']
+                rnames = self._vars_to_record['rnames']
+
+                # get names and values of all locally owned variables
+                params = {p: params[p] for p in pnames}
+                unknowns = {u: unknowns[u] for u in unames}
+                resids = {r: resids[r] for r in rnames}
 
         if cases is None:
             cases = [(params, unknowns, resids, metadata)]
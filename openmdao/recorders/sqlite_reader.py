@@ -80,7 +80,9 @@ class SqliteCaseReader(CaseReaderBase):
 
         # Initialize the Case object from the iterations data
         with SqliteDict(self.filename, 'iterations', flag='r') as iter_db:
-            case = Case(self.filename, _case_id, iter_db[_case_id])
+            case_dict = self._reconstruct_case_dict(iter_db[_case_id],
+                                                    iter_db.__getitem__)
+            case = Case(self.filename, _case_id, case_dict)
 
         # Set the derivs data for the case if available
         with SqliteDict(self.filename, 'derivs', flag='r') as derivs_db:
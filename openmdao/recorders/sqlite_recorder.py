@@ -36,6 +36,12 @@ class SqliteRecorder(BaseRecorder):
         Patterns for variables to include in recording.
     options['excludes'] :  list of strings
         Patterns for variables to exclude in recording (processed after includes).
+    options['record_changes_only'] :  bool(False)
+        Tells recorder to only record variables whose values changed since the
+        last recorded iteration of the same system.
+    options['keyframe_interval'] :  int(10)
+        When recording changes only, record all variables every this many
+        iterations of the same system.
     """
 
     def __init__(self, out, **sqlite_dict_args):
@@ -124,14 +130,21 @@ class SqliteRecorder(BaseRecorder):
         data['success'] = metadata['success']
         data['msg'] = metadata['msg']
 
+        if self.options['record_changes_only']:
+            data['previous_case'] = self._start_delta(iteration_coordinate,
+                                                      group_name)
+
         if self.options['record_params']:
-            data['Parameters'] = self._filter_vector(params, 'p', iteration_coordinate)
+            data['Parameters'] = dict(self._filter_vector(params, 'p',
+                                                          iteration_coordinate))
 
         if self.options['record_unknowns']:
-            data['Unknowns'] = self._filter_vector(unknowns, 'u', iteration_coordinate)
+            data['Unknowns'] = dict(self._filter_vector(unknowns, 'u',
+                                                        iteration_coordinate))
 
         if self.options['record_resids']:
-            data['Residuals'] = self._filter_vector(resids, 'r', iteration_coordinate)
+            data['Residuals'] = dict(self._filter_vector(resids, 'r',
+                                                         iteration_coordinate))
 
         self.out_iterations[group_name] = data
 
@@ -0,0 +1,202 @@
+""" Unit tests for the ColumnarRecorder and ColumnarCaseReader. """
+from __future__ import print_function
+
+import errno
+import os
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+
+from openmdao.api import Problem, ScipyOptimizer, Group, IndepVarComp, \
+    CaseReader, FullFactorialDriver, SqliteRecorder, ColumnarRecorder
+from openmdao.recorders.columnar_reader import ColumnarCaseReader
+from openmdao.examples.paraboloid_example import Paraboloid
+from openmdao.test.sellar import SellarDerivativesGrouped
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+class TestColumnarCaseReader(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.original_path = os.getcwd()
+        os.chdir(self.dir)
+
+    def tearDown(self):
+        os.chdir(self.original_path)
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def _run_doe(self, row_group_size):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('xy', np.zeros((2,))))
+        root.add('p', Paraboloid())
+
+        root.connect('p1.xy', 'p.x', src_indices=[0])
+        root.connect('p1.xy', 'p.y', src_indices=[1])
+
+        prob.driver = FullFactorialDriver(num_levels=4)
+        prob.driver.add_desvar('p1.xy', lower=-5.0, upper=5.0)
+        prob.driver.add_objective('p.f_xy')
+
+        sqlite = SqliteRecorder('cases.db')
+        columnar = ColumnarRecorder('cases.col')
+        columnar.options['row_group_size'] = row_group_size
+        for recorder in (sqlite, columnar):
+            recorder.options['record_params'] = True
+            recorder.options['record_resids'] = True
+            prob.driver.add_recorder(recorder)
+
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+
+    def test_reader_instantiates(self):
+        self._run_doe(row_group_size=5)
+
+        cr = CaseReader('cases.col')
+        self.assertTrue(isinstance(cr, ColumnarCaseReader),
+                        msg='CaseReader not returning the correct subclass.')
+        self.assertEqual(cr.format_version, 1)
+        self.assertEqual(cr.num_cases, 16)
+        self.assertTrue('p1.xy' in cr._unknowns)
+
+    def assertCasesMatchSqlite(self, filename, expected_filename):
+        expected_cr = CaseReader(expected_filename)
+        cr = CaseReader(filename)
+
+        self.assertEqual(cr.list_cases(), expected_cr.list_cases())
+
+        for case_id in cr.list_cases():
+            expected = expected_cr.get_case(case_id)
+            actual = cr.get_case(case_id)
+
+            self.assertEqual(actual.success, expected.success)
+            self.assertAlmostEqual(actual.timestamp, expected.timestamp)
+            for vec in ('parameters', 'unknowns', 'resids'):
+                exp_vec = getattr(expected, vec)
+                act_vec = getattr(actual, vec)
+                if exp_vec is None:
+                    self.assertIsNone(act_vec)
+                    continue
+                self.assertEqual(set(exp_vec), set(act_vec))
+                for name in exp_vec:
+                    self.assertEqual(np.shape(act_vec[name]),
+                                     np.shape(exp_vec[name]))
+                    np.testing.assert_almost_equal(act_vec[name], exp_vec[name])
+
+    def test_cases_match_sqlite(self):
+        self._run_doe(row_group_size=5)
+        self.assertCasesMatchSqlite('cases.col', 'cases.db')
+
+    def test_multilevel_record(self):
+        for solver_first in (True, False):
+            prob = Problem()
+            prob.root = SellarDerivativesGrouped()
+
+            prob.driver = ScipyOptimizer()
+            prob.driver.options['optimizer'] = 'SLSQP'
+            prob.driver.options['disp'] = False
+            prob.driver.add_desvar('z', lower=np.array([-10.0, 0.0]),
+                                   upper=np.array([10.0, 10.0]))
+            prob.driver.add_desvar('x', lower=0.0, upper=10.0)
+            prob.driver.add_objective('obj')
+            prob.driver.add_constraint('con1', upper=0.0)
+            prob.driver.add_constraint('con2', upper=0.0)
+
+            sqlite = SqliteRecorder('sellar.db')
+            columnar = ColumnarRecorder('sellar.col')
+            columnar.options['row_group_size'] = 4
+            for recorder in (sqlite, columnar):
+                recorder.options['record_params'] = True
+                if solver_first:
+                    prob.root.mda.nl_solver.add_recorder(recorder)
+                    prob.driver.add_recorder(recorder)
+                else:
+                    prob.driver.add_recorder(recorder)
+                    prob.root.mda.nl_solver.add_recorder(recorder)
+
+            prob.setup(check=False)
+            prob.run()
+            prob.cleanup()
+
+            self.assertCasesMatchSqlite('sellar.col', 'sellar.db')
+
+            # each system records its own variables
+            cr = CaseReader('sellar.col')
+            driver_case = cr.get_case('rank0:SLSQP|1')
+            self.assertEqual(set(driver_case.unknowns),
+                             set(['x', 'z', 'y1', 'y2', 'obj', 'con1', 'con2']))
+
+            obj = cr.get_column('obj')
+            self.assertEqual(len(obj), len([c for c in cr.list_cases()
+                                            if c.count('|') == 1]))
+            self.assertAlmostEqual(obj[-1], prob['obj'])
+
+    def test_get_column(self):
+        self._run_doe(row_group_size=3)
+
+        cr = CaseReader('cases.col')
+        xy = cr.get_column('p1.xy')
+        f_xy = cr.get_column('p.f_xy')
+        px = cr.get_column('p.x', vector='Parameters')
+
+        self.assertEqual(xy.shape, (16, 2))
+        self.assertEqual(f_xy.shape, (16,))
+
+        x, y = xy[:, 0], xy[:, 1]
+        np.testing.assert_almost_equal(f_xy, (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0)
+        np.testing.assert_almost_equal(px, x)
+
+        with self.assertRaises(KeyError):
+            cr.get_column('p.f_xy', vector='Parameters')
+
+    def test_derivs(self):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('xy', np.zeros((2,))))
+        root.add('p', Paraboloid())
+
+        root.connect('p1.xy', 'p.x', src_indices=[0])
+        root.connect('p1.xy', 'p.y', src_indices=[1])
+
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['disp'] = False
+        prob.driver.add_desvar('p1.xy', lower=-10.0, upper=10.0)
+        prob.driver.add_objective('p.f_xy')
+        prob.driver.add_recorder(ColumnarRecorder('opt.col'))
+
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+
+        cr = CaseReader('opt.col')
+        last_case = cr.get_case(-1)
+        np.testing.assert_almost_equal(last_case['p1.xy'], prob['p1.xy'])
+        self.assertTrue(cr.get_case(0).derivs is not None)
+
+    @unittest.skipIf(pandas is None, 'pandas not available.')
+    def test_to_dataframe(self):
+        self._run_doe(row_group_size=5)
+
+        df = CaseReader('cases.col').to_dataframe()
+        self.assertEqual(df.shape, (16, 2))
+        np.testing.assert_almost_equal(df['p.f_xy'].values,
+                                       CaseReader('cases.col').get_column('p.f_xy'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,7 @@ import numpy as np
 from numpy import array
 
 from openmdao.api import Problem, Group, ScipyOptimizer, IndepVarComp, \
-                         FullFactorialDriver
+                         FullFactorialDriver, ExecComp
 from openmdao.recorders.csv_recorder import CsvRecorder
 from openmdao.test.converge_diverge import ConvergeDiverge
 from openmdao.test.example_groups import ExampleGroup
@@ -581,6 +581,109 @@ class TestCsvRecorder(unittest.TestCase):
 
         self.assertEqual(fails, [3,4])
 
+    def test_array_columns(self):
+        problem = Problem()
+        root = problem.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=np.zeros(3)))
+        root.add('mult', ExecComp("y=2.0*x", x=np.zeros(3), y=np.zeros(3)))
+        root.connect('indep_var.x', 'mult.x')
+
+        problem.driver = FullFactorialDriver(num_levels=2)
+        problem.driver.add_desvar('indep_var.x', lower=1.0, upper=2.0)
+        problem.driver.add_objective('mult.y')
+
+        problem.driver.add_recorder(self.recorder)
+        self.recorder.options['record_derivs'] = False
+        self.recorder.options['buffer_rows'] = 3
+
+        problem.setup(check=False)
+        problem.run()
+
+        # only the header and the first 6 buffered rows have been written
+        self.assertEqual(len(self.io.getvalue().splitlines()), 7)
+
+        problem.cleanup()
+
+        self.io.seek(0)
+        rows = list(csv.DictReader(self.io))
+
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(sorted(rows[0].keys()),
+                         ['indep_var.x[0]', 'indep_var.x[1]', 'indep_var.x[2]',
+                          'mult.y[0]', 'mult.y[1]', 'mult.y[2]', 'success'])
+
+        for row in rows:
+            self.assertEqual(row['success'], '1')
+            for i in range(3):
+                x = float(row['indep_var.x[%d]' % i])
+                self.assertTrue(x in (1.0, 2.0))
+                self.assertEqual(float(row['mult.y[%d]' % i]), 2.0*x)
+
+    def test_column_formats(self):
+        problem = Problem()
+        root = problem.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=np.zeros(2)))
+        root.add('count', IndepVarComp('n', val=3))
+        root.add('label', IndepVarComp('name', val='a, "b"', pass_by_obj=True))
+        root.add('mult', ExecComp("y=2.0*x", x=np.zeros(2), y=np.zeros(2)))
+        root.connect('indep_var.x', 'mult.x')
+
+        problem.driver.add_recorder(self.recorder)
+        self.recorder.options['record_derivs'] = False
+
+        problem.setup(check=False)
+        problem['indep_var.x'] = np.array([1.5, 0.1])
+        problem.run()
+        problem.cleanup()
+
+        # arrays are expanded even if a variable is serialized, and each
+        # column is formatted for the dtype of its variable
+        lines = self.io.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+
+        expected = OrderedDict([
+            ('success', '1'),
+            ('count.n', '3'),
+            ('indep_var.x[0]', '1.5'),
+            ('indep_var.x[1]', '0.1'),
+            ('label.name', '"a, ""b"""'),
+            ('mult.y[0]', '3.0'),
+            ('mult.y[1]', '0.2'),
+        ])
+        header = lines[0].split(',')
+        self.assertEqual(sorted(header), sorted(expected))
+        self.assertEqual(lines[1], ','.join(expected[name] for name in header))
+
+    def test_buffered_rows_in_order(self):
+        # the driver and the solver of a subgroup record different variables
+        def run(buffer_rows):
+            problem = Problem()
+            root = problem.root = Group()
+            root.add('indep_var', IndepVarComp('x', val=1.0))
+            root.add('label', IndepVarComp('name', val='case', pass_by_obj=True))
+            sub = root.add('sub', Group())
+            sub.add('mult', ExecComp("y=2.0*x"))
+            root.connect('indep_var.x', 'sub.mult.x')
+
+            problem.driver = FullFactorialDriver(num_levels=5)
+            problem.driver.add_desvar('indep_var.x', lower=1.0, upper=5.0)
+            problem.driver.add_objective('sub.mult.y')
+
+            io = StringIO()
+            recorder = CsvRecorder(io)
+            recorder.options['buffer_rows'] = buffer_rows
+            problem.driver.add_recorder(recorder)
+            sub.nl_solver.add_recorder(recorder)
+
+            problem.setup(check=False)
+            problem.run()
+            problem.cleanup()
+            return io.getvalue()
+
+        unbuffered = run(1)
+        self.assertEqual(len(unbuffered.splitlines()), 11)
+        self.assertEqual(run(4), unbuffered)
+
 
 if __name__ == "__main__":
     unittest.main()
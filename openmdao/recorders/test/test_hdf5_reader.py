@@ -10,7 +10,7 @@ from tempfile import mkdtemp
 import numpy as np
 
 from openmdao.api import Problem, ScipyOptimizer, Group, \
-    IndepVarComp, CaseReader
+    IndepVarComp, CaseReader, FullFactorialDriver
 from openmdao.examples.paraboloid_example import Paraboloid
 
 try:
@@ -262,5 +262,64 @@ class TestHDF5CaseReaderPyOptSparse(TestHDF5CaseReader):
                          record_unknowns=True, optimizer='pyoptsparse')
 
 
+@unittest.skipIf(NO_HDF5, 'HDF5Reader tests skipped.  HDF5 not available.')
+class TestHDF5CaseReaderChangesOnly(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.original_path = os.getcwd()
+        os.chdir(self.dir)
+
+    def tearDown(self):
+        os.chdir(self.original_path)
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def test_reconstructed_cases(self):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', 0.0))
+        root.add('p2', IndepVarComp('y', 3.0))
+        root.add('p', Paraboloid())
+
+        root.connect('p1.x', 'p.x')
+        root.connect('p2.y', 'p.y')
+
+        prob.driver = FullFactorialDriver(num_levels=7)
+        prob.driver.add_desvar('p1.x', lower=-5.0, upper=5.0)
+        prob.driver.add_objective('p.f_xy')
+
+        full = HDF5Recorder('full.hdf5')
+        delta = HDF5Recorder('delta.hdf5')
+        delta.options['record_changes_only'] = True
+        delta.options['keyframe_interval'] = 3
+        for recorder in (full, delta):
+            recorder.options['record_params'] = True
+            prob.driver.add_recorder(recorder)
+
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+
+        full_cr = CaseReader('full.hdf5')
+        delta_cr = CaseReader('delta.hdf5')
+        self.assertEqual(full_cr.num_cases, delta_cr.num_cases)
+
+        for case_id in full_cr.list_cases():
+            expected = full_cr.get_case(case_id)
+            actual = delta_cr.get_case(case_id)
+            for vec in ('parameters', 'unknowns'):
+                exp_vec = getattr(expected, vec)
+                act_vec = getattr(actual, vec)
+                self.assertEqual(set(exp_vec), set(act_vec))
+                for name in exp_vec:
+                    np.testing.assert_almost_equal(act_vec[name], exp_vec[name])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -121,5 +121,43 @@ class TestInMemoryRecorder(unittest.TestCase):
         assert_rel_error(self, J1[2][1], 1.0775421, .00001)
         assert_rel_error(self, J1[2][2], 0.09692762, .00001)
 
+    def test_recorded_values_are_copies(self):
+        prob = Problem()
+        prob.root = SellarDerivativesGrouped()
+
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['tol'] = 1.0e-8
+        prob.driver.options['disp'] = False
+
+        prob.driver.add_desvar('z', lower=np.array([-10.0, 0.0]),
+                             upper=np.array([10.0, 10.0]))
+        prob.driver.add_desvar('x', lower=0.0, upper=10.0)
+
+        prob.driver.add_objective('obj')
+        prob.driver.add_constraint('con1', upper=0.0)
+        prob.driver.add_constraint('con2', upper=0.0)
+
+        prob.driver.add_recorder(self.recorder)
+        self.recorder.options['record_params'] = True
+        self.recorder.options['includes'] = ['z', 'x', 'obj', 'mda.d1.*']
+        self.recorder.options['excludes'] = ['mda.d1.x']
+        prob.setup(check=False)
+
+        prob.run()
+
+        prob.cleanup()
+
+        first = self.recorder.iters[0]
+        last = self.recorder.iters[-1]
+
+        self.assertEqual(set(first['unknowns']), set(['z', 'x', 'obj']))
+        self.assertEqual(set(first['params']), set(['mda.d1.z']))
+
+        assert_rel_error(self, first['unknowns']['z'], np.array([5.0, 2.0]), 1e-6)
+        assert_rel_error(self, last['unknowns']['z'], prob['z'], 1e-6)
+        assert_rel_error(self, last['unknowns']['obj'], prob['obj'], 1e-6)
+        assert_rel_error(self, last['params']['mda.d1.z'], prob['z'], 1e-6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -12,7 +12,7 @@ import numpy as np
 from sqlitedict import SqliteDict
 
 from openmdao.api import Problem, ScipyOptimizer, Group, \
-    IndepVarComp, CaseReader
+    IndepVarComp, CaseReader, FullFactorialDriver
 from openmdao.recorders.sqlite_recorder import SqliteRecorder, format_version
 from openmdao.recorders.sqlite_reader import SqliteCaseReader
 from openmdao.recorders.case import Case
@@ -237,5 +237,71 @@ class TestSqliteCaseReaderPyOptSparse(TestSqliteCaseReader):
                          record_unknowns=True, optimizer='pyoptsparse')
 
 
+class TestSqliteCaseReaderChangesOnly(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.original_path = os.getcwd()
+        os.chdir(self.dir)
+
+    def tearDown(self):
+        os.chdir(self.original_path)
+        try:
+            rmtree(self.dir)
+        except OSError as e:
+            # If directory already deleted, keep going
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.EPERM):
+                raise e
+
+    def test_reconstructed_cases(self):
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', 0.0))
+        root.add('p2', IndepVarComp('y', 3.0))
+        root.add('p', Paraboloid())
+
+        root.connect('p1.x', 'p.x')
+        root.connect('p2.y', 'p.y')
+
+        prob.driver = FullFactorialDriver(num_levels=7)
+        prob.driver.add_desvar('p1.x', lower=-5.0, upper=5.0)
+        prob.driver.add_objective('p.f_xy')
+
+        full = SqliteRecorder('full.db')
+        delta = SqliteRecorder('delta.db')
+        delta.options['record_changes_only'] = True
+        delta.options['keyframe_interval'] = 3
+        for recorder in (full, delta):
+            recorder.options['record_params'] = True
+            recorder.options['record_resids'] = True
+            prob.driver.add_recorder(recorder)
+
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+
+        # the fixed input is only stored in the keyframes
+        with SqliteDict('delta.db', 'iterations', flag='r') as db:
+            stored = [k for k, v in db.items() if 'p2.y' in v['Unknowns']]
+            keyframes = [k for k, v in db.items() if v['previous_case'] is None]
+        self.assertEqual(stored, keyframes)
+        self.assertEqual(len(keyframes), 3)
+
+        full_cr = CaseReader('full.db')
+        delta_cr = CaseReader('delta.db')
+        self.assertEqual(full_cr.list_cases(), delta_cr.list_cases())
+
+        for i in range(full_cr.num_cases):
+            expected = full_cr.get_case(i)
+            actual = delta_cr.get_case(i)
+            for vec in ('parameters', 'unknowns', 'resids'):
+                exp_vec = getattr(expected, vec)
+                act_vec = getattr(actual, vec)
+                self.assertEqual(set(exp_vec), set(act_vec))
+                for name in exp_vec:
+                    np.testing.assert_almost_equal(act_vec[name], exp_vec[name])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,12 @@
 """ Surrogate model based on Kriging. """
 
+import multiprocessing
+from functools import partial
+
 import numpy as np
 import scipy.linalg as linalg
 from scipy.optimize import minimize
+from scipy.spatial.distance import pdist, squareform
 from six.moves import zip, range
 
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
@@ -10,6 +14,72 @@ from openmdao.surrogate_models.surrogate_model import SurrogateModel
 MACHINE_EPSILON = np.finfo(np.double).eps
 
 
+def _latin_hypercube_starts(num_starts, lower, upper, rng):
+    """
+    Returns starting points for a multi-start optimization that form a Latin
+    hypercube between the given bounds, one per row.
+
+    Args
+    ----
+    num_starts : int
+        Number of starting points.
+
+    lower : ndarray
+        Lower bound of each dimension.
+
+    upper : ndarray
+        Upper bound of each dimension.
+
+    rng : RandomState
+        Random number generator.
+
+    Returns
+    -------
+    ndarray
+        Starting points, one per row.
+    """
+    ndim = len(lower)
+    u = np.empty((num_starts, ndim))
+    for j in range(ndim):
+        u[:, j] = rng.permutation(num_starts) + rng.uniform(size=num_starts)
+    u /= num_starts
+    return lower + u * (upper - lower)
+
+
+def _max_likelihood(surrogate, x0):
+    """
+    Maximizes the reduced likelihood of a `KrigingSurrogate` from one
+    starting point. This is a function so that it can be run in a process
+    pool.
+
+    Args
+    ----
+    surrogate : `KrigingSurrogate`
+        Surrogate with its training data set.
+
+    x0 : ndarray
+        Starting natural logarithms of the thetas.
+
+    Returns
+    -------
+    OptimizeResult
+        Result of the optimization, in the natural logarithms of the thetas.
+    """
+
+    def _calcll(log_thetas):
+        """ Callback function"""
+        thetas = np.exp(log_thetas)
+        loglike, params = surrogate._calculate_reduced_likelihood_params(thetas,
+                                                                         calc_grad=True)
+
+        # chain rule for the log of thetas
+        return -loglike, -params['grad'] * thetas
+
+    bounds = [(np.log(1e-5), np.log(1e5)) for _ in range(surrogate.n_dims)]
+
+    return minimize(_calcll, x0, method='slsqp', jac=True, bounds=bounds)
+
+
 class KrigingSurrogate(SurrogateModel):
     """Surrogate Modeling method based on the simple Kriging interpolation.
     Predictions are returned as a tuple of mean and RMSE. Based on Gaussian Processes
@@ -24,9 +94,33 @@ class KrigingSurrogate(SurrogateModel):
     eval_rmse : bool
         Flag indicating whether the Root Mean Squared Error (RMSE) should be computed. Set to False
         by default.
+    num_starts : int, optional
+        Number of starting points of the hyperparameter optimization. The first one is the default
+        (or the previous thetas, with warm_start), and the others form a Latin hypercube over the
+        bounds of the thetas. The best result is kept. Default: 1
+    pool_size : int, optional
+        Number of processes that run the optimizations from different starting points. Default: 1,
+        which runs them in this process.
+    warm_start : bool, optional
+        If True, the hyperparameter optimization starts from the thetas of the last training, e.g.,
+        when a `MetaModel` with warm_restart retrains after new points are added. Default: False
+    seed : int or None, optional
+        Seed for the random starting points. Default: None
+    retrain_interval : int, optional
+        Number of calls to `update` after which the model is retrained from scratch, including the
+        hyperparameter optimization. 0 means never. Default: 10
     """
 
-    def __init__(self, nugget=10. * MACHINE_EPSILON, eval_rmse=False):
+    supports_update = True
+
+    _state_attrs = ('n_dims', 'n_samples', 'thetas', 'alpha', 'L', 'U', 'S_inv', 'Vh', 'sigma2',
+                    'X', 'Y', 'X_mean', 'X_std', 'Y_mean', 'Y_std')
+
+    _option_attrs = ('nugget', 'eval_rmse', 'num_starts', 'warm_start', 'seed',
+                     'retrain_interval')
+
+    def __init__(self, nugget=10. * MACHINE_EPSILON, eval_rmse=False, num_starts=1,
+                 pool_size=1, warm_start=False, seed=None, retrain_interval=10):
         super(KrigingSurrogate, self).__init__()
 
         self.n_dims = 0       # number of independent
@@ -38,6 +132,10 @@ class KrigingSurrogate(SurrogateModel):
         self.L = np.zeros(0)
         self.sigma2 = np.zeros(0)
 
+        # Squared distances between training points in each dimension, one
+        # row per pair in condensed (upper triangle) order.
+        self._sq_dists = np.zeros(0)
+
         # Normalized Training Values
         self.X = np.zeros(0)
         self.Y = np.zeros(0)
@@ -48,6 +146,18 @@ class KrigingSurrogate(SurrogateModel):
 
         self.eval_rmse = eval_rmse
 
+        self.num_starts = num_starts
+        self.pool_size = pool_size
+        self.warm_start = warm_start
+        self.seed = seed
+
+        self.retrain_interval = retrain_interval
+        self._num_updates = 0
+
+        # Maximum number of elements of the array of differences between
+        # prediction and training points that is formed at once.
+        self.max_chunk_size = 2 ** 20
+
     def train(self, x, y):
         """
         Train the surrogate model with the given set of inputs and outputs.
@@ -89,71 +199,241 @@ class KrigingSurrogate(SurrogateModel):
         self.X_mean, self.X_std = X_mean, X_std
         self.Y_mean, self.Y_std = Y_mean, Y_std
 
-        def _calcll(thetas):
-            """ Callback function"""
-            loglike = self._calculate_reduced_likelihood_params(np.exp(thetas))[0]
-            return -loglike
+        # The distances don't depend on the hyperparameters, so they are
+        # only calculated once.
+        self._sq_dists = self._calculate_sq_dists()
+        self._num_updates = 0
+
+        # Starting points, in the natural logarithm of the thetas
+        x0 = 1e-1*np.ones(self.n_dims)
+        if self.warm_start and self.thetas.size == self.n_dims:
+            x0 = np.log(self.thetas)
+        starts = [x0]
+        if self.num_starts > 1:
+            rng = np.random.RandomState(self.seed)
+            lower = np.log(1e-5) * np.ones(self.n_dims)
+            upper = np.log(1e5) * np.ones(self.n_dims)
+            starts.extend(_latin_hypercube_starts(self.num_starts - 1, lower, upper, rng))
+
+        if self.pool_size > 1 and len(starts) > 1:
+            pool = multiprocessing.Pool(min(self.pool_size, len(starts)))
+            try:
+                results = pool.map(partial(_max_likelihood, self), starts)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_max_likelihood(self, start) for start in starts]
+
+        successes = [result for result in results if result.success]
+        if not successes:
+            raise ValueError('Kriging Hyper-parameter optimization failed: {0}'.format(results[0].message))
+
+        optResult = min(successes, key=lambda result: result.fun)
 
-        bounds = [(np.log(1e-5), np.log(1e5)) for _ in range(self.n_dims)]
+        self.thetas = np.exp(optResult.x)
+        _, params = self._calculate_reduced_likelihood_params()
+        self._set_params(params)
 
-        optResult = minimize(_calcll, 1e-1*np.ones(self.n_dims), method='slsqp',
-                             options={'eps': 1e-3},
-                             bounds=bounds)
+    def update(self, x, y, nugget=None):
+        """
+        Adds training points to the trained model without a new hyperparameter optimization.
+        The Cholesky factor of the correlation matrix is extended by the rows of the new points,
+        which costs O(n^2) instead of O(n^3). The points are normalized like the original
+        training data. Every `retrain_interval` calls, the model is retrained from scratch.
+
+        Args
+        ----
+        x : array-like
+            New training input locations
 
-        if not optResult.success:
-            raise ValueError('Kriging Hyper-parameter optimization failed: {0}'.format(optResult.message))
+        y : array-like
+            Model responses at the new inputs.
 
-        self.thetas = np.exp(optResult.x)
-        _, params = self._calculate_reduced_likelihood_params()
+        nugget : double or ndarray, optional
+            Nugget of the new points, which is appended to the nugget of the training points.
+            It is required if the nugget is an ndarray. Defaults to the nugget of the model
+            if that is a double.
+        """
+        x, y = np.atleast_2d(x, y)
+        n_new = x.shape[0]
+
+        if nugget is None and isinstance(self.nugget, np.ndarray):
+            raise ValueError('KrigingSurrogate has a nugget for each training point, '
+                             'so update needs the nugget of the new points.')
+
+        if nugget is not None:
+            nugget = np.broadcast_to(nugget, (n_new,))
+            self.nugget = np.hstack((np.broadcast_to(self.nugget, (self.n_samples,)), nugget))
+            new_nugget = nugget
+        else:
+            new_nugget = self.nugget
+
+        self._num_updates += 1
+
+        if (self.retrain_interval and self._num_updates >= self.retrain_interval) or \
+           self.L is None:
+            self.train(np.vstack((self.X * self.X_std + self.X_mean, x)),
+                       np.vstack((self.Y * self.Y_std + self.Y_mean, y)))
+            return
+
+        X_new = (x - self.X_mean) / self.X_std
+        Y_new = (y - self.Y_mean) / self.Y_std
+
+        # Correlations with the old points and among the new ones
+        r = np.exp(-np.square(self.X[:, np.newaxis, :] - X_new).dot(self.thetas))
+        R_new = np.exp(-np.square(X_new[:, np.newaxis, :] - X_new).dot(self.thetas))
+        R_new[np.diag_indices_from(R_new)] = 1. + new_nugget
+
+        self.X = np.vstack((self.X, X_new))
+        self.Y = np.vstack((self.Y, Y_new))
+        self.n_samples += n_new
+        self._sq_dists = None
+
+        # [L 0; L21 L22] is the factor of [R r; r^T R_new]
+        L21 = linalg.solve_triangular(self.L, r, lower=True).T
+        try:
+            L22 = linalg.cholesky(R_new - L21.dot(L21.T), lower=True)
+        except linalg.LinAlgError:
+            L22 = None
+
+        if L22 is None or np.min(np.diag(L22)) <= 1e-6 * np.max(np.diag(self.L)):
+            # the new points are too close to the old ones for the update,
+            # so refactor the whole matrix
+            _, params = self._calculate_reduced_likelihood_params()
+            self._set_params(params)
+            return
+
+        n_old = self.L.shape[0]
+        L = np.zeros((self.n_samples, self.n_samples))
+        L[:n_old, :n_old] = self.L
+        L[n_old:, :n_old] = L21
+        L[n_old:, n_old:] = L22
+
+        alpha = linalg.cho_solve((L, True), self.Y)
+        sigma2 = np.dot(self.Y.T, alpha).sum(axis=0) / self.n_samples
+
+        self._set_params({'alpha': alpha, 'L': L,
+                          'sigma2': sigma2 * np.square(self.Y_std)})
+
+    def set_state(self, state):
+        """
+        Restores the trained model from a dict of arrays returned by get_state.
+
+        Args
+        ----
+        state : dict
+            Arrays that hold the trained model.
+        """
+        super(KrigingSurrogate, self).set_state(state)
+        self._sq_dists = None
+        self._num_updates = 0
+
+    def _set_params(self, params):
+        """
+        Sets the model parameters calculated by `_calculate_reduced_likelihood_params`.
+        """
         self.alpha = params['alpha']
-        self.U = params['U']
-        self.S_inv = params['S_inv']
-        self.Vh = params['Vh']
+        self.L = params.get('L')
+        self.U = params.get('U')
+        self.S_inv = params.get('S_inv')
+        self.Vh = params.get('Vh')
         self.sigma2 = params['sigma2']
 
-    def _calculate_reduced_likelihood_params(self, thetas=None):
+    def _calculate_sq_dists(self):
+        """
+        Returns the squared distances between the training points in each dimension.
+        """
+        sq_dists = np.empty((self.n_samples * (self.n_samples - 1) // 2, self.n_dims))
+        for i in range(self.n_dims):
+            sq_dists[:, i] = pdist(self.X[:, i:i+1], 'sqeuclidean')
+        return sq_dists
+
+    def _calculate_reduced_likelihood_params(self, thetas=None, calc_grad=False):
         """
         Calculates a quantity with the same maximum location as the log-likelihood for a given theta.
 
+        The correlation matrix is factored with a Cholesky decomposition. If it
+        isn't numerically positive definite, a regularized SVD is used instead.
+
         Args
         ----
         thetas : ndarray, optional
             Given input correlation coefficients. If none given, uses self.thetas from training.
+
+        calc_grad : bool, optional
+            If True, the gradient of the reduced likelihood with respect to
+            thetas is returned in params['grad'].
         """
         if thetas is None:
             thetas = self.thetas
 
-        X, Y = self.X, self.Y
+        if self._sq_dists is None:
+            self._sq_dists = self._calculate_sq_dists()
+
+        Y = self.Y
+        n = self.n_samples
         params = {}
 
         # Correlation Matrix
-        distances = np.zeros((self.n_samples, self.n_dims, self.n_samples))
-        for i in range(self.n_samples):
-            distances[i, :, i+1:] = np.abs(X[i, ...] - X[i+1:, ...]).T
-            distances[i+1:, :, i] = distances[i, :, i+1:].T
-
-        R = np.exp(-thetas.dot(np.square(distances)))
+        r = np.exp(-self._sq_dists.dot(thetas))
+        R = squareform(r, checks=False)
         R[np.diag_indices_from(R)] = 1. + self.nugget
 
-        [U,S,Vh] = linalg.svd(R)
-
-        # Penrose-Moore Pseudo-Inverse:
-        # Given A = USV^* and Ax=b, the least-squares solution is
-        # x = V S^-1 U^* b.
-        # Tikhonov regularization is used to make the solution significantly more robust.
-        h = 1e-8 * S[0]
-        inv_factors = S / (S ** 2. + h ** 2.)
-
-        alpha = Vh.T.dot(np.einsum('j,kj,kl->jl', inv_factors, U, Y))
-        logdet = -np.sum(np.log(inv_factors))
-        sigma2 = np.dot(Y.T, alpha).sum(axis=0) / self.n_samples
-        reduced_likelihood = -(np.log(np.sum(sigma2)) + logdet / self.n_samples)
+        try:
+            L = linalg.cholesky(R, lower=True)
+        except linalg.LinAlgError:
+            L = None
+
+        # The Cholesky factor of an ill-conditioned matrix can be too
+        # inaccurate to use, so it has to be well inside machine precision.
+        if L is not None:
+            diag = np.diag(L)
+            if np.min(diag) <= 1e-6 * np.max(diag):
+                L = None
+
+        if L is not None:
+            alpha = linalg.cho_solve((L, True), Y)
+            logdet = 2. * np.sum(np.log(np.diag(L)))
+            params['L'] = L
+
+            if calc_grad:
+                R_inv = linalg.cho_solve((L, True), np.eye(n))
+        else:
+            [U, S, Vh] = linalg.svd(R)
+
+            # Penrose-Moore Pseudo-Inverse:
+            # Given A = USV^* and Ax=b, the least-squares solution is
+            # x = V S^-1 U^* b.
+            # Tikhonov regularization is used to make the solution significantly more robust.
+            h = 1e-8 * S[0]
+            inv_factors = S / (S ** 2. + h ** 2.)
+
+            alpha = Vh.T.dot(np.einsum('j,kj,kl->jl', inv_factors, U, Y))
+            logdet = -np.sum(np.log(inv_factors))
+            params['S_inv'] = inv_factors
+            params['U'] = U
+            params['Vh'] = Vh
+
+            if calc_grad:
+                R_inv = (Vh.T * inv_factors).dot(U.T)
+
+        sigma2 = np.dot(Y.T, alpha).sum(axis=0) / n
+        reduced_likelihood = -(np.log(np.sum(sigma2)) + logdet / n)
+
+        if calc_grad:
+            # sum(sigma2) = a^T R^-1 a / n, where a is the sum of the columns
+            # of Y, and dR/dtheta_k = -D_k * R off the diagonal, so summing
+            # over the (symmetric) pairs gives
+            # dl/dtheta_k = -2/n * sum(D_k * R * (b b^T / sum(sigma2) - R^-1))
+            # with b = R^-1 a.
+            b = alpha.sum(axis=1)
+            bbt = squareform(np.outer(b, b), checks=False)
+            w = r * (bbt / np.sum(sigma2) - squareform(R_inv, checks=False))
+            params['grad'] = -2. / n * self._sq_dists.T.dot(w)
 
         params['alpha'] = alpha
         params['sigma2'] = sigma2 * np.square(self.Y_std)
-        params['S_inv'] = inv_factors
-        params['U'] = U
-        params['Vh'] = Vh
 
         return reduced_likelihood, params
 
@@ -170,19 +450,16 @@ class KrigingSurrogate(SurrogateModel):
 
         super(KrigingSurrogate, self).predict(x)
 
-        X, Y = self.X, self.Y
-        thetas = self.thetas
         if isinstance(x, list):
             x = np.array(x)
         x = np.atleast_2d(x)
-        n_eval = x.shape[0]
 
         # Normalize input
         x_n = (x - self.X_mean) / self.X_std
 
-        r = np.zeros((n_eval, self.n_samples), dtype=x.dtype)
-        for r_i, x_i in zip(r, x_n):
-            r_i[:] = np.exp(-thetas.dot(np.square((x_i - X).T)))
+        r = np.empty((x_n.shape[0], self.n_samples), dtype=x_n.dtype)
+        for rows in self._chunks(x_n.shape[0]):
+            r[rows] = np.exp(-np.square(x_n[rows, np.newaxis, :] - self.X).dot(self.thetas))
 
         # Scaled Predictor
         y_t = np.dot(r, self.alpha)
@@ -191,7 +468,13 @@ class KrigingSurrogate(SurrogateModel):
         y = self.Y_mean + self.Y_std * y_t
 
         if self.eval_rmse:
-            mse = (1. - np.dot(np.dot(r, self.Vh.T), np.einsum('j,kj,lk->jl', self.S_inv, self.U, r))) * self.sigma2
+            if self.L is not None:
+                v = linalg.solve_triangular(self.L, r.T, lower=True)
+                mse = np.outer(1. - np.einsum('ij,ij->j', v, v), self.sigma2)
+            else:
+                # diagonal of r R^-1 r^T, with R^-1 = Vh^T S^-1 U^T
+                rRr = np.einsum('ij,j,ij->i', r.dot(self.Vh.T), self.S_inv, r.dot(self.U))
+                mse = np.outer(1. - rRr, self.sigma2)
 
             # Forcing negative RMSE to zero if negative due to machine precision
             mse[mse < 0.] = 0.
@@ -208,21 +491,63 @@ class KrigingSurrogate(SurrogateModel):
         x : array-like
             Point at which the surrogate Jacobian is evaluated.
         """
+        return self.linearize_batch(np.reshape(x, (1, -1)))[0]
+
+    def predict_batch(self, x):
+        """
+        Calculates the predicted values of the response at each of the
+        supplied points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+        """
+        return KrigingSurrogate.predict(self, x)
 
+    def linearize_batch(self, x):
+        """
+        Calculates the jacobian of the Kriging surface at each of the
+        requested points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians of shape (n_points, n_outputs, n_inputs).
+        """
         thetas = self.thetas
 
         # Normalize Input
-        x_n = (x - self.X_mean) / self.X_std
+        x_n = (np.atleast_2d(x) - self.X_mean) / self.X_std
+
+        jac = np.empty((x_n.shape[0], self.alpha.shape[1], self.n_dims),
+                       dtype=np.result_type(x_n, self.alpha))
+
+        for rows in self._chunks(x_n.shape[0]):
+            diff = x_n[rows, np.newaxis, :] - self.X
+            r = np.exp(-np.square(diff).dot(thetas))
 
-        r = np.exp(-thetas.dot(np.square((x_n - self.X).T)))
+            # dr/dx_k = -2 * theta_k * (x_k - X_k) * r
+            gradr = -2. * r[:, :, np.newaxis] * diff * thetas
+            jac[rows] = np.einsum('ijk,jl->ilk', gradr, self.alpha)
 
-        # Z = einsum('i,ij->ij', X, Y) is equivalent to, but much faster and
-        # memory efficient than, diag(X).dot(Y) for vector X and 2D array Y.
-        # I.e. Z[i,j] = X[i]*Y[i,j]
-        gradr = r * -2 * np.einsum('i,ij->ij', thetas, (x_n - self.X).T)
-        jac = np.einsum('i,j,ij->ij', self.Y_std, 1./self.X_std, gradr.dot(self.alpha).T)
+        jac *= np.outer(self.Y_std, 1. / self.X_std)
         return jac
 
+    def _chunks(self, n_eval):
+        """
+        Yields slices of the prediction points whose differences with the
+        training points fit in `max_chunk_size` elements.
+        """
+        size = max(1, self.max_chunk_size // max(1, self.n_samples * self.n_dims))
+        for start in range(0, n_eval, size):
+            yield slice(start, start + size)
+
 
 class FloatKrigingSurrogate(KrigingSurrogate):
     """Surrogate model based on the simple Kriging interpolation. Predictions are returned as floats,
@@ -231,3 +556,9 @@ class FloatKrigingSurrogate(KrigingSurrogate):
     def predict(self, x):
         dist = super(FloatKrigingSurrogate, self).predict(x)
         return dist[0]  # mean value
+
+    def predict_batch(self, x):
+        dist = super(FloatKrigingSurrogate, self).predict_batch(x)
+        if self.eval_rmse:
+            return dist[0]  # mean values
+        return dist
@@ -0,0 +1,281 @@
+""" Surrogate model based on Kriging in the neighborhood of each prediction point. """
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from openmdao.surrogate_models.surrogate_model import SurrogateModel
+from openmdao.surrogate_models.kriging import KrigingSurrogate, MACHINE_EPSILON
+
+
+class LocalKrigingSurrogate(SurrogateModel):
+    """Surrogate model for large training sets that makes each prediction with
+    simple Kriging on the training points nearest to the prediction point, so
+    no correlation matrix is larger than `num_neighbors` squared.
+
+    The thetas and the process variance are estimated once, by a
+    `KrigingSurrogate` trained on a random subset of the training points.
+    The training points are scaled by the square roots of the thetas before
+    they are put in a `cKDTree`, so the nearest neighbors are the most
+    correlated points. Predictions are returned like those of
+    `KrigingSurrogate`: as a tuple of mean and RMSE if eval_rmse is True.
+
+    Args
+    ----
+    num_neighbors : int, optional
+        Number of training points used for each prediction. Default: 50
+    num_fit_points : int, optional
+        Number of training points that the thetas are estimated from. Default: 500
+    nugget : double, optional
+        Nugget smoothing parameter for smoothing noisy data. Default: 10. * Machine Epsilon
+    eval_rmse : bool, optional
+        Flag indicating whether the Root Mean Squared Error (RMSE) should be computed. Default: False
+    seed : int or None, optional
+        Seed for choosing the points that the thetas are estimated from. Default: None
+    """
+
+    supports_update = True
+
+    _state_attrs = ('n_dims', 'n_samples', 'thetas', 'sigma2',
+                    'X', 'Y', 'X_mean', 'X_std', 'Y_mean', 'Y_std')
+
+    _option_attrs = ('num_neighbors', 'num_fit_points', 'nugget', 'eval_rmse', 'seed')
+
+    def __init__(self, num_neighbors=50, num_fit_points=500, nugget=10. * MACHINE_EPSILON,
+                 eval_rmse=False, seed=None):
+        super(LocalKrigingSurrogate, self).__init__()
+
+        self.num_neighbors = num_neighbors
+        self.num_fit_points = num_fit_points
+        self.nugget = nugget
+        self.eval_rmse = eval_rmse
+        self.seed = seed
+
+        self.n_dims = 0
+        self.n_samples = 0
+        self.thetas = np.zeros(0)
+        self.sigma2 = np.zeros(0)
+
+        # Normalized Training Values
+        self.X = np.zeros(0)
+        self.Y = np.zeros(0)
+        self.X_mean = np.zeros(0)
+        self.X_std = np.zeros(0)
+        self.Y_mean = np.zeros(0)
+        self.Y_std = np.zeros(0)
+
+        # Tree of the training points scaled by the square roots of thetas,
+        # which is rebuilt when it's next needed after points are added.
+        self._tree = None
+
+        # Maximum number of elements of the neighborhood correlation matrices
+        # that are formed at once.
+        self.max_chunk_size = 2 ** 22
+
+    def train(self, x, y):
+        """
+        Train the surrogate model with the given set of inputs and outputs.
+
+        Args
+        ----
+        x : array-like
+            Training input locations
+
+        y : array-like
+            Model responses at given inputs.
+        """
+        super(LocalKrigingSurrogate, self).train(x, y)
+
+        x, y = np.atleast_2d(x, y)
+        self.n_samples, self.n_dims = x.shape
+
+        if self.n_samples <= 1:
+            raise ValueError('LocalKrigingSurrogate require at least 2 training points.')
+
+        # Normalize the data
+        X_mean = np.mean(x, axis=0)
+        X_std = np.std(x, axis=0)
+        Y_mean = np.mean(y, axis=0)
+        Y_std = np.std(y, axis=0)
+
+        X_std[X_std == 0.] = 1.
+        Y_std[Y_std == 0.] = 1.
+
+        self.X = (x - X_mean) / X_std
+        self.Y = (y - Y_mean) / Y_std
+        self.X_mean, self.X_std = X_mean, X_std
+        self.Y_mean, self.Y_std = Y_mean, Y_std
+
+        if self.n_samples > self.num_fit_points:
+            rng = np.random.RandomState(self.seed)
+            subset = rng.choice(self.n_samples, self.num_fit_points, replace=False)
+        else:
+            subset = slice(None)
+
+        fit = KrigingSurrogate(nugget=self.nugget)
+        fit.train(x[subset], y[subset])
+
+        # The subset is normalized by its own standard deviations
+        self.thetas = fit.thetas * np.square(X_std / fit.X_std)
+        self.sigma2 = fit.sigma2
+
+        self._tree = None
+
+    def update(self, x, y):
+        """
+        Adds training points without estimating the thetas again. The points
+        are normalized like the original training data.
+
+        Args
+        ----
+        x : array-like
+            New training input locations
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        x, y = np.atleast_2d(x, y)
+
+        self.X = np.vstack((self.X, (x - self.X_mean) / self.X_std))
+        self.Y = np.vstack((self.Y, (y - self.Y_mean) / self.Y_std))
+        self.n_samples = self.X.shape[0]
+
+        self._tree = None
+
+    def set_state(self, state):
+        """
+        Restores the trained model from a dict of arrays returned by get_state.
+
+        Args
+        ----
+        state : dict
+            Arrays that hold the trained model.
+        """
+        super(LocalKrigingSurrogate, self).set_state(state)
+        self._tree = None
+
+    def predict(self, x):
+        """
+        Calculates a predicted value of the response based on the current
+        trained model for the supplied list of inputs.
+
+        Args
+        ----
+        x : array-like
+            Point(s) at which the surrogate is evaluated.
+        """
+        super(LocalKrigingSurrogate, self).predict(x)
+
+        x_n = (np.atleast_2d(x) - self.X_mean) / self.X_std
+        n_eval = x_n.shape[0]
+
+        y_t = np.empty((n_eval, self.Y.shape[1]), dtype=x_n.dtype)
+        mse = np.empty((n_eval, 1))
+
+        for rows in self._chunks(n_eval):
+            r, idx, R = self._neighborhoods(x_n[rows])
+
+            # weights of the neighbors' values, R^-1 r
+            w = np.linalg.solve(R, r[:, :, np.newaxis])[:, :, 0]
+            y_t[rows] = np.einsum('ij,ijk->ik', w, self.Y[idx])
+            mse[rows, 0] = 1. - np.einsum('ij,ij->i', w, r).real
+
+        # Predictor
+        y = self.Y_mean + self.Y_std * y_t
+
+        if self.eval_rmse:
+            # Forcing negative RMSE to zero if negative due to machine precision
+            mse[mse < 0.] = 0.
+            return y, np.sqrt(mse * self.sigma2)
+
+        return y
+
+    def linearize(self, x):
+        """
+        Calculates the jacobian of the surrogate at the requested point.
+
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate Jacobian is evaluated.
+        """
+        return self.linearize_batch(np.reshape(x, (1, -1)))[0]
+
+    def predict_batch(self, x):
+        """
+        Calculates the predicted values of the response at each of the
+        supplied points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+        """
+        return LocalKrigingSurrogate.predict(self, x)
+
+    def linearize_batch(self, x):
+        """
+        Calculates the jacobian of the surrogate at each of the requested
+        points, for their current neighborhoods.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians of shape (n_points, n_outputs, n_inputs).
+        """
+        x_n = (np.atleast_2d(x) - self.X_mean) / self.X_std
+        n_eval = x_n.shape[0]
+
+        jac = np.empty((n_eval, self.Y.shape[1], self.n_dims),
+                       dtype=np.result_type(x_n, self.Y))
+
+        for rows in self._chunks(n_eval):
+            r, idx, R = self._neighborhoods(x_n[rows])
+
+            # neighbor weights R^-1 Y of the simple Kriging predictor r^T R^-1 Y
+            alpha = np.linalg.solve(R, self.Y[idx])
+
+            # dr/dx_k = -2 * theta_k * (x_k - X_k) * r
+            gradr = -2. * r[:, :, np.newaxis] * (x_n[rows, np.newaxis, :] - self.X[idx]) * \
+                self.thetas
+            jac[rows] = np.einsum('ijk,ijl->ilk', gradr, alpha)
+
+        jac *= np.outer(self.Y_std, 1. / self.X_std)
+        return jac
+
+    def _neighborhoods(self, x_n):
+        """
+        Returns the correlations of the normalized points `x_n` with their
+        nearest training points, the indices of those training points, and
+        the correlation matrix of each neighborhood.
+        """
+        scale = np.sqrt(self.thetas)
+        if self._tree is None:
+            self._tree = cKDTree(self.X * scale)
+
+        k = min(self.num_neighbors, self.n_samples)
+        _, idx = self._tree.query((x_n * scale).real, k)
+        idx = np.reshape(idx, (x_n.shape[0], k))
+
+        # The tree distances are real, so the correlations are calculated
+        # again in case x_n is complex.
+        X = self.X[idx]
+        r = np.exp(-np.square(x_n[:, np.newaxis, :] - X).dot(self.thetas))
+        R = np.exp(-np.square(X[:, :, np.newaxis, :] - X[:, np.newaxis, :, :]).dot(self.thetas))
+        R[:, np.arange(k), np.arange(k)] = 1. + self.nugget
+
+        return r, idx, R
+
+    def _chunks(self, n_eval):
+        """
+        Yields slices of the prediction points whose neighborhoods fit in
+        `max_chunk_size` elements.
+        """
+        k = min(self.num_neighbors, self.n_samples)
+        size = max(1, self.max_chunk_size // (k * k * max(1, self.n_dims)))
+        for start in range(0, n_eval, size):
+            yield slice(start, start + size)
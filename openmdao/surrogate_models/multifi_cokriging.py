@@ -13,6 +13,9 @@ from scikit-learn package here to avoid scikit-learn dependency.
 ISAE/DMSM - ONERA/DCPS
 """
 
+import multiprocessing
+from functools import partial
+
 import numpy as np
 from numpy import atleast_2d as array2d
 
@@ -21,6 +24,7 @@ from scipy.optimize import minimize
 from scipy.spatial.distance import squareform
 
 from openmdao.surrogate_models.surrogate_model import MultiFiSurrogateModel
+from openmdao.surrogate_models.kriging import _latin_hypercube_starts
 
 import logging
 _logger = logging.getLogger()
@@ -132,16 +136,8 @@ D: array with shape (n_samples * (n_samples - 1) / 2, n_features)
 """
     if Y is None:
         X = array2d(X)
-        n_samples, n_features = X.shape
-        n_nonzero_cross_dist = n_samples * (n_samples - 1) // 2
-        D = np.zeros((n_nonzero_cross_dist, n_features))
-        ll_1 = 0
-        for k in range(n_samples - 1):
-            ll_0 = ll_1
-            ll_1 = ll_0 + n_samples - k - 1
-            D[ll_0:ll_1] = np.abs(X[k] - X[(k + 1):])
-
-        return D
+        i, j = np.triu_indices(X.shape[0], 1)
+        return np.abs(X[i] - X[j])
 
     else:
         X = array2d(X)
@@ -152,15 +148,56 @@ D: array with shape (n_samples * (n_samples - 1) / 2, n_features)
             raise ValueError("X and Y must have the same dimensions.")
         n_features = n_features_X
 
-        n_nonzero_cross_dist = n_samples_X * n_samples_Y
-        D = np.zeros((n_nonzero_cross_dist, n_features))
-        ll_1 = 0
-        for k in range(n_samples_X):
-            ll_0 = ll_1
-            ll_1 = ll_0 + n_samples_Y# - k - 1
-            D[ll_0:ll_1] = np.abs(X[k] - Y)
+        return np.abs(X[:, np.newaxis, :] - Y).reshape((n_samples_X * n_samples_Y,
+                                                        n_features))
+
+
+def _min_rlf(model, lvl, initial_range, tol, x0):
+    """
+    Minimizes the negative reduced likelihood function of one level of a
+    `MultiFiCoKriging` model from one starting point. This is a function so
+    that it can be run in a process pool.
+
+    Args
+    ----
+    model : `MultiFiCoKriging`
+        Model with its training data set.
+
+    lvl : int
+        Level of fidelity.
+
+    initial_range : float
+        Initial range of the optimizer.
+
+    tol : float
+        Optimizer terminates when the tolerance tol is reached.
+
+    x0 : ndarray
+        Starting base 10 logarithms of theta.
+
+    Returns
+    -------
+    OptimizeResult
+        Result of the optimization, in the base 10 logarithms of theta.
+    """
+    thetaL = model.thetaL[lvl]
+    thetaU = model.thetaU[lvl]
+
+    def rlf_transform(x):
+        return model.rlf(theta=10.**x, lvl=lvl)
 
-        return D
+    constraints = []
+    for i in range(thetaL.size):
+        constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
+                            log10t[i] - np.log10(thetaL[0][i])})
+        constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
+                            np.log10(thetaU[0][i]) - log10t[i]})
+
+    constraints = tuple(constraints)
+    return minimize(rlf_transform, x0, method='COBYLA',
+                    constraints=constraints,
+                    options={'rhobeg': initial_range,
+                             'tol': tol, 'disp': 0})
 
 
 class MultiFiCoKriging(object):
@@ -224,6 +261,24 @@ thetaU: double, array_like or list, optional
     for all levels of code.
     if list: a list of nlevel arrays specifying value for each level
 
+num_starts: int, optional
+    Number of starting points of the maximum likelihood estimation of each
+    level. The first one is theta0 (or the last estimate, with warm_start),
+    and the others form a Latin hypercube between thetaL and thetaU. The
+    best result is kept. Default is 1.
+
+pool_size: int, optional
+    Number of processes that run the estimations from different starting
+    points. Default is 1, which runs them in this process.
+
+warm_start: bool, optional
+    If True, the estimation of each level starts from its theta of the last
+    fit instead of theta0, e.g., when a multi-fidelity metamodel with
+    warm_restart refits after new points are added. Default is False.
+
+seed: int or None, optional
+    Seed for the random starting points. Default is None.
+
 
 Attributes
 ----------
@@ -291,7 +346,8 @@ References
         'linear': linear_regression}
 
     def __init__(self, regr='constant', rho_regr='constant',
-                 theta=None, theta0=None, thetaL=None, thetaU=None):
+                 theta=None, theta0=None, thetaL=None, thetaU=None,
+                 num_starts=1, pool_size=1, warm_start=False, seed=None):
 
         self.corr     = squared_exponential_correlation
         self.regr     = regr
@@ -301,8 +357,21 @@ References
         self.thetaL = thetaL
         self.thetaU = thetaU
 
+        self.num_starts = num_starts
+        self.pool_size = pool_size
+        self.warm_start = warm_start
+        self.seed = seed
+
+        # the given theta, since self.theta holds the estimates after a fit
+        self._theta_given = theta
+        self._theta_last = None
+
         self._nfev = 0
 
+        # Maximum number of cross-distances between prediction points and
+        # training points that are formed at once.
+        self.max_chunk_size = 2 ** 20
+
     def _build_R(self, lvl, theta):
         """
         Builds the correlation matrix with given theta for the specified level.
@@ -343,6 +412,12 @@ tol: float
     Optimizer terminates when the tolerance tol is reached.
 
 """
+        # Levels without a given theta are estimated again on every fit
+        if isinstance(self._theta_given, list):
+            self.theta = list(self._theta_given)
+        else:
+            self.theta = self._theta_given
+
         # Run input checks
         # Transforms floats and arrays in lists to have a multifidelity structure
         self._check_list_structure(X, y)
@@ -367,6 +442,12 @@ tol: float
         self.sigma2 = nlevel*[0]
         self._R_adj = nlevel*[None]
 
+        # terms of the predictor that only depend on the training data
+        self._Ft = nlevel*[None]
+        self._gamma = nlevel*[None]
+        self._err2 = nlevel*[None]
+        self._rho_cov = nlevel*[None]
+
         y_best = y[nlevel-1]
         for i in range(nlevel-1)[::-1]:
             y_best = np.concatenate((y[i][:-n_samples[i+1]],y_best))
@@ -433,6 +514,8 @@ tol: float
                 if np.isinf(self.rlf_value[lvl]):
                     raise Exception("Bad point. Try increasing theta0.")
 
+        self._theta_last = list(self.theta)
+
         return
 
 
@@ -523,6 +606,14 @@ rlf_value: double
         self.C[lvl] = C
         self.G[lvl] = G
 
+        # terms of the predictor and its MSE that only depend on the
+        # training data
+        self._Ft[lvl] = Ft
+        self._gamma[lvl] = solve_triangular(C.T, err, lower=False)
+        self._err2[lvl] = err2
+        self._rho_cov[lvl] = sigma2*linalg.inv(np.dot(G.T, G))[:q, :q] \
+            + np.dot(beta[:q], beta[:q].T)
+
         return rlf_value
 
 
@@ -557,36 +648,43 @@ res: dict
     res['theta']: optimal theta
     res['rlf_value']: optimal value for likelihood
 """
-        # Initialize input
-        thetaL = self.thetaL[lvl]
-        thetaU = self.thetaU[lvl]
-
-        def rlf_transform(x):
-            return self.rlf(theta=10.**x, lvl=lvl)
-
-        # Use specified starting point as first guess
-        theta0 = self.theta0[lvl]
-        x0 = np.log10(theta0[0])
-
-        constraints = []
-        for i in range(theta0.size):
-            constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
-                                log10t[i] - np.log10(thetaL[0][i])})
-            constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
-                                np.log10(thetaU[0][i]) - log10t[i]})
-
-        constraints = tuple(constraints)
-        sol = minimize(rlf_transform, x0, method='COBYLA',
-                       constraints=constraints,
-                       options={'rhobeg': initial_range,
-                                'tol': tol, 'disp': 0})
+        # Use specified starting point as first guess, or the last estimate
+        x0 = np.log10(self.theta0[lvl][0])
+        if self.warm_start and self._theta_last is not None and \
+           len(self._theta_last) == self.nlevel:
+            last = np.ravel(self._theta_last[lvl])
+            if last.size == x0.size:
+                x0 = np.log10(last)
+
+        starts = [x0]
+        if self.num_starts > 1:
+            rng = np.random.RandomState(self.seed)
+            lower = np.log10(self.thetaL[lvl][0])
+            upper = np.log10(self.thetaU[lvl][0])
+            starts.extend(_latin_hypercube_starts(self.num_starts - 1, lower, upper, rng))
+
+        if self.pool_size > 1 and len(starts) > 1:
+            pool = multiprocessing.Pool(min(self.pool_size, len(starts)))
+            try:
+                sols = pool.map(partial(_min_rlf, self, lvl, initial_range, tol), starts)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            sols = [_min_rlf(self, lvl, initial_range, tol, start) for start in starts]
+
+        sol = min(sols, key=lambda sol: sol['fun'])
 
         log10_optimal_x = sol['x']
         optimal_rlf_value = sol['fun']
-        self._nfev += sol['nfev']
+        self._nfev += sum(s['nfev'] for s in sols)
 
         optimal_theta = 10. ** log10_optimal_x
 
+        # The model parameters are those of the last evaluation, which
+        # may have been at another point or in another process.
+        self.rlf(lvl=lvl, theta=optimal_theta)
+
         res = {}
         res['theta'] = optimal_theta
         res['rlf_value'] = optimal_rlf_value
@@ -624,81 +722,86 @@ MSE: array_like, optional (if eval_MSE is True)
 """
 
         X = array2d(X)
+        n_eval = X.shape[0]
+
+        mu = np.zeros((n_eval, 1))
+        if eval_MSE:
+            MSE = np.zeros((n_eval, 1))
+
+        # Predict chunks of points, so the cross-distances with the training
+        # points fit in max_chunk_size elements
+        n_cross = max(self.n_samples) * max(1, self.n_features)
+        size = max(1, self.max_chunk_size // n_cross)
+        for start in range(0, n_eval, size):
+            rows = slice(start, start + size)
+            if eval_MSE:
+                mu[rows, 0], MSE[rows, 0] = self._predict_chunk(X[rows], eval_MSE)
+            else:
+                mu[rows, 0] = self._predict_chunk(X[rows], eval_MSE)
+
+        if eval_MSE:
+            return mu, MSE
+        else:
+            return mu
+
+
+    def _predict_chunk(self, X, eval_MSE):
+        """
+Returns the predictions at X of the highest level, and their MSE if
+eval_MSE is True, as arrays with shape (n_eval, ).
+"""
         nlevel = self.nlevel
-        n_eval, n_features_X = X.shape
+        n_eval = X.shape[0]
 
         # Calculate kriging mean and variance at level 0
-        mu = np.zeros((n_eval, nlevel))
-
-        f = self.regr(X)
         f0 = self.regr(X)
         dx = l1_cross_distances(X, Y=self.X[0])
-
-        # Get regression function and correlation
-        F = self.F[0]
-        C = self.C[0]
-
-        beta = self.beta[0]
-        Ft = solve_triangular(C, F, lower=True)
-        yt = solve_triangular(C, self.y[0], lower=True)
         r_ = self.corr(self.theta[0], dx).reshape(n_eval, self.n_samples[0])
-        gamma = solve_triangular(C.T, yt - np.dot(Ft,beta), lower=False)
 
         # Scaled predictor
-        mu[:,0]= (np.dot(f, beta) + np.dot(r_,gamma)).ravel()
+        mu = (np.dot(f0, self.beta[0]) + np.dot(r_, self._gamma[0])).ravel()
 
         if eval_MSE:
-            self.sigma2_rho = nlevel*[None]
-            MSE = np.zeros((n_eval,nlevel))
+            C = self.C[0]
+            Ft = self._Ft[0]
             r_t = solve_triangular(C, r_.T, lower=True)
             G = self.G[0]
 
-            u_ = solve_triangular(G.T, f.T - np.dot(Ft.T, r_t), lower=True)
-            MSE[:,0] = self.sigma2[0] * (1 \
+            u_ = solve_triangular(G.T, f0.T - np.dot(Ft.T, r_t), lower=True)
+            MSE = self.sigma2[0] * (1 \
                         - (r_t**2).sum(axis=0) + (u_**2).sum(axis=0))
 
         # Calculate recursively kriging mean and variance at level i
         for i in range(1,nlevel):
-            C = self.C[i]
-            F = self.F[i]
             g = self.rho_regr(X)
             dx = l1_cross_distances(X, Y=self.X[i])
             r_ = self.corr(self.theta[i], dx).reshape(n_eval, self.n_samples[i])
-            f = np.vstack((g.T*mu[:,i-1], f0.T))
-
-            Ft = solve_triangular(C, F, lower=True)
-            yt = solve_triangular(C, self.y[i], lower=True)
-            r_t = solve_triangular(C,r_.T, lower=True)
-            G = self.G[i]
-            beta = self.beta[i]
+            f = np.vstack((g.T*mu, f0.T))
 
             # scaled predictor
-            mu[:,i] = (np.dot(f.T, beta) \
-                       + np.dot(r_t.T, yt - np.dot(Ft,beta))).ravel()
+            mu = (np.dot(f.T, self.beta[i]) + np.dot(r_, self._gamma[i])).ravel()
 
             if eval_MSE:
-                Q_ = (np.dot((yt-np.dot(Ft,beta)).T, yt-np.dot(Ft,beta)))[0,0]
+                C = self.C[i]
+                Ft = self._Ft[i]
+                r_t = solve_triangular(C, r_.T, lower=True)
+                G = self.G[i]
+
                 u_ = solve_triangular(G.T, f - np.dot(Ft.T, r_t), lower=True)
-                sigma2_rho = np.dot(g, \
-                    self.sigma2[i]*linalg.inv(np.dot(G.T,G))[:self.q[i],:self.q[i]] \
-                        + np.dot(beta[:self.q[i]], beta[:self.q[i]].T))
-                sigma2_rho = (sigma2_rho * g).sum(axis=1)
+                sigma2_rho = (np.dot(g, self._rho_cov[i]) * g).sum(axis=1)
 
-                MSE[:,i] = sigma2_rho * MSE[:,i-1] \
-                        + Q_/(2*(self.n_samples[i]-self.p[i]-self.q[i])) \
+                MSE = sigma2_rho * MSE \
+                        + self._err2[i]/(2*(self.n_samples[i]-self.p[i]-self.q[i])) \
                         * (1 - (r_t**2).sum(axis=0)) \
                         + self.sigma2[i] * (u_**2).sum(axis=0)
 
         # scaled predictor
-        for i in range(nlevel):# Predictor
-            mu[:,i] = self.y_mean + self.y_std * mu[:,i]
-            if eval_MSE:
-                MSE[:,i] = self.y_std**2 * MSE[:,i]
+        mu = self.y_mean + self.y_std * mu
 
         if eval_MSE:
-            return mu[:,-1].reshape((n_eval,1)), MSE[:,-1].reshape((n_eval,1))
+            return mu, self.y_std**2 * MSE
         else:
-            return mu[:,-1].reshape((n_eval,1))
+            return mu
 
 
     def _check_list_structure(self, X, y):
@@ -820,24 +923,43 @@ MSE: array_like, optional (if eval_MSE is True)
 class MultiFiCoKrigingSurrogate(MultiFiSurrogateModel):
     """
     OpenMDAO adapter of multi-fidelity recursive cokriging method described
-    in [LeGratiet2013]. See MultiFiCoKriging class.
+    in [LeGratiet2013]. See MultiFiCoKriging class. Predictions are returned
+    as a tuple of mean and RMSE, or only the mean if eval_rmse is False,
+    which skips the MSE calculation.
     """
 
     def __init__(self, regr='constant', rho_regr='constant',
                  theta=None, theta0=None, thetaL=None, thetaU=None,
-                 tolerance=TOLERANCE_DEFAULT, initial_range=INITIAL_RANGE_DEFAULT):
+                 tolerance=TOLERANCE_DEFAULT, initial_range=INITIAL_RANGE_DEFAULT,
+                 num_starts=1, pool_size=1, warm_start=False, seed=None,
+                 eval_rmse=True):
         super(MultiFiCoKrigingSurrogate, self).__init__()
 
         self.tolerance=tolerance
         self.initial_range=initial_range
+        self.eval_rmse=eval_rmse
         self.model = MultiFiCoKriging(regr=regr,rho_regr=rho_regr, theta=theta,
-                                      theta0=theta0, thetaL=thetaL, thetaU=thetaU)
+                                      theta0=theta0, thetaL=thetaL, thetaU=thetaU,
+                                      num_starts=num_starts, pool_size=pool_size,
+                                      warm_start=warm_start, seed=seed)
 
     def predict(self, new_x):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
-        Y_pred, MSE = self.model.predict([new_x])
+        return self.predict_batch([new_x])
+
+    def predict_batch(self, x):
+        """Calculates the predicted values of the response at each of the
+        supplied points, in chunks of points that bound the memory used.
+
+        x: ndarray
+            Points at which the surrogate is evaluated, one per row.
+        """
+        if not self.eval_rmse:
+            return self.model.predict(x, eval_MSE=False)
+
+        Y_pred, MSE = self.model.predict(x)
         return Y_pred, np.sqrt(np.abs(MSE))
 
     def train_multifi(self,X,Y):
@@ -864,8 +986,16 @@ class FloatMultiFiCoKrigingSurrogate(MultiFiCoKrigingSurrogate):
     NormalDistribution predicted by the base class model."""
 
     def predict(self, new_x):
-        dist = super(FloatMultiFiCoKrigingSurrogate, self).predict(new_x)
-        return dist.mu
+        return self.model.predict([new_x], eval_MSE=False)
+
+    def predict_batch(self, x):
+        """Calculates the mean predicted values of the response at each of
+        the supplied points.
+
+        x: ndarray
+            Points at which the surrogate is evaluated, one per row.
+        """
+        return self.model.predict(x, eval_MSE=False)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@
 # https://github.com/SMarone/NDInterp
 
 from collections import OrderedDict
+
+import numpy as np
+
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 from openmdao.surrogate_models.nn_interpolators.linear_interpolator import \
     LinearInterpolator
@@ -33,6 +36,11 @@ class NearestNeighbor(SurrogateModel):
         interpolant.
 
     """
+
+    supports_update = True
+
+    _option_attrs = ('interpolant_type', 'interpolant_init_args')
+
     def __init__(self, interpolant_type='rbf', **kwargs):
         super(NearestNeighbor, self).__init__()
 
@@ -63,6 +71,57 @@ class NearestNeighbor(SurrogateModel):
         super(NearestNeighbor, self).train(x, y)
         self.interpolant = _interpolators[self.interpolant_type](x, y, **self.interpolant_init_args)
 
+    def update(self, x, y):
+        """
+        Adds training points to the interpolant. They are normalized like
+        the original training points, and the neighbor search tree is rebuilt
+        when it's next needed.
+
+        Args
+        ----
+        x : array-like
+            New training input locations
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        self.interpolant.add_points(x, y)
+
+    def get_state(self):
+        """
+        Returns a dict of the arrays that hold the trained interpolant. The
+        neighbor search tree isn't included, since it's rebuilt from the
+        training points when it's needed.
+        """
+        state = {}
+        for name, val in self.interpolant.__dict__.items():
+            if name not in ('_KData', '_tree_stale', '_pt_cache') and \
+               not name.startswith('_plane') and val is not None:
+                state[name] = np.asarray(val)
+        return state
+
+    def set_state(self, state):
+        """
+        Restores the trained interpolant from a dict of arrays returned by
+        get_state.
+
+        Args
+        ----
+        state : dict
+            Arrays that hold the trained interpolant.
+        """
+        interpolant = _interpolators[self.interpolant_type].__new__(
+            _interpolators[self.interpolant_type])
+        for name, val in state.items():
+            setattr(interpolant, name, val.item() if val.ndim == 0 else val)
+
+        interpolant._KData = None
+        interpolant._tree_stale = True
+        interpolant._reset_caches()
+
+        self.interpolant = interpolant
+        self.trained = True
+
     def predict(self, x, **kwargs):
         """
         Calculates a predicted value of the response based on the current
@@ -95,3 +154,33 @@ class NearestNeighbor(SurrogateModel):
         if jac.shape[0] == 1 and len(jac.shape) > 2:
             return jac[0, ...]
         return jac
+
+    def predict_batch(self, x, **kwargs):
+        """
+        Calculates the predicted values of the response at each of the
+        supplied points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        kwargs :
+            Additional keyword arguments passed to the interpolant.
+        """
+        return self.predict(x, **kwargs)
+
+    def linearize_batch(self, x, **kwargs):
+        """
+        Calculates the jacobian of the interpolant at each of the requested
+        points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        kwargs :
+            Additional keyword arguments passed to the interpolant.
+        """
+        return self.interpolant.gradient(np.atleast_2d(x), **kwargs)
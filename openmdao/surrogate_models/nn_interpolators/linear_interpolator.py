@@ -1,7 +1,14 @@
 import numpy as np
 
 from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
+
+
+def _resize(arr, size, num):
+    # Returns an array of `size` rows that starts with the first `num` rows
+    # of arr.
+    new_arr = np.empty((size,) + arr.shape[1:])
+    new_arr[:num] = arr[:num]
+    return new_arr
 
 
 class LinearInterpolator(NNBase):
@@ -10,43 +17,77 @@ class LinearInterpolator(NNBase):
     the prescribed inputs.
     """
 
+    # Maximum number of neighbor sets whose hyperplanes are kept
+    max_cached_planes = 100000
+
+    def _reset_caches(self):
+        super(LinearInterpolator, self)._reset_caches()
+
+        # Rows of the cached hyperplanes, keyed on the sorted indices of
+        # their neighbor sets. The arrays have room for more planes than the
+        # _num_planes that are filled in.
+        self._planes = {}
+        self._num_planes = 0
+        self._plane_grad = np.zeros((0, self._dep_dims, self._indep_dims))
+        self._plane_const = np.zeros((0, self._dep_dims))
+
+    def _fit_hyperplanes(self, sets):
+        # Finds the hyperplane through each set of indep_dims + 1 training
+        # points, as the gradient and value at the origin of each dependent
+        # dimension. All dependent dimensions share one SVD per set. Where
+        # the points are collinear (e.g., on a face of a grid), the plane is
+        # the least squares fit with no slope across the points.
+        pts = self._tp[sets]
+        vals = self._tv[sets]
+        pts_mean = np.mean(pts, axis=1)
+        vals_mean = np.mean(vals, axis=1)
+        dpts = pts - pts_mean[:, np.newaxis, :]
+        dvals = vals - vals_mean[:, np.newaxis, :]
+
+        U, S, Vh = np.linalg.svd(dpts, full_matrices=False)
+
+        nonzero = S > S[:, :1] * (self._indep_dims + 1) * np.finfo(float).eps
+        S_inv = np.zeros_like(S)
+        S_inv[nonzero] = 1. / S[nonzero]
+
+        # Minimum norm least squares solution of dpts.dot(grad) = dvals
+        grad = np.einsum('ikj,ik,ilk,ilm->imj', Vh, S_inv, U, dvals)
+        const = vals_mean - np.einsum('imj,ij->im', grad, pts_mean)
+
+        return grad, const
+
     def _find_hyperplane(self, nloc):
-        # Extra Inputs for Finding the normal are found below
-        # Number of row vectors needed always dimensions - 1
-        indep_dims = self._indep_dims
-        dep_dims = self._dep_dims
-
-        # Number of Prediction Points
-        nppts = nloc.shape[0]
-
-        # Preallocate storage
-        pc = np.empty((nppts, dep_dims), dtype='float')
-        normal = np.empty((nppts, indep_dims + 1, dep_dims), dtype='float')
-        nvect = np.empty((nppts, indep_dims, indep_dims + 1), dtype='float')
-        trnd = np.concatenate((self._tp[nloc, :],
-                               self._tv[nloc, 0].reshape(nppts, indep_dims + 1, 1)),
-                              axis=2)
-        nvect[:, :, :-1] = trnd[:, 1:, :-1] - trnd[:, :-1, :-1]
-
-        for i in range(dep_dims):
-            # Planar vectors need both dep and ind dimensions
-            trnd[:, :, -1] = self._tv[nloc, i]
-
-            # Go through each neighbor
-            # Creates array[neighbor, dimension] from NN results
-            nvect[:, :, -1] = trnd[:, 1:, -1] - trnd[:, :-1, -1]
-
-            # Normal vector is in the null space of nvect.
-            # Since nvect is of size indep x (indep + 1),
-            # the normal vector will be the last entry in
-            # V in the U, Sigma, V = svd(nvect).
-            normal[:, :, i] = np.linalg.svd(nvect)[2][:, -1, :]
-
-            # Use the point of the closest neighbor to
-            # solve for pc - the constant of the n-dimensional plane.
-            pc[:, i] = np.einsum('ij,ij->i', trnd[:, 0, :], normal[:, :, i])
-
-        return normal, pc
+        # Returns the gradient and value at the origin of the hyperplane
+        # through each point's neighbors, for each dependent dimension.
+        # Planes are cached for each set of neighbors, so each one is only
+        # fit once.
+        sets, inverse = np.unique(np.sort(nloc, axis=1), axis=0, return_inverse=True)
+        keys = [idx.tobytes() for idx in sets]
+
+        if len(self._planes) + len(keys) > self.max_cached_planes:
+            self._reset_caches()
+
+        rows = np.array([self._planes.get(key, -1) for key in keys], dtype=int)
+        new = np.where(rows < 0)[0]
+        if len(new) > 0:
+            start = self._num_planes
+            end = start + len(new)
+            if end > len(self._plane_const):
+                # double the room, so that adding planes a few at a time
+                # doesn't copy the whole cache every time
+                size = max(end, min(2 * len(self._plane_const), self.max_cached_planes))
+                self._plane_grad = _resize(self._plane_grad, size, start)
+                self._plane_const = _resize(self._plane_const, size, start)
+
+            grad, const = self._fit_hyperplanes(sets[new])
+            self._plane_grad[start:end] = grad
+            self._plane_const[start:end] = const
+            rows[new] = np.arange(start, end)
+            self._planes.update(zip([keys[i] for i in new], rows[new]))
+            self._num_planes = end
+
+        rows = rows[inverse]
+        return self._plane_grad[rows], self._plane_const[rows]
 
     def __call__(self, prediction_points):
         # This method uses linear interpolation by defining a plane with
@@ -63,21 +104,12 @@ class LinearInterpolator(NNBase):
 
         # KData query takes (data, #ofneighbors) to determine closest
         # training points to predicted data
-        ndist, nloc = self._KData.query(normalized_pts.real, points_needed)
+        ndist, nloc = self._query(normalized_pts.real, points_needed)
 
-        normal, pc = self._find_hyperplane(nloc)
+        grad, const = self._find_hyperplane(nloc)
 
         # Set all predictions from values on plane
-        predictions = np.einsum('ij,ijk->ik', normalized_pts,
-                                normal[:, :self._indep_dims, :]) - pc
-
-        # Check to see if there are any collinear points and replace them
-        n0 = np.where(normal[:, -1, :] == 0)
-        predictions[n0, :] = self._tv[nloc[0, n0], :]
-
-        # Finish computation for the good normals
-        n = np.where(normal[:, -1, :] != 0)
-        predictions[n] /= -normal[:, -1, :][n]
+        predictions = np.einsum('ikj,ij->ik', grad, normalized_pts) + const
 
         # Rescale to original units
         predictions = (predictions * self._tvr) + self._tvm
@@ -95,8 +127,6 @@ class LinearInterpolator(NNBase):
             PredPoints.shape = (1, PredPoints.shape[0])
 
         normPredPts = (PredPoints - self._tpm) / self._tpr
-        nppts = normPredPts.shape[0]
-        gradient = np.zeros((nppts, self._dep_dims, self._indep_dims), dtype="float")
         # Linear interp only uses as many neighbors as it has dimensions
         dims = self._indep_dims + 1
         # Find the neighbors
@@ -104,12 +134,9 @@ class LinearInterpolator(NNBase):
                 np.allclose(self._pt_cache[0], normPredPts):
             ndist, nloc = self._pt_cache[1:]
         else:
-                ndist, nloc = self._KData.query(normPredPts.real, dims)
+                ndist, nloc = self._query(normPredPts.real, dims)
 
-        normal, pc = self._find_hyperplane(nloc)
-        if np.any(normal[:, -1, :]) == 0:
-            return gradient
-        gradient[:] = (-normal[:, :-1, :] / normal[:, -1, :]).squeeze().T
+        gradient, const = self._find_hyperplane(nloc)
 
         grad = gradient * (self._tvr[:, np.newaxis] / self._tpr)
         return grad
@@ -1,14 +1,20 @@
 import numpy as np
 
 from math import ceil
+
 from scipy.spatial import cKDTree
 
+
 class NNBase(object):
     """
     Base class for common functionality between nearest neighbor interpolants.
     """
 
-    def __init__(self, training_points, training_values, num_leaves=2):
+    # Number of leaves of the tree and threads used for neighbor queries
+    _num_leaves = None
+    _workers = 1
+
+    def __init__(self, training_points, training_values, num_leaves=None, workers=1):
         """
         Initialize the nearest neighbor interpolant by scaling input to the
         unit hypercube.
@@ -23,6 +29,15 @@ class NNBase(object):
             ndarray of shape (num_points x dependent dims) containing
             training output values.
 
+        num_leaves : int or None, optional
+            Number of leaves of the neighbor search tree. Defaults to None,
+            which puts cKDTree's default of 16 points in each leaf. Trees with
+            few leaves compare each query point with most of the training
+            points, which is slow for large training sets.
+
+        workers : int, optional
+            Number of threads used to query the neighbors of many points at
+            once. -1 uses all processors.
         """
         # training_points and training_values are the known points and their
         # respective values which will be interpolated against.
@@ -46,8 +61,58 @@ class NNBase(object):
         self._ntpts = training_points.shape[0]
 
         # Make training data into a Tree
-        leavesz = ceil(self._ntpts / float(num_leaves))
-        self._KData = cKDTree(self._tp, leafsize=leavesz)
+        self._num_leaves = num_leaves
+        self._workers = workers
+        self._build_tree()
+
+        self._reset_caches()
 
+    def _build_tree(self):
+        """ Builds the tree of the normalized training points. """
+        if self._num_leaves is None:
+            self._KData = cKDTree(self._tp)
+        else:
+            leavesz = ceil(self._ntpts / float(self._num_leaves))
+            self._KData = cKDTree(self._tp, leafsize=leavesz)
+        self._tree_stale = False
+
+    def _query(self, points, k):
+        """ Returns the distances to and indices of the k nearest training
+        points of each point, rebuilding the tree if points were added. """
+        if self._tree_stale:
+            self._build_tree()
+        if self._workers == 1:
+            return self._KData.query(points, k)
+        try:
+            return self._KData.query(points, k, workers=self._workers)
+        except TypeError:
+            # the argument was named n_jobs before scipy 1.6
+            return self._KData.query(points, k, n_jobs=self._workers)
+
+    def _reset_caches(self):
+        """ Clears the values cached from earlier predictions. """
         # Cache for gradients
         self._pt_cache = None
+
+    def add_points(self, training_points, training_values):
+        """
+        Add training points, which are normalized like the original ones. The
+        tree is rebuilt when it's next needed, so adding points several times
+        between predictions only builds it once.
+
+        Args
+        ----
+        training_points : ndarray
+            ndarray of shape (num_points x independent dims) containing
+            new training input locations.
+
+        training_values : ndarray
+            ndarray of shape (num_points x dependent dims) containing
+            new training output values.
+        """
+        self._tp = np.vstack((self._tp, (training_points - self._tpm) / self._tpr))
+        self._tv = np.vstack((self._tv, (training_values - self._tvm) / self._tvr))
+        self._ntpts = self._tp.shape[0]
+
+        self._tree_stale = True
+        self._reset_caches()
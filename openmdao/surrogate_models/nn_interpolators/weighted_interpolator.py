@@ -44,7 +44,7 @@ class WeightedInterpolator(NNBase):
         # Find them neigbors
         # KData query takes (data, #ofneighbors) to determine closest
         # training points to predicted data
-        ndist, nloc = self._KData.query(normalized_pts.real, n)
+        ndist, nloc = self._query(normalized_pts.real, n)
 
         # Setup problem
 
@@ -85,25 +85,25 @@ class WeightedInterpolator(NNBase):
                 np.allclose(self._pt_cache[0], normalized_pts):
             ndist, nloc = self._pt_cache[1:]
         else:
-            ndist, nloc = self._KData.query(normalized_pts, n)
+            ndist, nloc = self._query(normalized_pts, n)
 
         # Reshape ndist for 1D problems.
         if len(ndist.shape) == 1:
             ndist.shape = (1, ndist.shape[0])
             nloc.shape = (1, nloc.shape[0])
 
-        dimdiff = normalized_pts - self._tp[nloc]
+        dimdiff = normalized_pts[:, np.newaxis, :] - self._tp[nloc]
 
         weights = np.power(ndist, -dist_eff)
         dweights = -dist_eff * np.power(ndist[..., np.newaxis], -(dist_eff + 2)) * dimdiff
 
-        weight_sum = np.sum(weights, axis=1)
+        weight_sum = np.sum(weights, axis=1)[:, np.newaxis, np.newaxis]
 
         vals = self._tv[nloc]
 
         gradient = (weight_sum * np.einsum('ikj,ikl->ilj', dweights, vals)
                     - (np.einsum('ij,ijk->ik', weights, vals)[..., np.newaxis]
-                    * np.sum(dweights, axis=1))) / np.power(weight_sum, 2)
+                    * np.sum(dweights, axis=1)[:, np.newaxis, :])) / np.power(weight_sum, 2)
 
         grad = gradient * (self._tvr[..., np.newaxis] / self._tpr)
 
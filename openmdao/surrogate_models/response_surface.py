@@ -1,12 +1,19 @@
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import zeros, einsum, squeeze
+from numpy import zeros, ones, einsum, concatenate, triu_indices
 from numpy.dual import lstsq
+from scipy.linalg import qr
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
-from six.moves import range
 
 
 class ResponseSurface(SurrogateModel):
+
+    supports_update = True
+
+    _state_attrs = ('m', 'n', 'betas', '_R', '_Qty')
+
+    _option_attrs = ()
+
     def __init__(self):
         super(ResponseSurface, self).__init__()
 
@@ -14,6 +21,11 @@ class ResponseSurface(SurrogateModel):
         self.n = 0  # number of independents
         self.betas = zeros(0)  # vector of response surface equation coefficients
 
+        # R factor of the QR decomposition of the regression matrix and the
+        # training responses times Q, which is all that an update needs.
+        self._R = zeros(0)
+        self._Qty = zeros(0)
+
     def train(self, x, y):
         """ Calculate response surface equation coefficients using least
         squares regression.
@@ -29,30 +41,48 @@ class ResponseSurface(SurrogateModel):
 
         super(ResponseSurface, self).train(x, y)
 
-        m = self.m = x.shape[0]
-        n = self.n = x.shape[1]
+        self.m = x.shape[0]
+        self.n = x.shape[1]
 
-        X = zeros((m, ((n + 1) * (n + 2)) // 2))
+        # The QR factorization only depends on x, so it is shared by all of
+        # the columns of y. A MetaModel with shared_training set passes the
+        # responses of all of its outputs at once.
+        Q, self._R = qr(self._regression_matrix(x), mode='economic')
 
-        # Modify X to include constant, squared terms and cross terms
+        # Determine response surface equation coefficients (betas) using least
+        # squares, which gives the same result for X and its R factor
+        self._Qty = Q.T.dot(y)
+        self.betas, rs, r, s = lstsq(self._R, self._Qty)
 
-        # Constant Terms
-        X[:, 0] = 1.0
+    def update(self, x, y):
+        """ Add training points to the least squares regression. The R factor
+        of the regression matrix of all of the points is the R factor of the
+        old R factor stacked on the rows of the new points, so the update
+        doesn't depend on the number of old points.
 
-        # Linear Terms
-        X[:, 1:n+1] = x
+        Args
+        ----
+        x : array-like
+            New training input locations
 
-        # Quadratic Terms
-        X_offset = X[:, n + 1:]
-        for i in range(n):
-            # Z = einsum('i,ij->ij', X, Y) is equivalent to, but much faster and
-            # memory efficient than, diag(X).dot(Y) for vector X and 2D array Y.
-            # I.e. Z[i,j] = X[i]*Y[i,j]
-            X_offset[:, :n - i] = einsum('i,ij->ij', x[:, i], x[:, i:])
-            X_offset = X_offset[:, n-i:]
+        y : array-like
+            Model responses at the new inputs.
+        """
+        self.m += x.shape[0]
 
-        # Determine response surface equation coefficients (betas) using least squares
-        self.betas, rs, r, s = lstsq(X, y)
+        Q, self._R = qr(concatenate((self._R, self._regression_matrix(x))), mode='economic')
+        self._Qty = Q.T.dot(concatenate((self._Qty, y)))
+        self.betas, rs, r, s = lstsq(self._R, self._Qty)
+
+    def _regression_matrix(self, x):
+        """ Returns the matrix of the constant, linear, squared and cross terms
+        of each point in x, one point per row.
+        """
+        # The quadratic terms are the products of each pair of inputs in
+        # the upper triangle of the outer product of x with itself
+        rows, cols = triu_indices(self.n)
+        return concatenate((ones((x.shape[0], 1), dtype=x.dtype), x,
+                            x[:, rows] * x[:, cols]), axis=1)
 
     def predict(self, x):
         """
@@ -62,51 +92,61 @@ class ResponseSurface(SurrogateModel):
         Args
         ----
         x : array-like
-            Point at which the surrogate is evaluated.
+            Point(s) at which the surrogate is evaluated.
         """
 
         super(ResponseSurface, self).predict(x)
 
-        n = x.size
+        if x.ndim == 1:
+            return self.predict_batch(x.reshape((1, -1)))[0]
 
-        X = zeros(((self.n + 1) * (self.n + 2)) // 2)
+        return self.predict_batch(x)
 
-        # Modify X to include constant, squared terms and cross terms
-
-        # Constant Terms
-        X[0] = 1.0
+    def linearize(self, x):
+        """
+        Calculates the jacobian of the response surface at the requested point.
 
-        # Linear Terms
-        X[1:n + 1] = x
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate Jacobian is evaluated.
+        """
+        return self.linearize_batch(x.reshape((1, -1)))[0]
 
-        # Quadratic Terms
-        X_offset = X[n + 1:]
-        for i in range(n):
-            X_offset[:n - i] = x[i] * x[i:]
-            X_offset = X_offset[n - i:]
+    def predict_batch(self, x):
+        """
+        Calculates the predicted values of the response at each of the
+        supplied points.
 
-        # Predict new_y using X and betas
-        return X.dot(self.betas)
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+        """
+        return self._regression_matrix(x).dot(self.betas)
 
-    def linearize(self, x):
+    def linearize_batch(self, x):
         """
-        Calculates the jacobian of the Kriging surface at the requested point.
+        Calculates the jacobian of the response surface at each of the
+        requested points.
 
         Args
         ----
         x : array-like
-            Point at which the surrogate Jacobian is evaluated.
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Jacobians of shape (n_points, n_outputs, n_inputs).
         """
         n = self.n
         betas = self.betas
 
-        x = x.flat
-
-        jac = betas[1:n + 1, :].copy()
-        beta_offset = betas[n + 1:, :]
-        for i in range(n):
-            jac[i, :] += x[i:].dot(beta_offset[:n - i, :])
-            jac[i:, :] += x[i] * beta_offset[:n - i, :]
-            beta_offset = beta_offset[n - i:, :]
+        # The quadratic terms are x^T A x for each output, with the
+        # coefficients in the upper triangle of A, so their gradient is
+        # (A + A^T) x
+        A = zeros((n, n, betas.shape[1]), dtype=betas.dtype)
+        A[triu_indices(n)] = betas[n + 1:]
 
-        return jac.T
+        return betas[1:n + 1].T + einsum('ijk,pj->pki', A + A.transpose((1, 0, 2)), x)
@@ -0,0 +1,158 @@
+""" Handle that lets several MetaModel outputs share one trained surrogate. """
+
+from copy import copy, deepcopy
+from weakref import WeakValueDictionary
+
+from openmdao.surrogate_models.surrogate_model import SurrogateModel
+
+
+class SharedSurrogate(SurrogateModel):
+    """Handle to a surrogate model that is only trained once for all handles
+    that are trained on the same data, e.g., the outputs of several identical
+    `MetaModel` instances in a multipoint model.
+
+    Copies of a handle, including the copies that a `MetaModel` makes of its
+    default_surrogate for each output, share a registry of trained models
+    keyed on the training data. Each copy trains a copy of the wrapped
+    surrogate unless a model trained on the same data is already in the
+    registry, in which case it uses that model. Trained models are dropped
+    from the registry once no handle uses them.
+
+    When a handle is given to several outputs as their 'surrogate'
+    metadata, give each output its own copy, since a handle only holds the
+    model it was last trained for.
+
+    Args
+    ----
+    surrogate : `SurrogateModel`
+        Untrained surrogate model that is copied for each set of training data.
+    """
+
+    def __init__(self, surrogate):
+        super(SharedSurrogate, self).__init__()
+
+        self.surrogate = surrogate
+
+        self._models = WeakValueDictionary()
+        self._model = None
+
+    def __deepcopy__(self, memo):
+        handle = copy(self)
+        handle._model = None
+        handle.trained = False
+        return handle
+
+    def _get_model(self, x, y, cache_dir=None):
+        """ Sets the model trained on the given data, training it if needed. """
+        key = self.surrogate._cache_key(x, y)
+        model = self._models.get(key)
+        if model is None:
+            model = deepcopy(self.surrogate)
+            if cache_dir is None:
+                model.train(x, y)
+            else:
+                model.train_cached(x, y, cache_dir)
+            self._models[key] = model
+
+        self._model = model
+        self.trained = True
+
+    def train(self, x, y):
+        """
+        Train the surrogate model with the given set of inputs and outputs,
+        unless another handle already has.
+
+        Args
+        ----
+        x : array-like
+            Training input locations
+
+        y : array-like
+            Model responses at given inputs.
+        """
+        self._get_model(x, y)
+
+    def train_cached(self, x, y, cache_dir):
+        """
+        Trains the surrogate model, or loads it from cache_dir, unless another
+        handle already has a model trained on the same data.
+
+        Args
+        ----
+        x : ndarray
+            Training input locations
+
+        y : ndarray
+            Model responses at given inputs.
+
+        cache_dir : str
+            Directory of the saved models.
+
+        Returns
+        -------
+        bool
+            True if no model had to be trained.
+        """
+        if self.surrogate._cache_key(x, y) in self._models:
+            self._get_model(x, y)
+            return True
+
+        self._get_model(x, y, cache_dir)
+        return False
+
+    def predict(self, x):
+        """
+        Calculates a predicted value of the response based on the shared
+        trained model for the supplied list of inputs.
+
+        Args
+        ----
+        x : array-like
+            Point(s) at which the surrogate is evaluated.
+        """
+        super(SharedSurrogate, self).predict(x)
+        return self._model.predict(x)
+
+    def linearize(self, x):
+        """
+        Calculates the jacobian of the shared trained model at the requested point.
+
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate Jacobian is evaluated.
+        """
+        return self._model.linearize(x)
+
+    def predict_batch(self, x):
+        """
+        Calculates the predicted values of the response at each of the
+        supplied points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+        """
+        super(SharedSurrogate, self).predict(x)
+        return self._model.predict_batch(x)
+
+    def linearize_batch(self, x):
+        """
+        Calculates the jacobian of the shared trained model at each of the
+        requested points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+        """
+        return self._model.linearize_batch(x)
+
+    def _options_hash(self):
+        """
+        Returns a sha1 hash object of the wrapped surrogate's class and options.
+        """
+        key = self.surrogate._options_hash()
+        key.update(type(self).__name__.encode('utf-8'))
+        return key
@@ -2,11 +2,31 @@
 Class definition for SurrogateModel, the base class for all surrogate models.
 """
 
+import os
+import hashlib
+from tempfile import mkstemp
+
+import numpy as np
+
+
 class SurrogateModel(object):
     """
     Base class for surrogate models.
     """
 
+    # True if the surrogate implements update
+    supports_update = False
+
+    # Names of the attributes that hold the trained model, which
+    # train_cached saves and restores instead of training again
+    _state_attrs = ()
+
+    # Names of the attributes that set how the surrogate trains and
+    # predicts, whose current values _options_hash identifies it by. None
+    # means they aren't known, so the surrogate is never taken to be the same
+    # as another one.
+    _option_attrs = None
+
     def __init__(self):
         self.trained = False
 
@@ -25,6 +45,167 @@ class SurrogateModel(object):
             .format(type(self).__name__)
         raise RuntimeError(msg)
 
+    def update(self, x, y):
+        """Adds training points to a trained surrogate model, without
+        retraining it from scratch on all of the points.
+
+        x: ndarray
+            New training input locations, one per row.
+        y: ndarray
+            Model responses at the new inputs.
+        """
+        msg = "{0} does not support incremental training." \
+            .format(type(self).__name__)
+        raise RuntimeError(msg)
+
+    def get_state(self):
+        """Returns a dict of the arrays that hold the trained model, or None
+        if the surrogate doesn't support saving it.
+        """
+        if not self._state_attrs:
+            return None
+
+        state = {}
+        for name in self._state_attrs:
+            val = getattr(self, name)
+            if val is not None:
+                state[name] = np.asarray(val)
+        return state
+
+    def set_state(self, state):
+        """Restores the trained model from a dict of arrays returned by
+        get_state.
+
+        state: dict
+            Arrays that hold the trained model.
+        """
+        for name in self._state_attrs:
+            val = state.get(name)
+            if val is not None and val.ndim == 0:
+                val = val.item()
+            setattr(self, name, val)
+        self.trained = True
+
+    def train_cached(self, x, y, cache_dir):
+        """Trains the surrogate model, or loads it from a file in cache_dir
+        if it was trained on the same data with the same options before.
+        Trained models are saved to .npz files named after a hash of the
+        surrogate class, its options and the training data.
+
+        x: ndarray
+            Training input locations
+        y: ndarray
+            Model responses at given inputs.
+        cache_dir: str
+            Directory of the saved models.
+
+        Returns
+        -------
+        bool
+            True if the model was loaded from the cache.
+        """
+        if self._option_attrs is None:
+            # a saved model can't be matched to options that aren't known
+            self.train(x, y)
+            return False
+
+        fname = os.path.join(cache_dir, self._cache_key(x, y) + '.npz')
+        if os.path.isfile(fname):
+            with np.load(fname) as data:
+                self.set_state(dict(data))
+            return True
+
+        self.train(x, y)
+
+        state = self.get_state()
+        if state is None:
+            return False
+
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        # write to a temporary file first, so no other process can read a
+        # partly written file
+        fd, tmpname = mkstemp(suffix='.npz', dir=cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, **state)
+        os.rename(tmpname, fname)
+
+        return False
+
+    def _cache_key(self, x, y):
+        """Returns a hash of the surrogate class, its options and the
+        training data.
+        """
+        key = self._options_hash()
+
+        for arr in (x, y):
+            arr = np.ascontiguousarray(arr, dtype=float)
+            key.update(str(arr.shape).encode('utf-8'))
+            key.update(arr.tobytes())
+
+        return key.hexdigest()
+
+    def _options_hash(self):
+        """Returns a sha1 hash object of the surrogate class and the current
+        values of its options, which is the same for surrogates that train
+        the same way.
+        """
+        key = hashlib.sha1()
+        cls = type(self)
+        key.update(('%s.%s' % (cls.__module__, cls.__name__)).encode('utf-8'))
+
+        if self._option_attrs is None:
+            key.update(('id=%d' % id(self)).encode('utf-8'))
+            return key
+
+        for name in self._option_attrs:
+            _hash_option(key, name, getattr(self, name))
+
+        return key
+
+    def predict_batch(self, x):
+        """Calculates the predicted values of the response at each of the
+        supplied points. Surrogates that can evaluate many points at once
+        override this.
+
+        x: ndarray
+            Points at which the surrogate is evaluated, one per row.
+        """
+        return np.array([self.predict(x_i) for x_i in x])
+
+    def linearize_batch(self, x):
+        """Calculates the jacobian of the surrogate at each of the supplied
+        points, stacked along the first axis. Surrogates that can linearize
+        at many points at once override this.
+
+        x: ndarray
+            Points at which the surrogate Jacobian is evaluated, one per row.
+        """
+        return np.array([self.linearize(x_i) for x_i in x])
+
+
+def _hash_option(key, name, val):
+    """Adds the name and value of a surrogate option to a hash object."""
+    key.update(name.encode('utf-8'))
+
+    if isinstance(val, np.ndarray):
+        key.update(str(val.shape).encode('utf-8'))
+        key.update(np.ascontiguousarray(val).tobytes())
+    elif val is None or isinstance(val, (bool, int, float, str, np.generic)):
+        key.update(('=%r' % (val,)).encode('utf-8'))
+    elif isinstance(val, (tuple, list)):
+        for i, item in enumerate(val):
+            _hash_option(key, '[%d]' % i, item)
+    elif isinstance(val, dict):
+        for item_name, item in sorted(val.items()):
+            _hash_option(key, '[%r]' % (item_name,), item)
+    elif isinstance(val, SurrogateModel):
+        key.update(val._options_hash().digest())
+    else:
+        raise TypeError("Surrogate option '%s' of type %s can't be hashed."
+                        % (name, type(val).__name__))
+
 
 class MultiFiSurrogateModel(SurrogateModel):
     """
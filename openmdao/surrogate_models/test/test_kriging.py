@@ -148,5 +148,171 @@ class TestKrigingSurrogate(unittest.TestCase):
         jac = surrogate.linearize(np.array([[0.5, 0.5]]))
         assert_rel_error(self, jac, np.array([[1, 1], [1, -1], [1, 2]]), 5e-4)
 
+    def test_likelihood_gradient(self):
+        x = np.array([[a, b] for a, b in
+                   itertools.product(np.linspace(0, 1, 4), repeat=2)])
+        y = np.array([[np.sin(a + 2*b), a*b] for a, b in x])
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x, y)
+
+        # condensed distances, one row per pair of points
+        self.assertEqual(surrogate._sq_dists.shape, (16*15//2, 2))
+
+        thetas = np.array([0.5, 2.0])
+        lik, params = surrogate._calculate_reduced_likelihood_params(thetas, calc_grad=True)
+        self.assertTrue('L' in params)
+
+        step = 1e-6
+        for i in range(2):
+            dthetas = thetas.copy()
+            dthetas[i] += step
+            lik2 = surrogate._calculate_reduced_likelihood_params(dthetas)[0]
+            assert_rel_error(self, params['grad'][i], (lik2 - lik) / step, 1e-4)
+
+    def test_duplicate_points(self):
+        # The correlation matrix is singular, so the SVD is used
+        x = np.array([[0.0], [1.0], [1.0], [2.0], [3.0]])
+        y = np.sin(x)
+
+        surrogate = KrigingSurrogate(eval_rmse=True)
+        surrogate.train(x, y)
+        self.assertIsNone(surrogate.L)
+
+        mu, sigma = surrogate.predict(np.array([1.0]))
+        assert_rel_error(self, mu, np.sin(1.0), 1e-6)
+
+        # the RMSE of several points is that of each point
+        points = np.array([[0.5], [1.5], [2.5]])
+        mu, sigma = surrogate.predict(points)
+        self.assertEqual(sigma.shape, (3, 1))
+        for i in range(3):
+            mu_i, sigma_i = surrogate.predict(points[i])
+            assert_rel_error(self, sigma_i[0], sigma[i], 1e-8)
+
+    def test_batch(self):
+        x = np.array([[a, b] for a, b in
+                   itertools.product(np.linspace(-5, 10, 5), np.linspace(0, 15, 5))])
+        y = np.array([[branin(case), case[0]*case[1]] for case in x])
+
+        surrogate = KrigingSurrogate(eval_rmse=True)
+        surrogate.train(x, y)
+
+        points = np.random.RandomState(1).uniform([-5, 0], [10, 15], size=(50, 2))
+        mu, sigma = surrogate.predict(points)
+        jac = surrogate.linearize_batch(points)
+        self.assertEqual(jac.shape, (50, 2, 2))
+
+        # small chunks give the same results
+        surrogate.max_chunk_size = 7 * 25 * 2
+        mu2, sigma2 = surrogate.predict(points)
+        assert_rel_error(self, mu2, mu, 1e-12)
+        assert_rel_error(self, sigma2, sigma, 1e-12)
+        assert_rel_error(self, surrogate.linearize_batch(points), jac, 1e-12)
+
+        for i in (0, 13, 49):
+            mu_i, sigma_i = surrogate.predict(points[i])
+            np.testing.assert_allclose(mu_i[0], mu[i], rtol=1e-6)
+            np.testing.assert_allclose(sigma_i[0], sigma[i], rtol=1e-5, atol=1e-6)
+            np.testing.assert_allclose(surrogate.linearize(points[i]), jac[i], rtol=1e-6)
+
+    def test_update(self):
+        x = np.array([[a, b] for a, b in
+                   itertools.product(np.linspace(-5, 10, 5), np.linspace(0, 15, 5))])
+        y = np.array([[branin(case), case[0]] for case in x])
+
+        surrogate = KrigingSurrogate(nugget=1e-8, retrain_interval=2)
+        surrogate.train(x[:12], y[:12])
+        thetas = surrogate.thetas
+
+        surrogate.update(x[12:20], y[12:20])
+        self.assertEqual(surrogate.n_samples, 20)
+        assert_rel_error(self, surrogate.thetas, thetas, 0.)
+
+        # same model as factoring the full matrix for those thetas
+        _, params = surrogate._calculate_reduced_likelihood_params()
+        assert_rel_error(self, surrogate.L, params['L'], 1e-8)
+        assert_rel_error(self, surrogate.alpha, params['alpha'], 1e-6)
+        assert_rel_error(self, surrogate.sigma2, params['sigma2'], 1e-8)
+
+        mu = surrogate.predict(x[15])
+        assert_rel_error(self, mu, y[15], 1e-2)
+
+        # the second update retrains on all of the points
+        surrogate.update(x[20:], y[20:])
+        expected = KrigingSurrogate(nugget=1e-8)
+        expected.train(x, y)
+        self.assertEqual(surrogate.n_samples, 25)
+        assert_rel_error(self, surrogate.thetas, expected.thetas, 1e-8)
+
+        # a new point that duplicates a training point makes the matrix
+        # singular, so the whole matrix is factored again with an SVD
+        surrogate = KrigingSurrogate()
+        surrogate.train(x[:12], y[:12])
+        surrogate.update(x[[3, 12]], y[[3, 12]])
+        self.assertIsNone(surrogate.L)
+        _, params = surrogate._calculate_reduced_likelihood_params()
+        assert_rel_error(self, surrogate.alpha, params['alpha'], 1e-10)
+
+    def test_update_nugget(self):
+        x = np.array([[a, b] for a, b in
+                   itertools.product(np.linspace(-5, 10, 5), np.linspace(0, 15, 5))])
+        y = np.array([[branin(case), case[0]] for case in x])
+        nugget = np.linspace(1e-8, 1e-6, 20)
+
+        surrogate = KrigingSurrogate(nugget=nugget[:12])
+        surrogate.train(x[:12], y[:12])
+
+        with self.assertRaises(ValueError) as cm:
+            surrogate.update(x[12:20], y[12:20])
+        self.assertEqual(str(cm.exception),
+                         'KrigingSurrogate has a nugget for each training point, '
+                         'so update needs the nugget of the new points.')
+
+        surrogate.update(x[12:20], y[12:20], nugget=nugget[12:])
+        assert_rel_error(self, surrogate.nugget, nugget, 0.)
+
+        _, params = surrogate._calculate_reduced_likelihood_params()
+        assert_rel_error(self, surrogate.L, params['L'], 1e-8)
+        assert_rel_error(self, surrogate.alpha, params['alpha'], 1e-6)
+
+        # a single nugget becomes one for each point
+        surrogate = KrigingSurrogate(nugget=1e-8)
+        surrogate.train(x[:12], y[:12])
+        surrogate.update(x[12:20], y[12:20], nugget=1e-6)
+        assert_rel_error(self, surrogate.nugget, np.array([1e-8]*12 + [1e-6]*8), 0.)
+
+        _, params = surrogate._calculate_reduced_likelihood_params()
+        assert_rel_error(self, surrogate.L, params['L'], 1e-8)
+
+    def test_multi_start(self):
+        x = np.array([[a, b] for a, b in
+                   itertools.product(np.linspace(-5, 10, 4), np.linspace(0, 15, 4))])
+        y = np.array([[branin(case)] for case in x])
+
+        single = KrigingSurrogate()
+        single.train(x, y)
+        single_lik = single._calculate_reduced_likelihood_params()[0]
+
+        multi = KrigingSurrogate(num_starts=4, seed=11)
+        multi.train(x, y)
+        multi_lik = multi._calculate_reduced_likelihood_params()[0]
+
+        # the default starting point is always one of the starts
+        self.assertGreaterEqual(multi_lik, single_lik - 1e-8)
+
+        # a process pool finds the same thetas
+        pooled = KrigingSurrogate(num_starts=4, seed=11, pool_size=2)
+        pooled.train(x, y)
+        assert_rel_error(self, pooled.thetas, multi.thetas, 1e-10)
+
+        # retraining on the same data from the last thetas doesn't lose
+        # likelihood
+        warm = KrigingSurrogate(warm_start=True)
+        warm.train(x, y)
+        lik = warm._calculate_reduced_likelihood_params()[0]
+        warm.train(x, y)
+        self.assertGreaterEqual(warm._calculate_reduced_likelihood_params()[0], lik - 1e-6)
+
 if __name__ == "__main__":
     unittest.main()
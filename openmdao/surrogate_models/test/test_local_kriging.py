@@ -0,0 +1,107 @@
+# pylint: disable-msg=C0111,C0103
+
+import unittest
+import itertools
+import numpy as np
+
+from openmdao.api import LocalKrigingSurrogate, KrigingSurrogate, MetaModel, \
+    Problem, Group, IndepVarComp
+from openmdao.test.util import assert_rel_error
+
+
+def branin(x):
+    y = (x[1] - (5.1 / (4. * np.pi ** 2.)) * x[0] ** 2. + 5. * x[0] / np.pi - 6.) ** 2. \
+        + 10. * (1. - 1. / (8. * np.pi)) * np.cos(x[0]) + 10.
+    return y
+
+
+class TestLocalKrigingSurrogate(unittest.TestCase):
+
+    def test_all_neighbors(self):
+        # with every training point in the neighborhood, it's the same as
+        # global Kriging
+        x = np.array([[a, b] for a, b in
+                   itertools.product(np.linspace(-5, 10, 4), np.linspace(0, 15, 4))])
+        y = np.array([[branin(case), case[0] * case[1]] for case in x])
+
+        surrogate = LocalKrigingSurrogate(eval_rmse=True)
+        surrogate.train(x, y)
+
+        expected = KrigingSurrogate(eval_rmse=True)
+        expected.train(x, y)
+        assert_rel_error(self, surrogate.thetas, expected.thetas, 1e-12)
+
+        points = np.array([[-2., 1.], [3., 7.], [9.5, 14.]])
+        mu, sigma = surrogate.predict(points)
+        mu_exp, sigma_exp = expected.predict(points)
+        assert_rel_error(self, mu, mu_exp, 1e-6)
+        assert_rel_error(self, sigma, sigma_exp, 1e-4)
+
+        assert_rel_error(self, surrogate.linearize_batch(points),
+                         expected.linearize_batch(points), 1e-6)
+
+        mu, sigma = surrogate.predict(x[5])
+        assert_rel_error(self, mu, y[5:6], 1e-4)
+        self.assertTrue(np.all(sigma < 1e-6 * np.sqrt(surrogate.sigma2)))
+
+    def test_large(self):
+        rng = np.random.RandomState(0)
+        x = rng.uniform(size=(20000, 2))
+        y = np.sin(3. * x[:, :1]) * np.cos(2. * x[:, 1:])
+
+        surrogate = LocalKrigingSurrogate(num_neighbors=20, num_fit_points=200, seed=1)
+        surrogate.train(x, y)
+
+        points = rng.uniform(0.1, 0.9, size=(1000, 2))
+        mu = surrogate.predict(points)
+        assert_rel_error(self, mu, np.sin(3. * points[:, :1]) * np.cos(2. * points[:, 1:]),
+                         1e-4)
+
+        # small chunks give the same result
+        surrogate.max_chunk_size = 2000
+        assert_rel_error(self, surrogate.predict(points), mu, 1e-12)
+
+        # derivatives for fixed neighborhoods
+        step = 1e-6
+        jac = surrogate.linearize(points[0])
+        for i in range(2):
+            point = points[0].copy()
+            point[i] += step
+            fd = (surrogate.predict(point) - mu[0]) / step
+            assert_rel_error(self, jac[:, i], fd[0], 1e-3)
+
+    def test_update(self):
+        x = np.linspace(0., 1., 21)[:, np.newaxis]
+        y = np.sin(4. * x)
+
+        surrogate = LocalKrigingSurrogate(num_neighbors=5)
+        surrogate.train(x[::2], y[::2])
+        surrogate.update(x[1::2], y[1::2])
+
+        self.assertEqual(surrogate.n_samples, 21)
+        assert_rel_error(self, surrogate.predict(x[7]), y[7:8], 1e-8)
+
+    def test_metamodel(self):
+        meta = MetaModel()
+        meta.add_param('x', 0.)
+        meta.add_output('f', 0.)
+        meta.default_surrogate = LocalKrigingSurrogate(num_neighbors=8)
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta, promotes=['x'])
+        prob.root.add('p', IndepVarComp('x', 0.), promotes=['x'])
+        prob.setup(check=False)
+
+        prob['meta.train:x'] = np.linspace(0, 10, 200)
+        prob['meta.train:f'] = .5*np.sin(prob['meta.train:x'])
+        prob['x'] = 2.1
+        prob.run()
+
+        assert_rel_error(self, prob['meta.f'], .5*np.sin(2.1), 1e-6)
+
+        J = prob.calc_gradient(['x'], ['meta.f'], return_format='array')
+        assert_rel_error(self, J[0, 0], .5*np.cos(2.1), 1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
-from numpy import array, sin, cos, pi, ones
-from openmdao.api import MultiFiCoKrigingSurrogate
+from numpy import array, sin, cos, pi, ones, linspace
+from openmdao.api import MultiFiCoKrigingSurrogate, FloatMultiFiCoKrigingSurrogate
 from openmdao.test.util import assert_rel_error
 
 class CoKrigingSurrogateTest(unittest.TestCase):
@@ -57,6 +57,89 @@ class CoKrigingSurrogateTest(unittest.TestCase):
         assert_rel_error(self, mu,  f_expensive(new_x[0]), 0.05)
         assert_rel_error(self, sigma, 0., 0.02)
 
+    def test_1d_2fi_multi_start(self):
+        def f_expensive(x):
+            return ((x*6-2)**2)*sin((x*6-2)*2)
+        def f_cheap(x):
+            return 0.5*((x*6-2)**2)*sin((x*6-2)*2)+(x-0.5)*10. - 5
+
+        x = array([[[0.0], [0.4], [0.6], [1.0]],
+                   [[0.1], [0.2], [0.3], [0.5], [0.7],
+                    [0.8], [0.9], [0.0], [0.4], [0.6], [1.0]]])
+        y = array([[f_expensive(v) for v in array(x[0]).ravel()],
+                   [f_cheap(v) for v in array(x[1]).ravel()]])
+
+        single = MultiFiCoKrigingSurrogate()
+        single.train_multifi(x, y)
+
+        multi = MultiFiCoKrigingSurrogate(num_starts=3, seed=3)
+        multi.train_multifi(x, y)
+
+        # the default starting point is always one of the starts, so the
+        # minimized negative likelihood is no worse at any level
+        for lvl in range(2):
+            self.assertLessEqual(multi.model.rlf_value[lvl],
+                                 single.model.rlf_value[lvl] + 1e-8)
+
+        new_x = array([0.75])
+        mu, sigma = multi.predict(new_x)
+        assert_rel_error(self, mu,  f_expensive(new_x[0]), 0.05)
+
+        # a process pool finds the same thetas
+        pooled = MultiFiCoKrigingSurrogate(num_starts=3, seed=3, pool_size=2)
+        pooled.train_multifi(x, y)
+        for lvl in range(2):
+            assert_rel_error(self, pooled.model.theta[lvl], multi.model.theta[lvl], 1e-10)
+
+        # theta is estimated again on every fit, from the last one with
+        # warm_start
+        warm = MultiFiCoKrigingSurrogate(warm_start=True)
+        warm.train_multifi(x, y)
+        theta = list(warm.model.theta)
+        warm.train_multifi(x, y)
+        for lvl in range(2):
+            assert_rel_error(self, warm.model.theta[lvl], theta[lvl], 1e-2)
+
+    def test_1d_2fi_batch(self):
+        def f_expensive(x):
+            return ((x*6-2)**2)*sin((x*6-2)*2)
+        def f_cheap(x):
+            return 0.5*((x*6-2)**2)*sin((x*6-2)*2)+(x-0.5)*10. - 5
+
+        x = array([[[0.0], [0.4], [0.6], [1.0]],
+                   [[0.1], [0.2], [0.3], [0.5], [0.7],
+                    [0.8], [0.9], [0.0], [0.4], [0.6], [1.0]]])
+        y = array([[f_expensive(v) for v in array(x[0]).ravel()],
+                   [f_cheap(v) for v in array(x[1]).ravel()]])
+
+        cokrig = MultiFiCoKrigingSurrogate(theta=[20., 10.])
+        cokrig.train_multifi(x, y)
+
+        new_x = linspace(0.03, 0.97, 25).reshape((25, 1))
+        mu, sigma = cokrig.predict_batch(new_x)
+        self.assertEqual(mu.shape, (25, 1))
+        self.assertEqual(sigma.shape, (25, 1))
+        for x0, mu0, sigma0 in zip(new_x, mu, sigma):
+            mu1, sigma1 = cokrig.predict(x0)
+            assert_rel_error(self, mu1, mu0, 1e-10)
+            assert_rel_error(self, sigma1, sigma0, 1e-10)
+
+        # predicting a few points at a time gives the same results
+        cokrig.model.max_chunk_size = 30
+        mu_chunked, sigma_chunked = cokrig.predict_batch(new_x)
+        assert_rel_error(self, mu_chunked, mu, 1e-10)
+        assert_rel_error(self, sigma_chunked, sigma, 1e-10)
+
+        # the mean alone, without computing the MSE
+        cokrig.eval_rmse = False
+        assert_rel_error(self, cokrig.predict_batch(new_x), mu, 1e-10)
+        assert_rel_error(self, cokrig.predict(new_x[3]), mu[3], 1e-10)
+
+        floatkrig = FloatMultiFiCoKrigingSurrogate(theta=[20., 10.])
+        floatkrig.train_multifi(x, y)
+        assert_rel_error(self, floatkrig.predict(new_x[3]), mu[3], 1e-10)
+        assert_rel_error(self, floatkrig.predict_batch(new_x), mu, 1e-10)
+
     def test_2d_1fi_cokriging(self):
         # CoKrigingSurrogate with one fidelity could be used as a KrigingSurrogate
         # Same test as for KrigingSurrogate...  well with predicted test value adjustment
@@ -17,6 +17,48 @@ class TestNearestNeighbor(unittest.TestCase):
 
         self.assertEqual(expected_msg, str(cm.exception))
 
+    def test_update(self):
+        x = np.array([[a, b] for a in np.linspace(0, 1, 5) for b in np.linspace(0, 1, 5)])
+        y = np.array([[np.sin(a + b), a * b] for a, b in x])
+        test_x = np.array([[0.3, 0.6], [0.55, 0.15], [0.9, 0.9]])
+
+        # the new points are inside the range of the old ones, so they are
+        # normalized the same way
+        old = np.array([i for i, (a, b) in enumerate(x) if a in (0., 1.) or b in (0., 1.)])
+        new = np.array([i for i in range(len(x)) if i not in old])
+
+        for interpolant_type in ('linear', 'weighted', 'rbf'):
+            expected = NearestNeighbor(interpolant_type=interpolant_type)
+            expected.train(x[np.hstack((old, new))], y[np.hstack((old, new))])
+
+            surrogate = NearestNeighbor(interpolant_type=interpolant_type)
+            surrogate.train(x[old], y[old])
+            surrogate.update(x[new[:4]], y[new[:4]])
+            surrogate.update(x[new[4:]], y[new[4:]])
+            self.assertTrue(surrogate.interpolant._tree_stale)
+
+            assert_rel_error(self, surrogate.predict(test_x.copy()),
+                             expected.predict(test_x.copy()), 1e-10)
+            self.assertFalse(surrogate.interpolant._tree_stale)
+
+    def test_tree_options(self):
+        x = np.array([[a, b] for a in np.linspace(0, 1, 7) for b in np.linspace(0, 1, 7)])
+        y = np.array([[np.sin(a + b), a * b] for a, b in x])
+        test_x = np.random.RandomState(0).uniform(size=(20, 2))
+
+        for interpolant_type in ('linear', 'weighted', 'rbf'):
+            expected = NearestNeighbor(interpolant_type=interpolant_type)
+            expected.train(x, y)
+
+            for options in ({'num_leaves': 2}, {'workers': -1}):
+                surrogate = NearestNeighbor(interpolant_type=interpolant_type, **options)
+                surrogate.train(x, y)
+
+                assert_rel_error(self, surrogate.predict_batch(test_x.copy()),
+                                 expected.predict_batch(test_x.copy()), 1e-10)
+                assert_rel_error(self, surrogate.linearize_batch(test_x.copy()),
+                                 expected.linearize_batch(test_x.copy()), 1e-10)
+
 
 class TestLinearInterpolator1D(unittest.TestCase):
     def setUp(self):
@@ -137,6 +179,61 @@ class TestLinearInterpolatorND(unittest.TestCase):
             mu = self.surrogate.linearize(x0)
             assert_rel_error(self, mu, y0, 1e-9)
 
+        jac = self.surrogate.linearize_batch(test_x)
+        assert_rel_error(self, jac, expected_deriv, 1e-9)
+
+    def test_plane_cache(self):
+        test_x = np.array([[1., 0.5],
+                           [1., 0.6],
+                           [0.5, 1.0],
+                           [1.0, 1.5]])
+        interpolant = self.surrogate.interpolant
+
+        mu = self.surrogate.predict(test_x.copy())
+
+        # the first two points have the same neighbors
+        self.assertEqual(len(interpolant._planes), 3)
+
+        # Mess with internals to ensure cache is being used.
+        interpolant._plane_const[:] = 0.
+        interpolant._plane_grad[:] = 0.
+
+        assert_rel_error(self, self.surrogate.predict(test_x.copy()),
+                         np.ones((4, 4)) * interpolant._tvm, 1e-9)
+
+        self.surrogate.train(self.x, self.y)
+        assert_rel_error(self, self.surrogate.predict(test_x.copy()), mu, 1e-9)
+
+    def test_plane_cache_growth(self):
+        x = np.array([[a, b] for a in np.linspace(0., 2., 6) for b in np.linspace(0., 2., 6)])
+        y = np.column_stack((np.sin(x[:, 0]) + x[:, 1], x[:, 0] * x[:, 1]))
+        self.surrogate.train(x, y)
+        test_x = np.random.RandomState(0).uniform(0., 2., size=(40, 2))
+        interpolant = self.surrogate.interpolant
+
+        # planes found a point at a time are added to the cache in place,
+        # and its arrays grow geometrically
+        mu = np.vstack([self.surrogate.predict(x_i.copy()) for x_i in test_x])
+        num_planes = len(interpolant._planes)
+        self.assertEqual(interpolant._num_planes, num_planes)
+        self.assertGreater(num_planes, 8)
+        self.assertLess(len(interpolant._plane_const), 2 * num_planes)
+
+        self.surrogate.train(x, y)
+        assert_rel_error(self, self.surrogate.predict(test_x.copy()), mu, 1e-12)
+
+    def test_collinear(self):
+        x = np.array([[0., 0.], [1., 1.], [2., 2.], [3., 3.]])
+        y = np.array([[0.], [1.], [2.], [3.]])
+        self.surrogate.train(x, y)
+
+        # the nearest neighbors don't define a plane, so the value only
+        # changes along the line
+        test_x = np.array([[1.1, 0.8], [2.1, 1.8]])
+        assert_rel_error(self, self.surrogate.predict(test_x), np.array([[0.95], [1.95]]), 1e-9)
+        assert_rel_error(self, self.surrogate.linearize_batch(test_x),
+                         0.5 * np.ones((2, 1, 2)), 1e-9)
+
 
 class TestWeightedInterpolator1D(unittest.TestCase):
     def setUp(self):
@@ -3,7 +3,8 @@
 import unittest, itertools
 
 
-from numpy import array, linspace, sin, cos, pi
+from numpy import array, linspace, sin, cos, pi, eye
+from numpy.random import RandomState
 
 from openmdao.api import ResponseSurface
 from openmdao.test.util import assert_rel_error
@@ -22,6 +23,23 @@ def branin_1d(x):
 
 class TestResponseSurfaceSurrogate(unittest.TestCase):
 
+    def test_update(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 4), linspace(0, 15, 4))])
+        y = array([[branin(case), case[0]] for case in x])
+
+        expected = ResponseSurface()
+        expected.train(x, y)
+
+        # starting from fewer points than coefficients
+        surrogate = ResponseSurface()
+        surrogate.train(x[:3], y[:3])
+        surrogate.update(x[3:10], y[3:10])
+        surrogate.update(x[10:], y[10:])
+
+        self.assertEqual(surrogate.m, 16)
+        assert_rel_error(self, surrogate.betas, expected.betas, 1e-10)
+
     def test_1d_training(self):
 
         x = array([[0.0], [2.0], [3.0]])
@@ -137,6 +155,46 @@ class TestResponseSurfaceSurrogate(unittest.TestCase):
         jac = surrogate.linearize(array([[0.5, 0.5]]))
         assert_rel_error(self, jac, array([[1, 1], [1, -1]]), 1e-5)
 
+    def test_batch(self):
+        rng = RandomState(0)
+        x = rng.uniform(size=(40, 4))
+        y = array([[sum(x0) ** 2, x0[0] * x0[3] - x0[1]] for x0 in x])
+
+        surrogate = ResponseSurface()
+        surrogate.train(x, y)
+
+        # a quadratic is fit exactly
+        test_x = rng.uniform(size=(5, 4))
+        mu = surrogate.predict_batch(test_x)
+        assert_rel_error(self, mu, array([[sum(x0) ** 2, x0[0] * x0[3] - x0[1]]
+                                          for x0 in test_x]), 1e-9)
+
+        jac = surrogate.linearize_batch(test_x)
+        self.assertEqual(jac.shape, (5, 2, 4))
+        for x0, mu0, jac0 in zip(test_x, mu, jac):
+            assert_rel_error(self, surrogate.predict(x0), mu0, 1e-12)
+            assert_rel_error(self, surrogate.linearize(x0), jac0, 1e-12)
+            assert_rel_error(self, jac0, array([2. * sum(x0) * array([1., 1., 1., 1.]),
+                                                [x0[3], -1., 0., x0[0]]]), 1e-9)
+
+        # complex step
+        cs = array([surrogate.predict(test_x[0] + 1e-30j * e).imag / 1e-30 for e in eye(4)])
+        assert_rel_error(self, cs.T, jac[0], 1e-9)
+
+    def test_multi_output(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 4), linspace(0, 15, 4))])
+        y = array([[branin(case), case[0]] for case in x])
+
+        # all of the outputs share one factorization of the inputs, and each
+        # one's response surface is the same as if it were trained alone
+        surrogate = ResponseSurface()
+        surrogate.train(x, y)
+        for i in range(2):
+            single = ResponseSurface()
+            single.train(x, y[:, i:i+1])
+            assert_rel_error(self, surrogate.betas[:, i:i+1], single.betas, 1e-10)
+
 
 if __name__ == "__main__":
     unittest.main()
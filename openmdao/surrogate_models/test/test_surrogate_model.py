@@ -0,0 +1,142 @@
+""" Testing the training cache of SurrogateModel."""
+
+import os
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+
+from openmdao.api import KrigingSurrogate, FloatKrigingSurrogate, LocalKrigingSurrogate, \
+    ResponseSurface, NearestNeighbor, MultiFiCoKrigingSurrogate
+from openmdao.test.util import assert_rel_error
+
+
+class TestTrainCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = mkdtemp()
+
+        x = np.array([[a, b] for a in np.linspace(0., 1., 6) for b in np.linspace(0., 1., 6)])
+        self.x = x
+        self.y = np.column_stack((np.sin(3.*x[:, 0]) + x[:, 1]**2, x[:, 0]*x[:, 1]))
+        self.points = np.array([[0.33, 0.71], [0.52, 0.05], [0.9, 0.45]])
+
+    def tearDown(self):
+        rmtree(self.dir)
+
+    def test_round_trip(self):
+        surrogates = [
+            lambda: KrigingSurrogate(eval_rmse=True),
+            lambda: FloatKrigingSurrogate(),
+            lambda: LocalKrigingSurrogate(num_neighbors=10),
+            lambda: ResponseSurface(),
+            lambda: NearestNeighbor(interpolant_type='linear'),
+            lambda: NearestNeighbor(interpolant_type='weighted'),
+            lambda: NearestNeighbor(interpolant_type='rbf'),
+        ]
+
+        for i, make in enumerate(surrogates):
+            cache_dir = os.path.join(self.dir, str(i))
+
+            trained = make()
+            self.assertFalse(trained.train_cached(self.x, self.y, cache_dir))
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            loaded = make()
+            self.assertTrue(loaded.train_cached(self.x, self.y, cache_dir))
+
+            expected = trained.predict_batch(self.points.copy())
+            actual = loaded.predict_batch(self.points.copy())
+            if isinstance(expected, tuple):
+                for exp, act in zip(expected, actual):
+                    assert_rel_error(self, act, exp, 1e-12)
+            else:
+                assert_rel_error(self, actual, expected, 1e-12)
+
+            assert_rel_error(self, loaded.linearize(self.points[0].copy()),
+                             trained.linearize(self.points[0].copy()), 1e-12)
+
+    def test_key(self):
+        trained = KrigingSurrogate()
+        self.assertFalse(trained.train_cached(self.x, self.y, self.dir))
+
+        # other options or other data are trained again
+        self.assertFalse(KrigingSurrogate(nugget=1e-10).train_cached(self.x, self.y, self.dir))
+        self.assertFalse(KrigingSurrogate().train_cached(self.x, 2.*self.y, self.dir))
+        self.assertFalse(FloatKrigingSurrogate().train_cached(self.x, self.y, self.dir))
+        self.assertEqual(len(os.listdir(self.dir)), 4)
+
+        # the trained state isn't part of the key
+        self.assertTrue(trained.train_cached(self.x, self.y, self.dir))
+
+    def test_options_hash(self):
+        def key(surrogate):
+            return surrogate._options_hash().hexdigest()
+
+        # training a surrogate doesn't change its key
+        for surrogate in (NearestNeighbor(interpolant_type='rbf', n=6),
+                          KrigingSurrogate(nugget=np.full(36, 1e-8)),
+                          ResponseSurface()):
+            untrained = key(surrogate)
+            surrogate.train(self.x, self.y)
+            self.assertEqual(key(surrogate), untrained)
+
+        self.assertEqual(key(NearestNeighbor()), key(NearestNeighbor('rbf')))
+        self.assertNotEqual(key(NearestNeighbor()), key(NearestNeighbor('linear')))
+        self.assertNotEqual(key(NearestNeighbor()), key(NearestNeighbor(n=6)))
+        self.assertNotEqual(key(KrigingSurrogate(nugget=np.full(36, 1e-8))),
+                            key(KrigingSurrogate(nugget=np.full(36, 1e-9))))
+
+        # the current values of the options are hashed, including those
+        # set after construction
+        surrogate = KrigingSurrogate()
+        surrogate.nugget = 1e-10
+        self.assertEqual(key(surrogate), key(KrigingSurrogate(nugget=1e-10)))
+        surrogate.eval_rmse = True
+        self.assertEqual(key(surrogate), key(KrigingSurrogate(nugget=1e-10, eval_rmse=True)))
+
+        # so is the nugget that update extends
+        surrogate = KrigingSurrogate(nugget=np.full(36, 1e-8))
+        surrogate.train(self.x, self.y)
+        trained = key(surrogate)
+        surrogate.update(self.points, np.zeros((3, 2)), nugget=1e-8)
+        self.assertNotEqual(key(surrogate), trained)
+        self.assertEqual(key(surrogate), key(KrigingSurrogate(nugget=np.full(39, 1e-8))))
+
+        surrogate.seed = object()
+        with self.assertRaises(TypeError) as cm:
+            key(surrogate)
+        self.assertEqual(str(cm.exception), "Surrogate option 'seed' of type object "
+                                            "can't be hashed.")
+
+    def test_key_after_construction(self):
+        KrigingSurrogate().train_cached(self.x, self.y, self.dir)
+
+        # a nugget set after construction isn't loaded from the default's entry
+        surrogate = KrigingSurrogate()
+        surrogate.nugget = 0.5
+        self.assertFalse(surrogate.train_cached(self.x, self.y, self.dir))
+
+        expected = KrigingSurrogate(nugget=0.5)
+        expected.train(self.x, self.y)
+        assert_rel_error(self, surrogate.predict(self.points[0].copy()),
+                         expected.predict(self.points[0].copy()), 1e-12)
+
+        # nor is a surrogate whose options aren't known
+        class Unknown(ResponseSurface):
+            _option_attrs = None
+
+        self.assertFalse(Unknown().train_cached(self.x, self.y, self.dir))
+        self.assertEqual(len(os.listdir(self.dir)), 2)
+
+    def test_unsupported(self):
+        # surrogates that can't save their state are always trained
+        surrogate = MultiFiCoKrigingSurrogate()
+        self.assertFalse(surrogate.train_cached(self.x, self.y[:, 0], self.dir))
+        self.assertFalse(surrogate.train_cached(self.x, self.y[:, 0], self.dir))
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+""" Cache of function evaluations keyed on the design variable vector. """
+
+from collections import OrderedDict
+from copy import deepcopy
+
+import numpy as np
+
+
+class EvalCache(object):
+    """ Least-recently-used cache of the values that a driver computes at
+    each design point, so that a point that an optimizer requests again
+    doesn't rerun the model.
+
+    Each design point has an entry holding any number of named values
+    (e.g., 'funcs' and 'grad'). Values are copied on the way in and out, so
+    they can't be changed through the model vectors or by the caller.
+
+    Args
+    ----
+    size : int
+        Maximum number of design points to keep.
+
+    tol : float, optional
+        Design points are rounded to the nearest multiple of `tol` before
+        they are compared, so points that are this close share an entry.
+        Defaults to 0.0, which only matches identical points.
+    """
+
+    def __init__(self, size, tol=0.0):
+        self.size = size
+        self.tol = tol
+
+        self._entries = OrderedDict()
+        self._current = None
+
+        self.hits = {}
+        self.misses = {}
+
+    def _key(self, x):
+        """ Returns the hashable key of design point `x`. """
+        x = np.asarray(x, dtype=float).ravel()
+        if self.tol > 0.0:
+            x = np.round(x / self.tol)
+
+        # adding 0.0 turns -0.0 into 0.0, which has different bytes
+        return (x + 0.0).tobytes()
+
+    def get(self, x, name):
+        """
+        Returns a copy of the value cached for design point `x`, or None if
+        it isn't in the cache.
+
+        Args
+        ----
+        x : ndarray
+            Flattened, scaled design variable values.
+
+        name : str
+            Name of the value.
+
+        Returns
+        -------
+        object or None
+            The cached value.
+        """
+        key = self._key(x)
+        entry = self._entries.get(key)
+        if entry is None or name not in entry:
+            self.misses[name] = self.misses.get(name, 0) + 1
+            return None
+
+        self.hits[name] = self.hits.get(name, 0) + 1
+
+        # move the point to the most recently used end
+        self._entries[key] = self._entries.pop(key)
+        return deepcopy(entry[name])
+
+    def has(self, x, name):
+        """
+        Returns True if a value is cached for design point `x`. Unlike `get`,
+        this doesn't count as a hit or a miss.
+
+        Args
+        ----
+        x : ndarray
+            Flattened, scaled design variable values.
+
+        name : str
+            Name of the value.
+
+        Returns
+        -------
+        bool
+        """
+        entry = self._entries.get(self._key(x))
+        return entry is not None and name in entry
+
+    def store(self, x, name, value):
+        """
+        Caches a value for design point `x`, dropping the least recently
+        used point if the cache is full.
+
+        Args
+        ----
+        x : ndarray
+            Flattened, scaled design variable values.
+
+        name : str
+            Name of the value.
+
+        value : object
+            The value to cache.
+        """
+        key = self._key(x)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            entry = {}
+            while len(self._entries) >= self.size > 0:
+                self._entries.popitem(last=False)
+
+        entry[name] = deepcopy(value)
+        self._entries[key] = entry
+
+    def set_current(self, x):
+        """
+        Marks `x` as the design point that the model was last run at.
+
+        Args
+        ----
+        x : ndarray
+            Flattened, scaled design variable values.
+        """
+        self._current = self._key(x)
+
+    def is_current(self, x):
+        """
+        Returns True if the model was last run at design point `x`.
+
+        Args
+        ----
+        x : ndarray
+            Flattened, scaled design variable values.
+
+        Returns
+        -------
+        bool
+        """
+        return self._current == self._key(x)
+
+    def stats(self):
+        """
+        Returns the number of cache hits and misses.
+
+        Returns
+        -------
+        dict
+            Keys are 'hits' and 'misses', and values are dicts of the count
+            for each value name.
+        """
+        return {'hits': dict(self.hits), 'misses': dict(self.misses)}
+
+    def __len__(self):
+        return len(self._entries)
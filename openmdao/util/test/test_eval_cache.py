@@ -0,0 +1,76 @@
+""" Testing the function evaluation cache used by drivers."""
+
+import unittest
+
+import numpy as np
+
+from openmdao.util.eval_cache import EvalCache
+
+
+class TestEvalCache(unittest.TestCase):
+
+    def test_lru(self):
+        cache = EvalCache(2)
+
+        cache.store(np.array([0.0, 1.0]), 'funcs', 1.0)
+        cache.store(np.array([1.0, 1.0]), 'funcs', 2.0)
+        self.assertEqual(cache.get(np.array([0.0, 1.0]), 'funcs'), 1.0)
+
+        # the least recently used point is dropped
+        cache.store(np.array([2.0, 1.0]), 'funcs', 3.0)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(np.array([1.0, 1.0]), 'funcs'))
+        self.assertEqual(cache.get(np.array([0.0, 1.0]), 'funcs'), 1.0)
+        self.assertEqual(cache.get(np.array([2.0, 1.0]), 'funcs'), 3.0)
+
+        # values are kept separately for each name
+        self.assertIsNone(cache.get(np.array([2.0, 1.0]), 'grad'))
+        cache.store(np.array([2.0, 1.0]), 'grad', 4.0)
+        self.assertEqual(cache.get(np.array([2.0, 1.0]), 'grad'), 4.0)
+        self.assertEqual(len(cache), 2)
+
+        self.assertEqual(cache.stats(), {'hits': {'funcs': 3, 'grad': 1},
+                                         'misses': {'funcs': 1, 'grad': 1}})
+
+        # checking for a value doesn't change the stats
+        self.assertTrue(cache.has(np.array([2.0, 1.0]), 'grad'))
+        self.assertFalse(cache.has(np.array([0.0, 1.0]), 'grad'))
+        self.assertFalse(cache.has(np.array([1.0, 1.0]), 'funcs'))
+        self.assertEqual(cache.stats()['hits'], {'funcs': 3, 'grad': 1})
+
+    def test_tol(self):
+        cache = EvalCache(10)
+        cache.store(np.array([0.0, 1.0]), 'funcs', 1.0)
+        self.assertEqual(cache.get(np.array([-0.0, 1.0]), 'funcs'), 1.0)
+        self.assertIsNone(cache.get(np.array([0.0, 1.0 + 1e-12]), 'funcs'))
+
+        cache = EvalCache(10, tol=1e-6)
+        cache.store(np.array([0.0, 1.0]), 'funcs', 1.0)
+        self.assertEqual(cache.get(np.array([1e-9, 1.0 - 1e-9]), 'funcs'), 1.0)
+        self.assertIsNone(cache.get(np.array([0.0, 1.0 + 1e-5]), 'funcs'))
+
+    def test_copies(self):
+        cache = EvalCache(10)
+        x = np.array([0.0, 1.0])
+        val = {'f': np.zeros(2)}
+
+        cache.store(x, 'funcs', val)
+        val['f'][:] = 1.0
+        x[:] = 5.0
+
+        cached = cache.get(np.array([0.0, 1.0]), 'funcs')
+        np.testing.assert_array_equal(cached['f'], np.zeros(2))
+        cached['f'][:] = 2.0
+        np.testing.assert_array_equal(cache.get(np.array([0.0, 1.0]), 'funcs')['f'],
+                                      np.zeros(2))
+
+    def test_current(self):
+        cache = EvalCache(10)
+        self.assertFalse(cache.is_current(np.array([0.0])))
+        cache.set_current(np.array([0.0]))
+        self.assertTrue(cache.is_current(np.array([0.0])))
+        self.assertFalse(cache.is_current(np.array([1.0])))
+
+
+if __name__ == "__main__":
+    unittest.main()